@@ -0,0 +1,188 @@
+"""
+Pose Inference Benchmark
+
+Runs the same frames through YOLO.predict and through the lean inference path
+(`skeleton.py --lean_inference`), checks that both find the same people at the
+same keypoints, and compares the time per call.
+
+Detections are paired by rank and box IoU: a pair needs boxes overlapping by
+at least --min_iou. Keypoint differences are reported in pixels. Tiny
+differences can occur because the two paths undo the letterbox in different
+floating-point precision.
+
+Usage examples:
+    # Compare on the first 200 frames of a clip
+    python3 benchmark_inference.py --video clip.mp4 --model yolov8s-pose.pt --frames 200
+
+    # Smaller input size, as used live
+    python3 benchmark_inference.py --video clip.mp4 --model yolov8n-pose.pt --imgsz 640
+"""
+
+import argparse
+import time
+from typing import List
+
+import cv2
+import numpy as np
+from ultralytics import YOLO
+
+from skeleton import LeanPoseInference, box_iou
+
+
+def predict_with_ultralytics(pose_model: YOLO, frame: np.ndarray, confidence: float, inference_size: int):
+    """Run YOLO.predict the way SkeletonTracker does and return (keypoints, boxes, scores)"""
+    result = pose_model.predict(source=frame, imgsz=inference_size, conf=confidence, verbose=False)[0]
+    if result.keypoints is None or len(result.keypoints) == 0:
+        return np.zeros((0, 17, 3), dtype=np.float32), np.zeros((0, 4), dtype=np.float32), np.zeros(0)
+    return (result.keypoints.data.cpu().numpy(), result.boxes.xyxy.cpu().numpy(),
+            result.boxes.conf.cpu().numpy())
+
+
+def compare_detections(reference, lean, min_iou: float) -> dict:
+    """Pair detections of both paths by box IoU and measure their differences"""
+    reference_keypoints, reference_boxes, reference_scores = reference
+    lean_keypoints, lean_boxes, lean_scores = lean.keypoints, lean.boxes, lean.scores
+
+    pairs = []
+    if len(reference_boxes) and len(lean_boxes):
+        overlaps = box_iou(reference_boxes, lean_boxes)
+        # Both paths sort by score, so detections at the same rank should be
+        # the same person; greedy pairing by overlap covers reordered near-ties
+        for index in range(min(len(reference_boxes), len(lean_boxes))):
+            if overlaps[index, index] >= min_iou:
+                pairs.append((index, index))
+        paired_reference = {pair[0] for pair in pairs}
+        paired_lean = {pair[1] for pair in pairs}
+        for reference_index, lean_index in zip(*np.unravel_index(np.argsort(-overlaps, axis=None), overlaps.shape)):
+            if overlaps[reference_index, lean_index] < min_iou:
+                break
+            if reference_index in paired_reference or lean_index in paired_lean:
+                continue
+            pairs.append((reference_index, lean_index))
+            paired_reference.add(reference_index)
+            paired_lean.add(lean_index)
+
+    keypoint_errors = [np.abs(reference_keypoints[r, :, :2] - lean_keypoints[l, :, :2]).max() for r, l in pairs]
+    confidence_errors = [np.abs(reference_keypoints[r, :, 2] - lean_keypoints[l, :, 2]).max() for r, l in pairs]
+    score_errors = [abs(reference_scores[r] - lean_scores[l]) for r, l in pairs]
+    return {
+        "reference_count": len(reference_boxes),
+        "lean_count": len(lean_boxes),
+        "paired": len(pairs),
+        "max_keypoint_error_px": max(keypoint_errors, default=0.0),
+        "max_keypoint_confidence_error": max(confidence_errors, default=0.0),
+        "max_score_error": max(score_errors, default=0.0),
+    }
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    """
+    Create and configure command-line argument parser for the benchmark.
+
+    Returns:
+        Configured ArgumentParser instance
+    """
+    parser = argparse.ArgumentParser(
+        description="Verify and time the lean pose inference path against YOLO.predict",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        "--video",
+        required=True,
+        help="Clip to take frames from"
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        default="yolov8s-pose.pt",
+        help="Path to YOLOv8 pose model file"
+    )
+    parser.add_argument(
+        "--imgsz",
+        type=int,
+        default=960,
+        help="Model inference size in pixels"
+    )
+    parser.add_argument(
+        "--conf",
+        type=float,
+        default=0.3,
+        help="Minimum confidence for person detection"
+    )
+    parser.add_argument(
+        "--frames",
+        type=int,
+        default=100,
+        help="Frames to compare"
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=5,
+        help="Calls per path before timing"
+    )
+    parser.add_argument(
+        "--min_iou",
+        type=float,
+        default=0.9,
+        help="Box IoU at which two detections count as the same person"
+    )
+    return parser
+
+
+def main():
+    """Compare both inference paths frame by frame and print the summary"""
+    args = create_argument_parser().parse_args()
+
+    video_capture = cv2.VideoCapture(args.video)
+    if not video_capture.isOpened():
+        raise RuntimeError(f"Could not open video file: {args.video}")
+    frames: List[np.ndarray] = []
+    while len(frames) < args.frames:
+        frame_captured_successfully, frame = video_capture.read()
+        if not frame_captured_successfully:
+            break
+        frames.append(frame)
+    video_capture.release()
+    if not frames:
+        raise RuntimeError(f"No frames in {args.video}")
+
+    pose_model = YOLO(args.model)
+    for frame in frames[:args.warmup]:
+        predict_with_ultralytics(pose_model, frame, args.conf, args.imgsz)
+    lean_inference = LeanPoseInference(pose_model)
+    for frame in frames[:args.warmup]:
+        lean_inference.predict(frame, args.conf, args.imgsz)
+
+    reference_ms, lean_ms, comparisons = [], [], []
+    for frame in frames:
+        start_time = time.perf_counter()
+        reference = predict_with_ultralytics(pose_model, frame, args.conf, args.imgsz)
+        reference_time = time.perf_counter()
+        lean = lean_inference.predict(frame, args.conf, args.imgsz)
+        lean_time = time.perf_counter()
+        reference_ms.append((reference_time - start_time) * 1000)
+        lean_ms.append((lean_time - reference_time) * 1000)
+        comparisons.append(compare_detections(reference, lean, args.min_iou))
+
+    reference_count = sum(comparison["reference_count"] for comparison in comparisons)
+    lean_count = sum(comparison["lean_count"] for comparison in comparisons)
+    paired = sum(comparison["paired"] for comparison in comparisons)
+    mismatched_frames = sum(
+        comparison["reference_count"] != comparison["paired"] or comparison["lean_count"] != comparison["paired"]
+        for comparison in comparisons
+    )
+    print(f"Frames: {len(frames)} ({frames[0].shape[1]}x{frames[0].shape[0]}), imgsz {args.imgsz}, conf {args.conf}")
+    print(f"Detections: predict {reference_count}, lean {lean_count}, paired {paired}, "
+          f"frames with unpaired detections {mismatched_frames}")
+    print(f"Max keypoint error: {max(c['max_keypoint_error_px'] for c in comparisons):.3f} px, "
+          f"max keypoint confidence error {max(c['max_keypoint_confidence_error'] for c in comparisons):.4f}, "
+          f"max score error {max(c['max_score_error'] for c in comparisons):.4f}")
+    for name, times in (("predict", reference_ms), ("lean", lean_ms)):
+        print(f"{name:>8}: mean {np.mean(times):.2f} ms, p50 {np.percentile(times, 50):.2f} ms, "
+              f"p95 {np.percentile(times, 95):.2f} ms")
+    print(f"Speedup: {np.mean(reference_ms) / np.mean(lean_ms):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
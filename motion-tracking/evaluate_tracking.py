@@ -0,0 +1,524 @@
+"""
+Tracking Accuracy Evaluation
+
+Runs a recorded clip through the tracker under one or more settings and scores
+the tracked floor positions against a ground truth annotation, so speed knobs
+(a smaller --imgsz, a lower --conf, a smaller model, skipped frames) can be
+judged by their cost in accuracy instead of by eye.
+
+For every setting it reports:
+    MOTA         1 - (misses + false positives + ID switches) / ground truth positions
+    IDF1         share of positions assigned to the right identity over the whole clip
+    ID switches  ground truth people whose matched tracker ID changed
+    floor error  mean distance (meters) between matched positions
+    FPS          clip frames handled per second of tracker time
+
+Tracked and true positions match when they are within --match_distance meters.
+
+The ground truth is a CSV file with a header line and one row per person and
+frame:
+
+    frame,person_id,x,y
+    0,1,1.52,4.10
+    0,2,-0.80,6.35
+    1,1,1.55,4.08
+
+Frames are counted from 0 in clip order and x, y are floor coordinates in
+meters. Every frame from the first to the last annotated one is evaluated; a
+frame without rows means nobody was on the floor.
+
+Each setting is a string of skeleton.py options applied on top of the base
+options; it may also contain --frame_step N to run the tracker on every Nth
+frame only, holding its last output in between.
+
+Usage examples:
+    # Compare inference sizes
+    python3 evaluate_tracking.py --video clip.mp4 --ground_truth clip.csv \\
+        --setting "--imgsz 320" --setting "--imgsz 480" --setting "--imgsz 640"
+
+    # Smaller model and skipped frames, showing the fastest setting meeting the bar
+    python3 evaluate_tracking.py --video clip.mp4 --ground_truth clip.csv \\
+        --setting "--model yolov8s-pose.pt" --setting "--model yolov8n-pose.pt" \\
+        --setting "--model yolov8n-pose.pt --frame_step 2" --min_mota 0.8 --min_idf1 0.8
+"""
+
+import argparse
+import csv
+import shlex
+import time
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from skeleton import (
+    AppearanceReidentifier,
+    SkeletonTracker,
+    create_argument_parser as create_tracker_argument_parser,
+    create_floor_region,
+    create_motion_gate,
+    create_pose_cascade,
+    create_tiled_inference,
+    create_track_smoother,
+    scale_homography_to_frame_size,
+)
+
+# Positions of one frame: (N,) integer IDs and (N, 2) floor coordinates
+FramePositions = Tuple[np.ndarray, np.ndarray]
+
+
+# ================================
+# GROUND TRUTH AND TRACKER OUTPUT
+# ================================
+
+def load_ground_truth(csv_path: str) -> Tuple[int, List[FramePositions]]:
+    """
+    Read a ground truth annotation file.
+
+    Returns:
+        Tuple of (first annotated frame, positions of every frame from the first
+        to the last annotated one)
+    """
+    rows_by_frame: dict[int, list] = {}
+    with open(csv_path, newline="") as csv_file:
+        for row in csv.DictReader(csv_file):
+            rows_by_frame.setdefault(int(row["frame"]), []).append(
+                (int(row["person_id"]), float(row["x"]), float(row["y"]))
+            )
+    if not rows_by_frame:
+        raise ValueError(f"No annotations in {csv_path}")
+
+    first_frame, last_frame = min(rows_by_frame), max(rows_by_frame)
+    frames = []
+    for frame_index in range(first_frame, last_frame + 1):
+        rows = rows_by_frame.get(frame_index, [])
+        frames.append((
+            np.array([person_id for person_id, _, _ in rows], dtype=np.int64),
+            np.array([(x, y) for _, x, y in rows], dtype=np.float64).reshape(-1, 2)
+        ))
+    return first_frame, frames
+
+
+def tracked_positions(frame_analysis) -> FramePositions:
+    """Tracker IDs and floor positions of the people tracked in a frame"""
+    people = [person for person in frame_analysis.detected_people if person.floor_position is not None]
+    return (
+        np.array([person.person_id for person in people], dtype=np.int64),
+        np.array([(person.floor_position.floor_x, person.floor_position.floor_y) for person in people],
+                 dtype=np.float64).reshape(-1, 2)
+    )
+
+
+# ================================
+# METRICS
+# ================================
+
+def linear_sum_assignment(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Minimum-cost assignment of rows to columns (Hungarian algorithm).
+
+    Same result as scipy.optimize.linear_sum_assignment, without the dependency;
+    the matrices here are at most a few hundred people wide.
+
+    Returns:
+        Tuple of (row indices, column indices) of the assigned pairs
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    rows, columns = cost.shape
+    if rows == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    # Shortest augmenting path with row/column potentials (1-indexed, column 0
+    # is a virtual start column)
+    row_potential = np.zeros(rows + 1)
+    column_potential = np.zeros(columns + 1)
+    row_of_column = np.zeros(columns + 1, dtype=np.int64)
+    previous_column = np.zeros(columns + 1, dtype=np.int64)
+    for row in range(1, rows + 1):
+        row_of_column[0] = row
+        current_column = 0
+        min_slack = np.full(columns + 1, np.inf)
+        used = np.zeros(columns + 1, dtype=bool)
+        while True:
+            used[current_column] = True
+            current_row = row_of_column[current_column]
+            free = ~used[1:]
+            slack = cost[current_row - 1] - row_potential[current_row] - column_potential[1:]
+            improved = free & (slack < min_slack[1:])
+            min_slack[1:][improved] = slack[improved]
+            previous_column[1:][improved] = current_column
+
+            candidates = np.where(free, min_slack[1:], np.inf)
+            next_column = int(np.argmin(candidates)) + 1
+            delta = candidates[next_column - 1]
+
+            row_potential[row_of_column[used]] += delta
+            column_potential[used] -= delta
+            min_slack[1:][free] -= delta
+
+            current_column = next_column
+            if row_of_column[current_column] == 0:
+                break
+        while current_column:
+            row_of_column[current_column] = row_of_column[previous_column[current_column]]
+            current_column = previous_column[current_column]
+
+    assigned_columns = np.flatnonzero(row_of_column[1:]) + 1
+    row_indices = row_of_column[assigned_columns] - 1
+    column_indices = assigned_columns - 1
+    if transposed:
+        row_indices, column_indices = column_indices, row_indices
+    order = np.argsort(row_indices)
+    return row_indices[order], column_indices[order]
+
+
+def match_frame(
+    true_positions: np.ndarray,
+    predicted_positions: np.ndarray,
+    match_distance: float
+) -> List[Tuple[int, int, float]]:
+    """Closest one-to-one pairs of true and tracked positions within the match distance"""
+    if len(true_positions) == 0 or len(predicted_positions) == 0:
+        return []
+    distances = np.linalg.norm(true_positions[:, None, :] - predicted_positions[None, :, :], axis=2)
+    # Pairs beyond the match distance get a prohibitive cost and are dropped afterwards
+    rows, columns = linear_sum_assignment(np.where(distances <= match_distance, distances, 1e6))
+    return [(row, column, distances[row, column]) for row, column in zip(rows, columns)
+            if distances[row, column] <= match_distance]
+
+
+def clear_mot(
+    ground_truth: List[FramePositions],
+    predictions: List[FramePositions],
+    match_distance: float
+) -> dict:
+    """
+    CLEAR MOT metrics (MOTA, ID switches, floor error) over a clip.
+
+    A true person keeps their tracker ID from the previous frame when it's
+    still within the match distance; everyone else is matched optimally.
+    """
+    misses = false_positives = id_switches = matches = 0
+    total_error = 0.0
+    true_count = 0
+    last_match: dict[int, int] = {}  # true ID -> tracker ID it was last matched to
+    previous_pairs: dict[int, int] = {}
+
+    for (true_ids, true_positions), (predicted_ids, predicted_positions) in zip(ground_truth, predictions):
+        true_count += len(true_ids)
+        pairs: List[Tuple[int, int, float]] = []
+
+        # Keep last frame's correspondences that are still valid
+        predicted_index = {int(predicted_id): index for index, predicted_id in enumerate(predicted_ids)}
+        kept_true, kept_predicted = set(), set()
+        for true_index, true_id in enumerate(true_ids):
+            index = predicted_index.get(previous_pairs.get(int(true_id), -1))
+            if index is None or index in kept_predicted:
+                continue
+            distance = float(np.linalg.norm(true_positions[true_index] - predicted_positions[index]))
+            if distance <= match_distance:
+                pairs.append((true_index, index, distance))
+                kept_true.add(true_index)
+                kept_predicted.add(index)
+
+        remaining_true = [index for index in range(len(true_ids)) if index not in kept_true]
+        remaining_predicted = [index for index in range(len(predicted_ids)) if index not in kept_predicted]
+        for row, column, distance in match_frame(
+            true_positions[remaining_true], predicted_positions[remaining_predicted], match_distance
+        ):
+            pairs.append((remaining_true[row], remaining_predicted[column], distance))
+
+        previous_pairs = {}
+        for true_index, index, distance in pairs:
+            true_id, predicted_id = int(true_ids[true_index]), int(predicted_ids[index])
+            if last_match.get(true_id, predicted_id) != predicted_id:
+                id_switches += 1
+            last_match[true_id] = predicted_id
+            previous_pairs[true_id] = predicted_id
+            total_error += distance
+        matches += len(pairs)
+        misses += len(true_ids) - len(pairs)
+        false_positives += len(predicted_ids) - len(pairs)
+
+    return {
+        "mota": 1.0 - (misses + false_positives + id_switches) / max(true_count, 1),
+        "id_switches": id_switches,
+        "misses": misses,
+        "false_positives": false_positives,
+        "floor_error_m": total_error / matches if matches else float("nan"),
+    }
+
+
+def idf1(
+    ground_truth: List[FramePositions],
+    predictions: List[FramePositions],
+    match_distance: float
+) -> float:
+    """
+    Identity F1 score: the share of positions that the best one-to-one mapping
+    of true people to tracker IDs over the whole clip gets right.
+    """
+    true_ids = sorted({int(person_id) for ids, _ in ground_truth for person_id in ids})
+    predicted_ids = sorted({int(person_id) for ids, _ in predictions for person_id in ids})
+    true_count = sum(len(ids) for ids, _ in ground_truth)
+    predicted_count = sum(len(ids) for ids, _ in predictions)
+    if not true_ids or not predicted_ids:
+        return 0.0
+
+    # Frames in which each (true person, tracker ID) pair was within the match distance
+    true_column = {person_id: index for index, person_id in enumerate(true_ids)}
+    predicted_column = {person_id: index for index, person_id in enumerate(predicted_ids)}
+    co_located = np.zeros((len(true_ids), len(predicted_ids)))
+    for (frame_true_ids, true_positions), (frame_predicted_ids, predicted_positions) in zip(ground_truth, predictions):
+        if len(frame_true_ids) == 0 or len(frame_predicted_ids) == 0:
+            continue
+        distances = np.linalg.norm(true_positions[:, None, :] - predicted_positions[None, :, :], axis=2)
+        for true_index, predicted_index in zip(*np.nonzero(distances <= match_distance)):
+            co_located[true_column[int(frame_true_ids[true_index])],
+                       predicted_column[int(frame_predicted_ids[predicted_index])]] += 1
+
+    rows, columns = linear_sum_assignment(-co_located)
+    identity_true_positives = co_located[rows, columns].sum()
+    return 2 * identity_true_positives / (true_count + predicted_count)
+
+
+# ================================
+# EVALUATION
+# ================================
+
+def parse_setting(setting: str, base_options: List[str]) -> Tuple[argparse.Namespace, int]:
+    """
+    Turn a setting string into tracker options.
+
+    Returns:
+        Tuple of (skeleton.py options, frame step)
+    """
+    setting_parser = argparse.ArgumentParser(add_help=False)
+    setting_parser.add_argument("--frame_step", type=int, default=1)
+    own_options, tracker_options = setting_parser.parse_known_args(shlex.split(setting))
+    tracker_args = create_tracker_argument_parser().parse_args(base_options + tracker_options)
+    return tracker_args, max(own_options.frame_step, 1)
+
+
+def create_tracker(args: argparse.Namespace, frame_size: Tuple[int, int]) -> SkeletonTracker:
+    """Build a skeleton tracker for the given skeleton.py options, as skeleton.py's main would"""
+    reidentifier = None
+    if args.reid:
+        reidentifier = AppearanceReidentifier(
+            lost_track_cache_size=args.reid_cache,
+            similarity_threshold=args.reid_threshold
+        )
+    skeleton_tracker = SkeletonTracker(
+        pose_model_path=args.model,
+        homography_file_path=args.homography,
+        tracking_distance_threshold=args.tracking_distance,
+        tracking_max_frames_missing=args.tracking_timeout,
+        reidentifier=reidentifier,
+        compute_kinematics=args.kinematics,
+        motion_gate=create_motion_gate(args),
+        smoother=create_track_smoother(args),
+        cascade=create_pose_cascade(args),
+        lean_inference=args.lean_inference
+    )
+    if args.calibration_size and frame_size != tuple(args.calibration_size):
+        skeleton_tracker.floor_homography_matrix = scale_homography_to_frame_size(
+            skeleton_tracker.floor_homography_matrix, tuple(args.calibration_size), frame_size
+        )
+    skeleton_tracker.floor_region = create_floor_region(args, skeleton_tracker.floor_homography_matrix)
+    skeleton_tracker.tiler = create_tiled_inference(args, skeleton_tracker.floor_region)
+    return skeleton_tracker
+
+
+def run_setting(
+    video_path: str,
+    first_frame: int,
+    frame_count: int,
+    tracker_args: argparse.Namespace,
+    frame_step: int,
+    warmup_frames: int
+) -> Tuple[List[FramePositions], float]:
+    """
+    Track the annotated part of a clip with one setting.
+
+    Returns:
+        Tuple of (tracked positions per annotated frame, frames handled per second)
+    """
+    video_capture = cv2.VideoCapture(video_path)
+    if not video_capture.isOpened():
+        raise RuntimeError(f"Could not open video file: {video_path}")
+    frame_size = (int(video_capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                  int(video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    skeleton_tracker = create_tracker(tracker_args, frame_size)
+
+    empty: FramePositions = (np.empty(0, dtype=np.int64), np.empty((0, 2)))
+    predictions: List[FramePositions] = []
+    latest = empty
+    timed_seconds = 0.0
+    timed_frames = 0
+    try:
+        for frame_index in range(first_frame + frame_count):
+            frame_captured_successfully, current_frame = video_capture.read()
+            if not frame_captured_successfully:
+                break
+            if tracker_args.flip:
+                current_frame = cv2.flip(current_frame, 1)
+
+            # The tracker sees every frame_step-th frame; outputs hold in between
+            if frame_index % frame_step == 0:
+                start_time = time.perf_counter()
+                frame_analysis = skeleton_tracker.analyze_frame(
+                    input_frame=current_frame,
+                    detection_confidence=tracker_args.conf,
+                    keypoint_confidence=tracker_args.kpt_conf,
+                    inference_size=tracker_args.imgsz
+                )
+                elapsed = time.perf_counter() - start_time
+                latest = tracked_positions(frame_analysis)
+                if frame_index >= warmup_frames:
+                    timed_seconds += elapsed
+            if frame_index >= warmup_frames:
+                timed_frames += 1
+            if frame_index >= first_frame:
+                predictions.append(latest)
+    finally:
+        video_capture.release()
+
+    if len(predictions) < frame_count:
+        print(f"Warning: clip ended after {len(predictions)} of {frame_count} annotated frames")
+        predictions += [empty] * (frame_count - len(predictions))
+    return predictions, timed_frames / timed_seconds if timed_seconds else float("nan")
+
+
+def meets_bar(result: dict, args: argparse.Namespace) -> bool:
+    """Check a result against the accuracy thresholds"""
+    return (result["mota"] >= args.min_mota and result["idf1"] >= args.min_idf1
+            and result["id_switches"] <= args.max_id_switches
+            and not result["floor_error_m"] > args.max_floor_error)
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    """
+    Create and configure command-line argument parser for the evaluation.
+
+    Returns:
+        Configured ArgumentParser instance
+    """
+    parser = argparse.ArgumentParser(
+        description="Score tracking accuracy and speed of tracker settings against a ground truth annotation",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        "--video",
+        required=True,
+        help="Recorded clip to track"
+    )
+    parser.add_argument(
+        "--ground_truth",
+        required=True,
+        help="CSV annotation with frame,person_id,x,y rows (floor meters)"
+    )
+    parser.add_argument(
+        "--setting",
+        action="append",
+        help="skeleton.py options (plus optional --frame_step N) to evaluate; repeat to sweep. "
+             "Defaults to the base options alone"
+    )
+    parser.add_argument(
+        "--base",
+        default="",
+        help="skeleton.py options shared by every setting, e.g. \"--homography floor_homography.npy\""
+    )
+    parser.add_argument(
+        "--match_distance",
+        type=float,
+        default=1.0,
+        help="Largest distance (meters) at which a tracked position counts as the true one"
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=5,
+        help="Clip frames excluded from the FPS measurement (model warm-up)"
+    )
+    parser.add_argument(
+        "--min_mota",
+        type=float,
+        default=float("-inf"),
+        help="Accuracy bar: lowest acceptable MOTA"
+    )
+    parser.add_argument(
+        "--min_idf1",
+        type=float,
+        default=0.0,
+        help="Accuracy bar: lowest acceptable IDF1"
+    )
+    parser.add_argument(
+        "--max_id_switches",
+        type=int,
+        default=2 ** 31,
+        help="Accuracy bar: most acceptable ID switches"
+    )
+    parser.add_argument(
+        "--max_floor_error",
+        type=float,
+        default=float("inf"),
+        help="Accuracy bar: largest acceptable mean floor error (meters)"
+    )
+    parser.add_argument(
+        "--csv",
+        help="Also write the results table to this CSV file"
+    )
+    return parser
+
+
+def main():
+    """Evaluate every setting and print the results, fastest first"""
+    args = create_argument_parser().parse_args()
+
+    first_frame, ground_truth = load_ground_truth(args.ground_truth)
+    print(f"Ground truth: frames {first_frame}-{first_frame + len(ground_truth) - 1}, "
+          f"{sum(len(ids) for ids, _ in ground_truth)} positions")
+
+    base_options = shlex.split(args.base) + ["--video", args.video]
+    results = []
+    for setting in args.setting or [""]:
+        tracker_args, frame_step = parse_setting(setting, base_options)
+        predictions, fps = run_setting(
+            args.video, first_frame, len(ground_truth), tracker_args, frame_step, args.warmup
+        )
+        result = {"setting": setting or "(base)", "fps": fps}
+        result.update(clear_mot(ground_truth, predictions, args.match_distance))
+        result["idf1"] = idf1(ground_truth, predictions, args.match_distance)
+        results.append(result)
+        print(f"{result['setting']}: {fps:.1f} FPS, MOTA {result['mota']:.3f}, IDF1 {result['idf1']:.3f}")
+
+    results.sort(key=lambda result: -result["fps"])
+    setting_width = max(len(result["setting"]) for result in results)
+    print()
+    print(f"{'setting':<{setting_width}} {'FPS':>7} {'MOTA':>7} {'IDF1':>7} {'ID sw':>6} "
+          f"{'miss':>6} {'FP':>6} {'err m':>7}  bar")
+    for result in results:
+        print(f"{result['setting']:<{setting_width}} {result['fps']:7.1f} {result['mota']:7.3f} "
+              f"{result['idf1']:7.3f} {result['id_switches']:6d} {result['misses']:6d} "
+              f"{result['false_positives']:6d} {result['floor_error_m']:7.3f}  "
+              f"{'yes' if meets_bar(result, args) else 'no'}")
+
+    passing = [result for result in results if meets_bar(result, args)]
+    print()
+    if passing:
+        print(f"Fastest setting meeting the accuracy bar: {passing[0]['setting']} ({passing[0]['fps']:.1f} FPS)")
+    else:
+        print("No setting meets the accuracy bar.")
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+"""
+Shared-Memory Frame Bus
+
+This module lets several local processes consume the same camera. A single
+publisher process owns the capture device and writes every frame into a ring
+buffer in shared memory; consumers (the skeleton tracker, a recorder, a preview)
+read the newest frame directly from that buffer without copying it.
+
+Consumers never block the publisher: a consumer that is slower than the camera
+simply skips to the newest frame. A zero-copy frame is overwritten once the
+publisher has gone around the ring buffer, so `--slots` should exceed the
+longest time a consumer holds a frame times the camera frame rate, plus two
+(e.g. 200 ms analysis at 30 fps: at least 8). A consumer that falls further
+behind switches to copying each frame out of shared memory.
+
+Usage examples:
+    # Publish camera index 0 on the default bus name
+    python3 frame_bus.py --cam 0
+
+    # Consume it in the skeleton tracker
+    python3 skeleton.py --frame_bus algofonia_frames --model yolov8s-pose.pt
+"""
+
+import argparse
+import time
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+DEFAULT_BUS_NAME = "algofonia_frames"
+
+# ================================
+# SHARED MEMORY LAYOUT
+# ================================
+#
+#   header           int64[8]   magic, version, slots, height, width, channels,
+#                               latest sequence number, reserved
+#   slot_sequences   int64[slots]    sequence number stored in each slot (-1 while writing)
+#   slot_timestamps  float64[slots]  capture time (time.time()) of each slot
+#   frames           uint8[slots, height, width, channels]
+
+BUS_MAGIC = 0x616C676F66726D73  # "algofrms"
+BUS_VERSION = 1
+HEADER_FIELDS = 8
+DEFAULT_SLOTS = 8
+
+
+class HeaderIndex:
+    """Positions of the fields in the bus header"""
+    MAGIC = 0
+    VERSION = 1
+    SLOTS = 2
+    HEIGHT = 3
+    WIDTH = 4
+    CHANNELS = 5
+    LATEST_SEQUENCE = 6
+
+
+def _bus_size(slots: int, height: int, width: int, channels: int) -> int:
+    """Total shared memory size in bytes for the given ring buffer shape"""
+    return 8 * HEADER_FIELDS + 16 * slots + slots * height * width * channels
+
+
+def _map_bus_arrays(
+    buffer: memoryview,
+    slots: int,
+    height: int,
+    width: int,
+    channels: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Create NumPy views of the header, slot metadata and frames over a shared buffer"""
+    offset = 0
+    header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=buffer, offset=offset)
+    offset += header.nbytes
+    slot_sequences = np.ndarray((slots,), dtype=np.int64, buffer=buffer, offset=offset)
+    offset += slot_sequences.nbytes
+    slot_timestamps = np.ndarray((slots,), dtype=np.float64, buffer=buffer, offset=offset)
+    offset += slot_timestamps.nbytes
+    frames = np.ndarray((slots, height, width, channels), dtype=np.uint8, buffer=buffer, offset=offset)
+    return header, slot_sequences, slot_timestamps, frames
+
+
+# ================================
+# PUBLISHER
+# ================================
+
+class FrameBusWriter:
+    """
+    Writes frames into a shared-memory ring buffer with sequence numbers.
+
+    There must be exactly one writer per bus. Writing never waits for readers.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        frame_shape: Tuple[int, int, int],
+        slots: int = DEFAULT_SLOTS
+    ):
+        """
+        Create the shared memory segment for the bus.
+
+        A segment of the same name left behind by a crashed publisher is
+        replaced; one that is still being published to raises FileExistsError.
+
+        Args:
+            name: Shared memory name consumers attach to
+            frame_shape: (height, width, channels) of every published frame
+            slots: Number of frames in the ring buffer; a consumer's zero-copy
+                frame stays intact for slots - 1 further published frames
+        """
+        height, width, channels = frame_shape
+        self.name = name
+        self.slots = slots
+        self.frame_shape = frame_shape
+        size = _bus_size(slots, height, width, channels)
+        try:
+            self._shared_memory = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            _remove_stale_bus(name)
+            self._shared_memory = shared_memory.SharedMemory(name=name, create=True, size=size)
+        (self._header, self._slot_sequences,
+         self._slot_timestamps, self._frames) = _map_bus_arrays(
+            self._shared_memory.buf, slots, height, width, channels
+        )
+
+        self._slot_sequences[:] = -1
+        self._header[:] = (BUS_MAGIC, BUS_VERSION, slots, height, width, channels, -1, 0)
+        self._sequence = -1
+
+    def publish(self, frame: np.ndarray, capture_timestamp: Optional[float] = None) -> int:
+        """
+        Write a frame into the next slot.
+
+        Args:
+            frame: Frame with exactly the bus frame shape
+            capture_timestamp: Capture time (time.time()), defaults to now
+
+        Returns:
+            Sequence number of the published frame
+        """
+        if frame.shape != self.frame_shape:
+            raise ValueError(f"Frame shape {frame.shape} doesn't match bus shape {self.frame_shape}")
+
+        sequence = self._sequence + 1
+        slot = sequence % self.slots
+
+        # Invalidate the slot while it's being overwritten so readers can't
+        # mistake a half-written frame for the old or the new one
+        self._slot_sequences[slot] = -1
+        self._frames[slot] = frame
+        self._slot_timestamps[slot] = time.time() if capture_timestamp is None else capture_timestamp
+        self._slot_sequences[slot] = sequence
+        self._header[HeaderIndex.LATEST_SEQUENCE] = sequence
+
+        self._sequence = sequence
+        return sequence
+
+    def close(self) -> None:
+        """Release and remove the shared memory segment"""
+        self._header = self._slot_sequences = self._slot_timestamps = self._frames = None
+        self._shared_memory.close()
+        self._shared_memory.unlink()
+
+
+def _remove_stale_bus(name: str, liveness_timeout: float = 1.0) -> None:
+    """
+    Unlink a frame bus segment left behind by a publisher that didn't shut down.
+
+    Raises:
+        FileExistsError: If the segment isn't a frame bus, or a publisher is still writing to it
+    """
+    segment = shared_memory.SharedMemory(name=name)
+
+    def read_header() -> np.ndarray:
+        # Copies, so no view keeps the segment from being closed
+        return np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=segment.buf).copy()
+
+    try:
+        header = read_header()
+        if header[HeaderIndex.MAGIC] != BUS_MAGIC or header[HeaderIndex.VERSION] != BUS_VERSION:
+            raise FileExistsError(f"Shared memory '{name}' exists and is not a frame bus")
+
+        # A live publisher keeps advancing the sequence number
+        deadline = time.monotonic() + liveness_timeout
+        while time.monotonic() < deadline:
+            if read_header()[HeaderIndex.LATEST_SEQUENCE] != header[HeaderIndex.LATEST_SEQUENCE]:
+                raise FileExistsError(f"Frame bus '{name}' is already being published")
+            time.sleep(0.01)
+    except FileExistsError:
+        # Leave the segment to its owner
+        _untrack_shared_memory(segment)
+        raise
+    finally:
+        segment.close()
+    print(f"Removing stale frame bus '{name}' left by a previous publisher")
+    try:
+        segment.unlink()
+    except FileNotFoundError:
+        pass  # Removed meanwhile, e.g. by the crashed publisher's resource tracker
+
+
+# ================================
+# CONSUMER
+# ================================
+
+class FrameBusReader:
+    """
+    Reads the newest frame from a frame bus, with a cv2.VideoCapture-like interface.
+
+    Frames returned by `read` are zero-copy views into shared memory. They stay
+    valid until the publisher has written `slots - 1` more frames; call
+    `frame_still_valid()` after processing to check, or copy the frame if it
+    must be kept longer.
+
+    Once a read finds that the publisher came close to overwriting the previous
+    frame while it was in use, the reader copies every further frame into a
+    reusable buffer, which stays intact until the next `read`.
+    """
+
+    def __init__(self, name: str = DEFAULT_BUS_NAME, timeout: float = 2.0, copy_when_behind: bool = True):
+        """
+        Attach to an existing frame bus.
+
+        Args:
+            name: Shared memory name of the bus
+            timeout: Seconds `read` waits for a new frame before reporting failure
+            copy_when_behind: Switch to copying frames once the consumer falls behind the ring buffer
+        """
+        self.name = name
+        self.timeout = timeout
+        self.copy_when_behind = copy_when_behind
+        self.last_sequence = -1
+        self.last_capture_timestamp: Optional[float] = None
+        self.skipped_frames = 0
+        self.copying = False
+        self._copy_buffer: Optional[np.ndarray] = None
+        self._last_frame_copied = False
+
+        try:
+            self._shared_memory = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            self._shared_memory = None
+            return
+        _untrack_shared_memory(self._shared_memory)
+
+        header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=self._shared_memory.buf)
+        if header[HeaderIndex.MAGIC] != BUS_MAGIC or header[HeaderIndex.VERSION] != BUS_VERSION:
+            raise RuntimeError(f"Shared memory '{name}' is not a compatible frame bus")
+        slots, height, width, channels = (int(value) for value in header[HeaderIndex.SLOTS:HeaderIndex.CHANNELS + 1])
+
+        self.slots = slots
+        (self._header, self._slot_sequences,
+         self._slot_timestamps, self._frames) = _map_bus_arrays(
+            self._shared_memory.buf, slots, height, width, channels
+        )
+
+    def isOpened(self) -> bool:
+        return self._shared_memory is not None
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Wait for a frame newer than the last one read and return the newest.
+
+        Returns:
+            Tuple of (success, frame view); success is False if no new frame
+            arrived within the timeout
+        """
+        if self._shared_memory is None:
+            return False, None
+
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            sequence = int(self._header[HeaderIndex.LATEST_SEQUENCE])
+            if sequence > self.last_sequence:
+                # The previous frame's slot is rewritten at `slots` frames on;
+                # one frame short of that there is no margin left
+                if (self.copy_when_behind and not self.copying and self.last_sequence >= 0 and
+                        sequence - self.last_sequence >= self.slots - 1):
+                    self.copying = True
+                    print(f"Frame bus '{self.name}': consumer fell {sequence - self.last_sequence} frames "
+                          f"behind the {self.slots}-slot ring buffer, copying frames from now on")
+
+                slot = sequence % self.slots
+                capture_timestamp = float(self._slot_timestamps[slot])
+                if self._slot_sequences[slot] != sequence:
+                    continue  # Slot was overwritten while we looked; try the newer frame
+                frame = self._frames[slot]
+                if self.copying:
+                    if self._copy_buffer is None:
+                        self._copy_buffer = np.empty_like(frame)
+                    np.copyto(self._copy_buffer, frame)
+                    if self._slot_sequences[slot] != sequence:
+                        continue  # Overwritten during the copy
+                    frame = self._copy_buffer
+
+                if self.last_sequence >= 0:
+                    self.skipped_frames += sequence - self.last_sequence - 1
+                self.last_sequence = sequence
+                self.last_capture_timestamp = capture_timestamp
+                self._last_frame_copied = self.copying
+                return True, frame
+            time.sleep(0.001)
+        return False, None
+
+    def get(self, property_id: int) -> float:
+        """Report the bus frame size like cv2.VideoCapture.get; other properties are 0"""
+        if self._shared_memory is None:
+            return 0.0
+        if property_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self._frames.shape[2])
+        if property_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self._frames.shape[1])
+        return 0.0
+
+    def frame_still_valid(self) -> bool:
+        """Check that the last frame read hasn't been overwritten by the publisher"""
+        if self._last_frame_copied:
+            return True
+        slot = self.last_sequence % self.slots
+        return self._slot_sequences[slot] == self.last_sequence
+
+    def release(self) -> None:
+        """Detach from the bus (the publisher owns and removes the segment)"""
+        if self._shared_memory is not None:
+            self._header = self._slot_sequences = self._slot_timestamps = self._frames = None
+            self._copy_buffer = None
+            self._shared_memory.close()
+            self._shared_memory = None
+
+
+def _untrack_shared_memory(segment: shared_memory.SharedMemory) -> None:
+    """
+    Stop Python's resource tracker from unlinking a segment this process only attached to.
+
+    Before Python 3.13, attaching registers the segment as if this process owned
+    it, so the bus would be destroyed when any consumer exits.
+    """
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(segment._name, "shared_memory")
+    except Exception:
+        pass
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    """
+    Create and configure command-line argument parser for the publisher.
+
+    Returns:
+        Configured ArgumentParser instance
+    """
+    parser = argparse.ArgumentParser(
+        description="Publish a camera into a shared-memory frame bus for local consumers",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        "--cam",
+        type=int,
+        default=0,
+        help="Camera index for live video capture"
+    )
+    parser.add_argument(
+        "--name",
+        default=DEFAULT_BUS_NAME,
+        help="Shared memory name consumers attach to"
+    )
+    parser.add_argument(
+        "--slots",
+        type=int,
+        default=DEFAULT_SLOTS,
+        help="Frames kept in the ring buffer; consumers can use a frame without copying it for "
+             "about slots - 2 camera frame intervals"
+    )
+    return parser
+
+
+def main():
+    """Capture frames from a camera and publish them until interrupted"""
+    args = create_argument_parser().parse_args()
+
+    video_capture = cv2.VideoCapture(args.cam)
+    if not video_capture.isOpened():
+        raise RuntimeError(f"Could not open camera index: {args.cam}")
+
+    frame_captured_successfully, frame = video_capture.read()
+    if not frame_captured_successfully:
+        raise RuntimeError(f"Could not read from camera index: {args.cam}")
+
+    writer = FrameBusWriter(args.name, frame.shape, args.slots)
+    print(f"Publishing camera {args.cam} ({frame.shape[1]}x{frame.shape[0]}) on frame bus '{args.name}'")
+    print("Press Ctrl+C to stop.")
+
+    try:
+        while True:
+            frame_captured_successfully, frame = video_capture.read()
+            if not frame_captured_successfully:
+                print("Failed to capture frame from camera.")
+                break
+            writer.publish(frame, time.time())
+    except KeyboardInterrupt:
+        print("\nInterrupted by user (Ctrl+C)")
+    finally:
+        video_capture.release()
+        writer.close()
+        print("Frame bus closed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+OSC Latency Probe
+
+A local stand-in for the sound system: it receives the tracker's OSC messages,
+records when each one arrives and reports the end-to-end latency, from frame
+capture to the packet arriving, for every message carrying a capture timestamp.
+This lets latency changes from pipeline options be measured without the real
+receiver attached.
+
+The tracker has to be started with --osc_timestamp, which appends the capture
+time (int64 microseconds since the epoch) to /people/positions. Both programs
+must run on the same machine, or on machines with synchronized clocks.
+
+Usage examples:
+    # Listen on the tracker's default OSC port
+    python3 osc_latency_probe.py
+
+    # In another terminal
+    python3 skeleton.py --video input.mp4 --osc_timestamp
+
+    # Also save every measurement for later analysis
+    python3 osc_latency_probe.py --port 9000 --csv latency.csv
+"""
+
+import argparse
+import time
+from typing import List, Optional
+
+import numpy as np
+from pythonosc.dispatcher import Dispatcher
+from pythonosc.osc_server import BlockingOSCUDPServer
+
+POSITION_FIELDS = 3  # person_id, x, y
+
+
+class LatencyRecorder:
+    """Collects arrival times and capture-to-arrival latencies of OSC messages"""
+
+    def __init__(self, csv_path: Optional[str] = None):
+        """
+        Create an empty recorder.
+
+        Args:
+            csv_path: File to write one line per timestamped message to, or None
+        """
+        self.latencies_ms: List[float] = []
+        self.arrival_times: List[float] = []
+        self.untimestamped_messages = 0
+        self._csv_file = open(csv_path, "w") if csv_path else None
+        if self._csv_file:
+            self._csv_file.write("arrival_time,capture_time,latency_ms,people\n")
+
+    def handle_positions(self, address: str, *args) -> None:
+        """Record a /people/positions message: [id, x, y]* optionally followed by a timestamp"""
+        arrival_time = time.time()
+        self.arrival_times.append(arrival_time)
+
+        if len(args) % POSITION_FIELDS != 1:
+            self.untimestamped_messages += 1
+            return
+
+        capture_time = args[-1] / 1_000_000
+        latency_ms = (arrival_time - capture_time) * 1000
+        self.latencies_ms.append(latency_ms)
+        if self._csv_file:
+            people = len(args) // POSITION_FIELDS
+            self._csv_file.write(f"{arrival_time:.6f},{capture_time:.6f},{latency_ms:.3f},{people}\n")
+
+    def report(self) -> str:
+        """Summarize the latency distribution and message rate recorded so far"""
+        lines = [f"Messages: {len(self.arrival_times)} "
+                 f"({self.untimestamped_messages} without capture timestamp)"]
+
+        if len(self.arrival_times) > 1:
+            intervals_ms = np.diff(self.arrival_times) * 1000
+            lines.append(
+                f"Arrival interval: mean {intervals_ms.mean():.1f} ms, "
+                f"std {intervals_ms.std():.1f} ms, max {intervals_ms.max():.1f} ms"
+            )
+
+        if self.latencies_ms:
+            latencies = np.asarray(self.latencies_ms)
+            p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+            lines.append(
+                f"Capture-to-arrival latency: min {latencies.min():.1f} ms, "
+                f"p50 {p50:.1f} ms, p90 {p90:.1f} ms, p99 {p99:.1f} ms, "
+                f"max {latencies.max():.1f} ms, mean {latencies.mean():.1f} ms"
+            )
+        else:
+            lines.append("No timestamped messages yet (is the tracker running with --osc_timestamp?)")
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        if self._csv_file:
+            self._csv_file.close()
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    """
+    Create and configure command-line argument parser for the probe.
+
+    Returns:
+        Configured ArgumentParser instance
+    """
+    parser = argparse.ArgumentParser(
+        description="Receive the tracker's OSC output and report end-to-end latency",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Address to listen on"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=9000,
+        help="UDP port to listen on (the tracker's --osc_port)"
+    )
+    parser.add_argument(
+        "--report_interval",
+        type=float,
+        default=5.0,
+        help="Seconds between intermediate reports"
+    )
+    parser.add_argument(
+        "--csv",
+        help="Write every timestamped measurement to this CSV file"
+    )
+    return parser
+
+
+def main():
+    """Listen for OSC messages and report latency until interrupted"""
+    args = create_argument_parser().parse_args()
+
+    recorder = LatencyRecorder(args.csv)
+    dispatcher = Dispatcher()
+    dispatcher.map("/people/positions", recorder.handle_positions)
+
+    server = BlockingOSCUDPServer((args.host, args.port), dispatcher)
+    server.timeout = 0.1
+    print(f"Listening for OSC on {args.host}:{args.port}")
+    print("Press Ctrl+C to stop and print the final report.")
+
+    next_report_time = time.monotonic() + args.report_interval
+    try:
+        while True:
+            server.handle_request()
+            if time.monotonic() >= next_report_time:
+                print(recorder.report())
+                next_report_time += args.report_interval
+    except KeyboardInterrupt:
+        print("\nInterrupted by user (Ctrl+C)")
+    finally:
+        server.server_close()
+        recorder.close()
+        print(recorder.report())
+
+
+if __name__ == "__main__":
+    main()
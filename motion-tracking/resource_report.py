@@ -0,0 +1,167 @@
+"""
+Resource Log Diff Report
+
+Compares two samples of a resource log written by `skeleton.py --resource_log`
+and shows what grew in between: RSS, file descriptors, the traced Python heap
+per subsystem, live objects per type and tracker state. Growth that keeps
+showing up in one subsystem or object type between distant samples points at
+the leak.
+
+Usage examples:
+    # First sample against the last one
+    python3 resource_report.py resources.jsonl
+
+    # Sample 10 against the one 24 hours of samples later (60 s interval)
+    python3 resource_report.py resources.jsonl --from_sample 10 --to_sample 1450
+
+    # The last hour (60 s interval)
+    python3 resource_report.py resources.jsonl --from_sample -61
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime
+from typing import List, Optional
+
+
+def load_samples(log_path: str) -> List[dict]:
+    """Read all samples from a log and its rotated backups (.1, .2, ...), oldest first"""
+    paths = [log_path]
+    while os.path.exists(f"{log_path}.{len(paths)}"):
+        paths.append(f"{log_path}.{len(paths)}")
+
+    samples = []
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path) as log_file:
+            samples.extend(json.loads(line) for line in log_file if line.strip())
+    return sorted(samples, key=lambda sample: sample["time"])
+
+
+def format_change(before, after, unit: str = "") -> str:
+    if not isinstance(before, (int, float)) or not isinstance(after, (int, float)):
+        return f"{before} -> {after}"
+    return f"{before:,.1f}{unit} -> {after:,.1f}{unit} ({after - before:+,.1f}{unit})"
+
+
+def diff_counts(before: dict, after: dict, limit: int, before_complete: bool = True,
+                after_complete: bool = True) -> List[tuple]:
+    """
+    Entries sorted by growth, largest first.
+
+    A name missing from a complete sample counts as 0. Older logs only kept
+    each sample's top entries, so there a missing name is unknown (None). Such
+    entries are listed after the ranked ones, largest known count first.
+    """
+    changes, unknown = [], []
+    for name in set(before) | set(after):
+        count_before = before.get(name, 0 if before_complete else None)
+        count_after = after.get(name, 0 if after_complete else None)
+        if count_before is None or count_after is None:
+            unknown.append((name, count_before, count_after))
+        else:
+            changes.append((name, count_before, count_after))
+    changes.sort(key=lambda change: -(change[2] - change[1]))
+    unknown.sort(key=lambda change: -max(change[1] or 0, change[2] or 0))
+    return (changes + unknown)[:limit]
+
+
+def format_count_change(before: Optional[int], after: Optional[int], scale: float = 1, unit: str = "") -> str:
+    """Counts of one diff line, with a dash for a count the sample didn't record"""
+    decimals = 0 if scale == 1 else 1
+
+    def count(value: Optional[int]) -> str:
+        return f"{'—':>12}{' ' * len(unit)}" if value is None else f"{value / scale:>12,.{decimals}f}{unit}"
+
+    line = f"{count(before)} -> {count(after)}"
+    if before is not None and after is not None:
+        line += f" ({(after - before) / scale:+,.{decimals}f}{unit})"
+    return line
+
+
+def diff_report(before: dict, after: dict, limit: int = 15) -> str:
+    """Describe the resource changes between two samples"""
+    hours = (after["time"] - before["time"]) / 3600
+    lines = [
+        f"From {datetime.fromtimestamp(before['time']):%Y-%m-%d %H:%M:%S} "
+        f"to {datetime.fromtimestamp(after['time']):%Y-%m-%d %H:%M:%S} ({hours:.2f} h)",
+        "",
+        f"RSS:              {format_change(before['rss_mb'], after['rss_mb'], ' MB')}",
+        f"Traced heap:      {format_change(before['traced_heap_mb'], after['traced_heap_mb'], ' MB')}",
+        f"Open files:       {format_change(before['open_fds'], after['open_fds'])}",
+        f"Threads:          {format_change(before['threads'], after['threads'])}",
+        f"GC pause (max):   {before['gc_pause_max_ms']:.1f} ms -> {after['gc_pause_max_ms']:.1f} ms",
+        "",
+        "Traced heap growth by subsystem:"
+    ]
+    before_complete = before.get("complete_counts", False)
+    after_complete = after.get("complete_counts", False)
+    for name, size_before, size_after in diff_counts(before["heap_by_subsystem"], after["heap_by_subsystem"],
+                                                     limit, before_complete, after_complete):
+        lines.append(f"  {name:<32} {format_count_change(size_before, size_after, 1024, ' KB')}")
+
+    lines += ["", "Live object growth by type:"]
+    for name, count_before, count_after in diff_counts(before["objects_by_type"], after["objects_by_type"],
+                                                       limit, before_complete, after_complete):
+        lines.append(f"  {name:<32} {format_count_change(count_before, count_after)}")
+    if not (before_complete and after_complete):
+        lines.append("  (— : not among that sample's logged top entries)")
+
+    lines += ["", "Tracker state:"]
+    for name in sorted(set(before["state"]) | set(after["state"])):
+        lines.append(f"  {name:<32} {format_change(before['state'].get(name), after['state'].get(name))}")
+    return "\n".join(lines)
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    """
+    Create and configure command-line argument parser for the report.
+
+    Returns:
+        Configured ArgumentParser instance
+    """
+    parser = argparse.ArgumentParser(
+        description="Compare two samples of a skeleton.py resource log",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        "log",
+        help="Resource log path given to skeleton.py --resource_log"
+    )
+    parser.add_argument(
+        "--from_sample",
+        type=int,
+        default=0,
+        help="Index of the earlier sample (negative counts from the end)"
+    )
+    parser.add_argument(
+        "--to_sample",
+        type=int,
+        default=-1,
+        help="Index of the later sample (negative counts from the end)"
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=15,
+        help="Subsystems and object types listed"
+    )
+    return parser
+
+
+def main():
+    """Print the diff report for the selected samples"""
+    args = create_argument_parser().parse_args()
+
+    samples = load_samples(args.log)
+    if len(samples) < 2:
+        raise SystemExit(f"Need at least two samples, found {len(samples)} in {args.log}")
+
+    print(f"{len(samples)} samples")
+    print(diff_report(samples[args.from_sample], samples[args.to_sample], args.limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -22,13 +22,36 @@ import argparse
 import cv2
 import numpy as np
 from ultralytics import YOLO
-from typing import Optional, Tuple, List, NamedTuple, Protocol
+import torch
+import torchvision
+from typing import Optional, Tuple, List, NamedTuple, Protocol, Callable, Any
 from pythonosc.udp_client import SimpleUDPClient
-from dataclasses import dataclass
+from pythonosc.osc_message_builder import OscMessageBuilder
+from pythonosc.dispatcher import Dispatcher
+from pythonosc.osc_server import ThreadingOSCUDPServer
+from frame_bus import FrameBusReader, DEFAULT_BUS_NAME
+from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
 import time
 import math
-from collections import defaultdict
+import threading
+import dataclasses
+import asyncio
+import json
+import os
+import sys
+import platform
+import queue
+import socket
+import ipaddress
+import gc
+import tracemalloc
+import logging
+import logging.handlers
+import signal
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict, OrderedDict, deque
 
 # ================================
 # POSE MODEL CONFIGURATION
@@ -155,6 +178,32 @@ class PersonDetection:
     skeleton_bones: Tuple[SkeletonBone, ...]
     bounding_box: Optional[BoundingBox]
     floor_position: Optional[FloorPosition]
+    # Raw (17, 3) [x, y, confidence] keypoints from the model, unfiltered
+    keypoint_array: Optional[np.ndarray] = field(default=None, compare=False, repr=False)
+
+
+class RawPoseDetections(NamedTuple):
+    """Raw pose model output for one frame, in frame pixel coordinates"""
+    keypoints: np.ndarray  # (N, 17, 3) x, y, confidence
+    boxes: Optional[np.ndarray]  # (N, 4) x1, y1, x2, y2
+    scores: Optional[np.ndarray]  # (N,) person detection confidence
+
+
+@dataclass(frozen=True)
+class PersonKinematics:
+    """Movement features of a tracked person derived from their recent history"""
+    person_id: int
+    velocity_x: float  # meters per second on the floor
+    velocity_y: float
+    acceleration_x: float  # meters per second squared on the floor
+    acceleration_y: float
+    # Pose features in torso lengths; NaN when the keypoints aren't reliable
+    left_arm_height: float  # wrist height above shoulder
+    right_arm_height: float
+    left_arm_extension: float  # wrist distance from shoulder
+    right_arm_extension: float
+    left_leg_extension: float  # ankle distance from hip
+    right_leg_extension: float
 
 
 @dataclass(frozen=True)
@@ -163,28 +212,12 @@ class FrameAnalysis:
     frame_number: int
     detected_people: Tuple[PersonDetection, ...]
     processing_time_ms: float
-
-
-@dataclass
-class TrackedPerson:
-    """Mutable tracking state for a person across frames"""
-    person_id: int
-    last_floor_position: Optional[FloorPosition]
-    frames_since_detection: int
-    total_detections: int
-    first_seen_frame: int
-    last_seen_frame: int
-    
-    def update_detection(self, floor_position: Optional[FloorPosition], frame_number: int) -> None:
-        """Update tracking info when person is detected in a frame"""
-        self.last_floor_position = floor_position
-        self.frames_since_detection = 0
-        self.total_detections += 1
-        self.last_seen_frame = frame_number
-    
-    def increment_missed_frames(self) -> None:
-        """Increment counter when person is not detected in a frame"""
-        self.frames_since_detection += 1
+    stage_times_ms: dict[str, float] = field(default_factory=dict)
+    kinematics: Tuple[PersonKinematics, ...] = ()
+    inference_skipped: bool = False  # detections were reused from an earlier frame
+    capture_timestamp: Optional[float] = None  # time.time() when the frame was captured
+    frame_size: Optional[Tuple[int, int]] = None  # (width, height) of the analyzed frame
+    removed_person_ids: Tuple[int, ...] = ()  # IDs the tracker dropped in this frame
 
 
 # ================================
@@ -203,6 +236,14 @@ class OutputHandler(Protocol):
         ...
 
 
+class OSCClient(Protocol):
+    """Protocol for OSC clients (pythonosc's SimpleUDPClient satisfies it)"""
+    
+    def send_message(self, address: str, value: Any) -> None:
+        """Build an OSC message from an address and arguments and send it"""
+        ...
+
+
 class Visualizer(Protocol):
     """Protocol for handling visualization operations"""
     
@@ -246,6 +287,30 @@ def transform_pixel_to_floor_coordinates(
     return float(floor_coordinates[0]), float(floor_coordinates[1])
 
 
+def scale_homography_to_frame_size(
+    homography_matrix: np.ndarray,
+    calibration_size: Tuple[int, int],
+    frame_size: Tuple[int, int]
+) -> np.ndarray:
+    """
+    Adapt a homography calibrated at one frame size to frames of another size.
+    
+    Args:
+        homography_matrix: 3x3 pixel-to-floor homography for calibration_size frames
+        calibration_size: (width, height) of the frames used for calibration
+        frame_size: (width, height) of the frames that will actually be analyzed
+        
+    Returns:
+        3x3 homography mapping pixels of frame_size frames to floor coordinates
+    """
+    calibration_width, calibration_height = calibration_size
+    frame_width, frame_height = frame_size
+    
+    # Scale new pixel coordinates back to calibration pixels, then apply the original
+    pixel_scale = np.diag([calibration_width / frame_width, calibration_height / frame_height, 1.0])
+    return homography_matrix @ pixel_scale
+
+
 def create_keypoints_from_detection(
     person_keypoints: np.ndarray, 
     keypoint_confidence_threshold: float
@@ -351,10 +416,302 @@ def create_floor_position_from_keypoints(
     return None
 
 
+# ================================
+# FLOOR OCCUPANCY
+# ================================
+
+class FloorOccupancyGrid:
+    """
+    Crowd density heatmap over the floor plane, maintained incrementally.
+    
+    Each update decays the grid exponentially by the elapsed time and adds the
+    current floor positions into their cells, so every cell holds a smoothed
+    "average number of people in this cell" without being rebuilt per frame.
+    """
+    
+    def __init__(
+        self,
+        floor_bounds: Tuple[float, float, float, float] = (0.0, 0.0, 10.0, 10.0),  # meters
+        cell_size: float = 0.5,  # meters
+        half_life_seconds: float = 2.0  # time for old occupancy to fade to half
+    ):
+        """
+        Initialize the occupancy grid.
+        
+        Args:
+            floor_bounds: Covered floor area as (min_x, min_y, max_x, max_y) in meters
+            cell_size: Edge length of one square grid cell in meters
+            half_life_seconds: Decay half-life; 0 keeps only the latest frame
+        """
+        min_x, min_y, max_x, max_y = floor_bounds
+        if max_x <= min_x or max_y <= min_y:
+            raise ValueError(f"Invalid floor bounds: {floor_bounds}")
+        if cell_size <= 0:
+            raise ValueError(f"Cell size must be positive, got {cell_size}")
+        
+        self.min_x = min_x
+        self.min_y = min_y
+        self.cell_size = cell_size
+        self.half_life_seconds = half_life_seconds
+        self.columns = int(math.ceil((max_x - min_x) / cell_size))
+        self.rows = int(math.ceil((max_y - min_y) / cell_size))
+        
+        self.grid = np.zeros((self.rows, self.columns), dtype=np.float32)
+        self._last_update_time: Optional[float] = None
+    
+    def update(self, floor_positions: List[FloorPosition], timestamp: float) -> None:
+        """
+        Decay the grid and accumulate this frame's floor positions.
+        
+        Args:
+            floor_positions: Floor positions detected in the current frame
+            timestamp: Time of the frame in seconds (monotonic clock)
+        """
+        elapsed = 0.0
+        if self._last_update_time is not None:
+            elapsed = max(0.0, timestamp - self._last_update_time)
+        self._last_update_time = timestamp
+        
+        # Exponential moving average with a time-based factor, so the grid
+        # converges to the mean people count per cell regardless of frame rate
+        if self.half_life_seconds > 0:
+            decay = 0.5 ** (elapsed / self.half_life_seconds)
+        else:
+            decay = 0.0
+        self.grid *= decay
+        
+        if not floor_positions:
+            return
+        
+        coordinates = np.array(
+            [(fp.floor_x, fp.floor_y) for fp in floor_positions], dtype=np.float32
+        )
+        columns = np.floor((coordinates[:, 0] - self.min_x) / self.cell_size).astype(np.intp)
+        rows = np.floor((coordinates[:, 1] - self.min_y) / self.cell_size).astype(np.intp)
+        inside = (columns >= 0) & (columns < self.columns) & (rows >= 0) & (rows < self.rows)
+        
+        # np.add.at accumulates correctly when several people share a cell
+        np.add.at(self.grid, (rows[inside], columns[inside]), 1.0 - decay)
+    
+    def encode(self) -> Tuple[float, bytes]:
+        """
+        Quantize the grid into a compact row-major uint8 blob.
+        
+        Returns:
+            Tuple of (peak value that byte 255 represents, blob bytes)
+        """
+        peak = float(self.grid.max())
+        if peak <= 0:
+            return 0.0, bytes(self.grid.size)
+        
+        quantized = np.rint(self.grid * (255.0 / peak)).astype(np.uint8)
+        return peak, quantized.tobytes()
+
+
+# ================================
+# FLOOR ZONES
+# ================================
+
+def points_in_polygon(points: np.ndarray, polygon: np.ndarray) -> np.ndarray:
+    """Check which (N, 2) points lie inside a (K, 2) polygon (even-odd rule)"""
+    x, y = points[:, 0:1], points[:, 1:2]
+    start_x, start_y = polygon[:, 0], polygon[:, 1]
+    end_x, end_y = np.roll(start_x, 1), np.roll(start_y, 1)
+    
+    # Count polygon edges crossed by a ray from each point towards +x
+    straddles = (start_y > y) != (end_y > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crossing_x = start_x + (y - start_y) * (end_x - start_x) / (end_y - start_y)
+    crossings = straddles & (x < crossing_x)
+    return crossings.sum(axis=1) % 2 == 1
+
+
+def load_floor_zones(zones_file_path: str) -> List[Tuple[str, np.ndarray]]:
+    """
+    Load named floor zones from a JSON file.
+    
+    The file holds {"zones": [{"name": "pad area", "polygon": [[x, y], ...]}, ...]}
+    with polygon vertices in floor meters. Zones may overlap.
+    
+    Returns:
+        List of (name, (K, 2) polygon) tuples in file order
+    """
+    with open(zones_file_path) as zones_file:
+        definition = json.load(zones_file)
+    
+    zones = []
+    for zone in definition["zones"]:
+        polygon = np.array(zone["polygon"], dtype=np.float64)
+        if polygon.ndim != 2 or polygon.shape[1] != 2 or len(polygon) < 3:
+            raise ValueError(f"Zone {zone['name']!r} needs a polygon of at least three [x, y] points")
+        zones.append((str(zone["name"]), polygon))
+    if len(set(name for name, _ in zones)) != len(zones):
+        raise ValueError(f"Zone names in {zones_file_path} must be unique")
+    return zones
+
+
+class FloorZoneIndex:
+    """
+    Grid index answering "which zones contain this floor point" in constant time.
+    
+    The bounding box of all zones is divided into square cells. For each cell
+    the zones covering it entirely and the zones whose outline passes through
+    it are precomputed, so a lookup is one cell access plus an exact polygon
+    test only for the few zones whose edge crosses that cell.
+    """
+    
+    def __init__(
+        self,
+        zones: List[Tuple[str, np.ndarray]],
+        cell_size: float = 0.1,
+        max_cells: int = 2_000_000
+    ):
+        """
+        Build the grid.
+        
+        Args:
+            zones: (name, (K, 2) polygon in floor meters) tuples, e.g. from load_floor_zones
+            cell_size: Edge length of one grid cell in meters
+            max_cells: Largest grid to build (about 100 bytes each); bigger zone
+                layouts need a larger cell size
+        """
+        if not zones:
+            raise ValueError("At least one zone is needed")
+        if cell_size <= 0:
+            raise ValueError(f"Cell size must be positive, got {cell_size}")
+        
+        self.zone_names = [name for name, _ in zones]
+        self.zone_polygons = [polygon for _, polygon in zones]
+        self.cell_size = cell_size
+        all_vertices = np.concatenate(self.zone_polygons)
+        self.min_x, self.min_y = all_vertices.min(axis=0)
+        max_x, max_y = all_vertices.max(axis=0)
+        self.columns = max(1, int(math.ceil((max_x - self.min_x) / cell_size)))
+        self.rows = max(1, int(math.ceil((max_y - self.min_y) / cell_size)))
+        if self.columns * self.rows > max_cells:
+            raise ValueError(
+                f"Zones span {max_x - self.min_x:.1f} x {max_y - self.min_y:.1f} m, which needs "
+                f"{self.columns * self.rows:,} cells of {cell_size} m (limit {max_cells:,}); use a larger cell size"
+            )
+        
+        center_xs = self.min_x + (np.arange(self.columns) + 0.5) * cell_size
+        center_ys = self.min_y + (np.arange(self.rows) + 0.5) * cell_size
+        inside_stack = np.zeros((self.rows, self.columns, len(zones)), dtype=bool)
+        boundary_stack = np.zeros((self.rows, self.columns, len(zones)), dtype=bool)
+        for zone, polygon in enumerate(self.zone_polygons):
+            boundary_stack[:, :, zone] = self._boundary_cells(polygon)
+            # Row by row, so the (cells, edges) intermediates stay small
+            for row, center_y in enumerate(center_ys):
+                row_centers = np.stack([center_xs, np.full_like(center_xs, center_y)], axis=1)
+                inside_stack[row, :, zone] = points_in_polygon(row_centers, polygon)
+        inside_stack &= ~boundary_stack
+        
+        # Every distinct (inside, boundary) combination is stored once and shared by its cells
+        cell_codes = np.packbits(np.concatenate([inside_stack, boundary_stack], axis=-1), axis=-1)
+        unique_codes, cell_entry_index = np.unique(
+            cell_codes.reshape(-1, cell_codes.shape[-1]), axis=0, return_inverse=True
+        )
+        entries = []
+        for code in unique_codes:
+            members = np.unpackbits(code)[:2 * len(zones)]
+            entries.append((tuple(np.flatnonzero(members[:len(zones)]).tolist()),
+                            tuple(np.flatnonzero(members[len(zones):]).tolist())))
+        # Nested lists of shared tuples: scalar lookups in plain Python are
+        # several times faster than indexing NumPy arrays one point at a time
+        self._cell_entries: List[List[Tuple[Tuple[int, ...], Tuple[int, ...]]]] = [
+            [entries[index] for index in row]
+            for row in cell_entry_index.reshape(self.rows, self.columns).tolist()
+        ]
+        self._zone_edges = [
+            [(float(x1), float(y1), float(x2), float(y2))
+             for (x1, y1), (x2, y2) in zip(polygon, np.roll(polygon, 1, axis=0))]
+            for polygon in self.zone_polygons
+        ]
+        self.boundary_cell_fraction = float(boundary_stack.any(axis=-1).mean())
+    
+    def _boundary_cells(self, polygon: np.ndarray) -> np.ndarray:
+        """Cells an edge of the polygon may pass through"""
+        # Samples closer together than half a cell leave every point of an edge
+        # within a quarter cell of a sample, so the cells around the sampled
+        # ones include every cell the edge touches
+        next_vertices = np.roll(polygon, -1, axis=0)
+        samples = []
+        for start, end in zip(polygon, next_vertices):
+            count = int(math.ceil(np.linalg.norm(end - start) / (0.5 * self.cell_size))) + 1
+            samples.append(start + np.linspace(0.0, 1.0, count)[:, None] * (end - start))
+        samples = np.concatenate(samples)
+        columns = np.clip(np.floor((samples[:, 0] - self.min_x) / self.cell_size).astype(np.intp), 0, self.columns - 1)
+        rows = np.clip(np.floor((samples[:, 1] - self.min_y) / self.cell_size).astype(np.intp), 0, self.rows - 1)
+        
+        sampled = np.zeros((self.rows + 2, self.columns + 2), dtype=bool)
+        sampled[rows + 1, columns + 1] = True
+        boundary = np.zeros((self.rows, self.columns), dtype=bool)
+        for row_offset in range(3):
+            for column_offset in range(3):
+                boundary |= sampled[row_offset:row_offset + self.rows, column_offset:column_offset + self.columns]
+        return boundary
+    
+    def zones_at(self, floor_x: float, floor_y: float) -> Tuple[int, ...]:
+        """Indices (into zone_names) of the zones containing a floor point"""
+        column = int(math.floor((floor_x - self.min_x) / self.cell_size))
+        row = int(math.floor((floor_y - self.min_y) / self.cell_size))
+        if not (0 <= column < self.columns and 0 <= row < self.rows):
+            return ()
+        
+        inside, boundary = self._cell_entries[row][column]
+        if not boundary:
+            return inside
+        return tuple(sorted(inside + tuple(
+            zone for zone in boundary if self._zone_contains(zone, floor_x, floor_y)
+        )))
+    
+    def _zone_contains(self, zone: int, x: float, y: float) -> bool:
+        """Exact even-odd test of one point, like points_in_polygon"""
+        inside = False
+        for start_x, start_y, end_x, end_y in self._zone_edges[zone]:
+            if (start_y > y) != (end_y > y) and x < start_x + (y - start_y) * (end_x - start_x) / (end_y - start_y):
+                inside = not inside
+        return inside
+
+
 # ================================
 # I/O IMPLEMENTATIONS
 # ================================
 
+# One person in a /people/skeletons blob (93 bytes)
+SKELETON_RECORD_DTYPE = np.dtype([
+    ("person_id", "<u4"),
+    ("floor_x_mm", "<i2"),
+    ("floor_y_mm", "<i2"),
+    ("keypoints", "<i2", (len(COCO_KEYPOINT_NAMES), 2)),   # x, y scaled by frame width, height
+    ("confidences", "u1", (len(COCO_KEYPOINT_NAMES),)),
+])
+SKELETON_COORDINATE_SCALE = 32767
+
+
+def encode_skeleton_records(frame_analysis: FrameAnalysis) -> np.ndarray:
+    """Quantize the tracked people of a frame into SKELETON_RECORD_DTYPE records"""
+    people = [
+        person for person in frame_analysis.detected_people
+        if person.floor_position is not None and person.keypoint_array is not None
+    ]
+    records = np.zeros(len(people), dtype=SKELETON_RECORD_DTYPE)
+    if not people:
+        return records
+    
+    width, height = frame_analysis.frame_size
+    keypoints = np.stack([person.keypoint_array for person in people])
+    normalized = keypoints[:, :, :2] / np.array([width, height], dtype=np.float32)
+    records["person_id"] = [person.person_id for person in people]
+    records["floor_x_mm"] = np.clip(np.rint([person.floor_position.floor_x * 1000 for person in people]),
+                                    -32768, 32767)
+    records["floor_y_mm"] = np.clip(np.rint([person.floor_position.floor_y * 1000 for person in people]),
+                                    -32768, 32767)
+    records["keypoints"] = np.clip(np.rint(normalized * SKELETON_COORDINATE_SCALE), -32768, 32767)
+    records["confidences"] = np.clip(np.rint(keypoints[:, :, 2] * 255), 0, 255)
+    return records
+
+
 class ConsoleOutputHandler:
     """Handles console output for detection results"""
     
@@ -365,6 +722,13 @@ class ConsoleOutputHandler:
         """Log detection information to console"""
         print(f"\n--- Frame {frame_analysis.frame_number}: {len(frame_analysis.detected_people)} person(s) detected ---")
         print(f"Processing time: {frame_analysis.processing_time_ms:.1f}ms")
+        if frame_analysis.inference_skipped:
+            print("Scene unchanged: reused previous detections")
+        if frame_analysis.stage_times_ms:
+            stage_times = ", ".join(
+                f"{stage}: {time_ms:.1f}ms" for stage, time_ms in frame_analysis.stage_times_ms.items()
+            )
+            print(f"Stage times: {stage_times}")
         
         for person in frame_analysis.detected_people:
             print(f"\nPerson ID {person.person_id}:")
@@ -382,8 +746,17 @@ class ConsoleOutputHandler:
 class OSCOutputHandler:
     """Handles OSC communication for position data"""
     
-    def __init__(self, osc_host: str = "127.0.0.1", osc_port: int = 9000):
-        self.osc_client = SimpleUDPClient(osc_host, osc_port)
+    def __init__(
+        self, 
+        osc_host: str = "127.0.0.1", 
+        osc_port: int = 9000, 
+        osc_client: Optional[OSCClient] = None,
+        include_capture_timestamp: bool = False,
+        position_deadband: float = 0.0  # meters a person must move before positions are resent
+    ):
+        self.osc_client = osc_client or SimpleUDPClient(osc_host, osc_port)
+        self.include_capture_timestamp = include_capture_timestamp
+        self.position_deadband = position_deadband
         self.last_positions: dict[int, Tuple[float, float]] = {}
     
     def log_detection_info(self, frame_analysis: FrameAnalysis) -> None:
@@ -403,14 +776,398 @@ class OSCOutputHandler:
                 )
         
         # Check if positions have changed
-        if current_positions != self.last_positions:
+        if self._positions_changed(current_positions):
             # Send OSC message with all current positions
             message_data = []
             for person_id, (x, y) in current_positions.items():
                 message_data.extend([person_id, x, y])
             
+            # Trailing capture time in integer microseconds, which is sent as
+            # int64 (a float32 can't hold an epoch timestamp precisely)
+            if self.include_capture_timestamp and frame_analysis.capture_timestamp is not None:
+                message_data.append(int(frame_analysis.capture_timestamp * 1_000_000))
+            
             self.osc_client.send_message("/people/positions", message_data)
             self.last_positions = current_positions.copy()
+    
+    def _positions_changed(self, current_positions: dict[int, Tuple[float, float]]) -> bool:
+        """Check for new or lost people, or anyone moving further than the deadband since the last send"""
+        if self.position_deadband <= 0:
+            return current_positions != self.last_positions
+        if current_positions.keys() != self.last_positions.keys():
+            return True
+        return any(
+            abs(x - self.last_positions[person_id][0]) > self.position_deadband or
+            abs(y - self.last_positions[person_id][1]) > self.position_deadband
+            for person_id, (x, y) in current_positions.items()
+        )
+
+
+class OccupancyOSCOutputHandler:
+    """Maintains the floor occupancy grid and publishes it via OSC at a fixed rate"""
+    
+    def __init__(
+        self,
+        occupancy_grid: FloorOccupancyGrid,
+        osc_host: str = "127.0.0.1",
+        osc_port: int = 9000,
+        publish_rate_hz: float = 5.0,
+        osc_client: Optional[OSCClient] = None
+    ):
+        self.osc_client = osc_client or SimpleUDPClient(osc_host, osc_port)
+        self.occupancy_grid = occupancy_grid
+        self.publish_interval = 1.0 / publish_rate_hz if publish_rate_hz > 0 else 0.0
+        self._last_publish_time: Optional[float] = None
+    
+    def log_detection_info(self, frame_analysis: FrameAnalysis) -> None:
+        """Occupancy handler doesn't log to console"""
+        pass
+    
+    def send_positions_frame(self, frame_analysis: FrameAnalysis) -> None:
+        """Update the grid every frame, but only publish it at the configured rate"""
+        now = time.monotonic()
+        floor_positions = [
+            person.floor_position for person in frame_analysis.detected_people
+            if person.floor_position is not None
+        ]
+        self.occupancy_grid.update(floor_positions, now)
+        
+        if (self._last_publish_time is None or
+            now - self._last_publish_time >= self.publish_interval):
+            self._publish()
+            self._last_publish_time = now
+    
+    def _publish(self) -> None:
+        """Send the grid as [columns, rows, min_x, min_y, cell_size, peak, blob]"""
+        grid = self.occupancy_grid
+        peak, blob = grid.encode()
+        self.osc_client.send_message("/floor/occupancy", [
+            grid.columns, grid.rows,
+            float(grid.min_x), float(grid.min_y), float(grid.cell_size),
+            peak, blob
+        ])
+
+
+class ZoneOSCOutputHandler:
+    """
+    Tracks which floor zones every person is in and sends only the changes via OSC.
+    
+    Messages:
+        /zones/enter [person_id, zone_name]
+        /zones/exit [person_id, zone_name]
+        /zones/occupancy [zone_name, count] whenever a zone's head count changes
+    
+    A person keeps their zones while briefly undetected and exits them when
+    the tracker drops their ID. Leaving a zone is only reported after staying
+    outside it for the exit delay, so jitter on a zone edge doesn't produce a
+    burst of exit/enter pairs. All counts are resent periodically so a late or
+    lossy receiver catches up.
+    """
+    
+    def __init__(
+        self,
+        zone_index: FloorZoneIndex,
+        osc_host: str = "127.0.0.1",
+        osc_port: int = 9000,
+        osc_client: Optional[OSCClient] = None,
+        exit_delay_seconds: float = 0.3,
+        refresh_interval_seconds: float = 5.0  # 0 only sends counts when they change
+    ):
+        self.osc_client = osc_client or SimpleUDPClient(osc_host, osc_port)
+        self.zone_index = zone_index
+        self.exit_delay_seconds = exit_delay_seconds
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.zone_counts = [0] * len(zone_index.zone_names)
+        self._members: dict[int, set[int]] = {}  # person ID -> zone indices they are in
+        self._outside_since: dict[Tuple[int, int], float] = {}  # (person ID, zone) -> time they left
+        self._last_refresh_time: Optional[float] = None
+    
+    def log_detection_info(self, frame_analysis: FrameAnalysis) -> None:
+        """Zone handler doesn't log to console"""
+        pass
+    
+    def send_positions_frame(self, frame_analysis: FrameAnalysis) -> None:
+        """Update zone membership from this frame's floor positions and send what changed"""
+        now = time.monotonic()
+        changed_zones = set()
+        
+        for person in frame_analysis.detected_people:
+            if person.floor_position is None:
+                continue
+            person_id = person.person_id
+            zones = set(self.zone_index.zones_at(person.floor_position.floor_x, person.floor_position.floor_y))
+            members = self._members.setdefault(person_id, set())
+            
+            for zone in zones - members:
+                self._enter(person_id, zone)
+                changed_zones.add(zone)
+            for zone in zones:
+                self._outside_since.pop((person_id, zone), None)
+            for zone in members - zones:
+                left_time = self._outside_since.setdefault((person_id, zone), now)
+                if now - left_time >= self.exit_delay_seconds:
+                    self._exit(person_id, zone)
+                    changed_zones.add(zone)
+        
+        for person_id in frame_analysis.removed_person_ids:
+            for zone in sorted(self._members.get(person_id, ())):
+                self._exit(person_id, zone)
+                changed_zones.add(zone)
+            self._members.pop(person_id, None)
+        
+        if (self.refresh_interval_seconds > 0 and
+            (self._last_refresh_time is None or now - self._last_refresh_time >= self.refresh_interval_seconds)):
+            changed_zones = range(len(self.zone_counts))
+            self._last_refresh_time = now
+        for zone in sorted(changed_zones):
+            self.osc_client.send_message("/zones/occupancy", [self.zone_index.zone_names[zone], self.zone_counts[zone]])
+    
+    def _enter(self, person_id: int, zone: int) -> None:
+        self._members[person_id].add(zone)
+        self.zone_counts[zone] += 1
+        self.osc_client.send_message("/zones/enter", [person_id, self.zone_index.zone_names[zone]])
+    
+    def _exit(self, person_id: int, zone: int) -> None:
+        self._members[person_id].discard(zone)
+        self._outside_since.pop((person_id, zone), None)
+        self.zone_counts[zone] -= 1
+        self.osc_client.send_message("/zones/exit", [person_id, self.zone_index.zone_names[zone]])
+
+
+class KinematicsOSCOutputHandler:
+    """Sends per-person movement features via OSC"""
+    
+    def __init__(
+        self, 
+        osc_host: str = "127.0.0.1", 
+        osc_port: int = 9000, 
+        osc_client: Optional[OSCClient] = None
+    ):
+        self.osc_client = osc_client or SimpleUDPClient(osc_host, osc_port)
+    
+    def log_detection_info(self, frame_analysis: FrameAnalysis) -> None:
+        """Kinematics handler doesn't log to console"""
+        pass
+    
+    def send_positions_frame(self, frame_analysis: FrameAnalysis) -> None:
+        """Send one /people/kinematics message per detected person"""
+        for kinematics in frame_analysis.kinematics:
+            self.osc_client.send_message("/people/kinematics", [
+                kinematics.person_id,
+                kinematics.velocity_x, kinematics.velocity_y,
+                kinematics.acceleration_x, kinematics.acceleration_y,
+                kinematics.left_arm_height, kinematics.right_arm_height,
+                kinematics.left_arm_extension, kinematics.right_arm_extension,
+                kinematics.left_leg_extension, kinematics.right_leg_extension
+            ])
+
+
+class SkeletonOSCOutputHandler:
+    """
+    Streams all tracked skeletons as one quantized binary blob per frame via OSC.
+    
+    Message: /people/skeletons [sequence, keyframe, blob]
+    
+    The blob (little-endian) is a header of uint16 person count and uint16
+    removed count, then one SKELETON_RECORD_DTYPE record per person, then the
+    removed person IDs as uint32. Keypoint coordinates are divided by the frame
+    width/height and scaled to int16 (32767 = right/bottom edge), confidences
+    to uint8 (255 = 1.0), floor positions are in millimeters.
+    
+    Keyframes (keyframe = 1) list everyone currently tracked and replace the
+    receiver's state. Between keyframes only people whose keypoints moved more
+    than the deadband since they were last sent are included, together with
+    the people who left. A receiver that joins late or sees a gap in the
+    sequence numbers is correct again after the next keyframe.
+    """
+    
+    def __init__(
+        self,
+        osc_host: str = "127.0.0.1",
+        osc_port: int = 9000,
+        osc_client: Optional[OSCClient] = None,
+        keyframe_interval_seconds: float = 1.0,
+        keypoint_deadband: float = 0.002  # fraction of the frame size
+    ):
+        self.osc_client = osc_client or SimpleUDPClient(osc_host, osc_port)
+        self.keyframe_interval_seconds = keyframe_interval_seconds
+        self.deadband_units = int(round(keypoint_deadband * SKELETON_COORDINATE_SCALE))
+        self.sequence = 0
+        self._last_keyframe_time: Optional[float] = None
+        self._sent_keypoints: dict[int, np.ndarray] = {}  # person ID -> last sent int16 keypoints
+    
+    def log_detection_info(self, frame_analysis: FrameAnalysis) -> None:
+        """Skeleton handler doesn't log to console"""
+        pass
+    
+    def send_positions_frame(self, frame_analysis: FrameAnalysis) -> None:
+        """Send a keyframe when one is due, otherwise the changes since the last send"""
+        if frame_analysis.frame_size is None:
+            return
+        records = encode_skeleton_records(frame_analysis)
+        
+        now = time.monotonic()
+        keyframe = (self._last_keyframe_time is None or
+                    now - self._last_keyframe_time >= self.keyframe_interval_seconds)
+        if keyframe:
+            changed = records
+            removed_ids: List[int] = []
+            self._sent_keypoints = {}
+            self._last_keyframe_time = now
+        else:
+            changed_mask = np.array([
+                person_id not in self._sent_keypoints or
+                np.abs(keypoints.astype(np.int32) - self._sent_keypoints[person_id]).max() > self.deadband_units
+                for person_id, keypoints in zip(records["person_id"].tolist(), records["keypoints"])
+            ], dtype=bool)
+            changed = records[changed_mask]
+            current_ids = set(records["person_id"].tolist())
+            removed_ids = [person_id for person_id in self._sent_keypoints if person_id not in current_ids]
+            if len(changed) == 0 and not removed_ids:
+                return
+        
+        for person_id in removed_ids:
+            del self._sent_keypoints[person_id]
+        for person_id, keypoints in zip(changed["person_id"].tolist(), changed["keypoints"]):
+            self._sent_keypoints[person_id] = keypoints.copy()
+        
+        blob = (np.array([len(changed), len(removed_ids)], dtype="<u2").tobytes() +
+                changed.tobytes() + np.array(removed_ids, dtype="<u4").tobytes())
+        self.osc_client.send_message("/people/skeletons", [self.sequence, int(keyframe), blob])
+        self.sequence += 1
+
+
+@dataclass(frozen=True)
+class OSCDestination:
+    """A UDP destination of the fan-out OSC client"""
+    host: str
+    port: int
+    max_rate_hz: float = 0.0  # messages per second per OSC address, 0 for unlimited
+
+
+def parse_osc_destination(text: str) -> OSCDestination:
+    """Parse HOST:PORT or HOST:PORT@MAX_RATE_HZ"""
+    address, _, rate = text.partition("@")
+    host, _, port = address.rpartition(":")
+    if not host or not port:
+        raise argparse.ArgumentTypeError(f"Expected HOST:PORT[@MAX_RATE_HZ], got '{text}'")
+    return OSCDestination(host, int(port), float(rate) if rate else 0.0)
+
+
+class FanOutOSCClient:
+    """
+    OSC client delivering every message to several UDP destinations from a background thread.
+    
+    send_message only queues the message, so the tracking loop pays the same
+    small cost however many destinations there are. The background thread
+    encodes each message once and sends the same datagram to every destination.
+    Multicast group addresses reach every listener on the local network.
+    
+    Destinations with a rate limit get at most max_rate_hz messages per second
+    per OSC address. Messages in between are coalesced, and the newest one is
+    sent when the interval is up. This suits state messages like
+    /people/positions, but not the deltas of /people/skeletons.
+    """
+    
+    def __init__(
+        self,
+        destinations: List[OSCDestination],
+        multicast_ttl: int = 1,
+        queue_size: int = 256
+    ):
+        """
+        Open the socket and start the sender thread.
+        
+        Args:
+            destinations: Where every message is sent
+            multicast_ttl: Router hops multicast datagrams may cross (1 = local network only)
+            queue_size: Messages queued before new ones are dropped
+        """
+        self.destinations = destinations
+        self._socket_addresses = [
+            (socket.gethostbyname(destination.host), destination.port) for destination in destinations
+        ]
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        if any(ipaddress.ip_address(host).is_multicast for host, _ in self._socket_addresses):
+            self._socket.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, multicast_ttl)
+        
+        self.messages_sent = 0
+        self.datagrams_sent = 0
+        self.dropped_messages = 0   # queue was full
+        self.coalesced_messages = 0  # replaced by a newer message under a rate limit
+        self.send_errors = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="osc-fanout", daemon=True)
+        self._thread.start()
+    
+    def send_message(self, address: str, value: Any) -> None:
+        """Queue a message for all destinations without blocking"""
+        try:
+            self._queue.put_nowait((address, value))
+        except queue.Full:
+            self.dropped_messages += 1
+    
+    def _run(self) -> None:
+        """Encode queued messages and deliver them, holding back rate-limited ones"""
+        next_allowed: dict[Tuple[int, str], float] = {}
+        held: dict[Tuple[int, str], bytes] = {}
+        while True:
+            timeout = None
+            if held:
+                timeout = max(min(next_allowed[key] for key in held) - time.monotonic(), 0.0)
+            try:
+                message = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                message = ()
+            if message is None:
+                break
+            
+            now = time.monotonic()
+            if message:
+                address, value = message
+                builder = OscMessageBuilder(address=address)
+                values = value if isinstance(value, (list, tuple)) else [value]
+                for argument in values:
+                    builder.add_arg(argument)
+                datagram = builder.build().dgram
+                self.messages_sent += 1
+                
+                for index, destination in enumerate(self.destinations):
+                    if destination.max_rate_hz <= 0:
+                        self._send(datagram, index)
+                        continue
+                    key = (index, address)
+                    if key in held:
+                        self.coalesced_messages += 1
+                    held[key] = datagram
+            
+            for key in [key for key in held if now >= next_allowed.get(key, 0.0)]:
+                index = key[0]
+                self._send(held.pop(key), index)
+                next_allowed[key] = now + 1.0 / self.destinations[index].max_rate_hz
+        
+        # Deliver the newest held message of each address before closing
+        for (index, _), datagram in held.items():
+            self._send(datagram, index)
+    
+    def _send(self, datagram: bytes, destination_index: int) -> None:
+        try:
+            self._socket.sendto(datagram, self._socket_addresses[destination_index])
+            self.datagrams_sent += 1
+        except OSError:
+            self.send_errors += 1  # e.g. a destination's network is down; keep serving the others
+    
+    def describe(self) -> str:
+        """Summarize delivery counters"""
+        return (f"OSC fan-out to {len(self.destinations)} destination(s): {self.messages_sent} messages, "
+                f"{self.datagrams_sent} datagrams, {self.coalesced_messages} coalesced by rate limits, "
+                f"{self.dropped_messages} dropped (queue full), {self.send_errors} send errors")
+    
+    def close(self) -> None:
+        """Send everything already queued, then stop the thread and close the socket"""
+        self._queue.put(None)
+        self._thread.join()
+        self._socket.close()
 
 
 class CombinedOutputHandler:
@@ -574,83 +1331,641 @@ class OpenCVVisualizer:
         return id_x, id_y
 
 
-class PersonTracker:
+# ================================
+# APPEARANCE RE-IDENTIFICATION
+# ================================
+
+class AppearanceReidentifier:
     """
-    Manages stable person IDs across frames using floor position tracking.
+    Lightweight appearance embeddings for keeping person IDs stable.
     
-    This class maintains a registry of people and matches new detections to
-    existing tracked people based on floor position proximity, ensuring
-    stable IDs for tracking applications.
+    An embedding is a pair of hue/saturation histograms of the upper and lower
+    half of a person's bounding box crop (roughly: top and trousers). They are
+    computed lazily - only when floor distance alone can't settle an assignment
+    or a new track might be a returning person - and the embeddings of recently
+    lost tracks are kept in a bounded LRU cache so their IDs can be recovered.
+    A cached ID is still recoverable, so it is only reported as removed once it
+    is evicted from the cache (by age or by size).
     """
     
     def __init__(
         self,
-        max_distance_threshold: float = 2.0,  # meters
-        max_frames_missing: int = 30,  # frames before considering person "lost"
-        min_detections_for_stability: int = 3  # minimum detections before ID is considered stable
+        lost_track_cache_size: int = 32,
+        lost_track_timeout: int = 150,  # frames a lost track stays recoverable
+        similarity_threshold: float = 0.8,  # cosine similarity needed to recover an ID
+        appearance_weight: float = 1.0,  # meters of distance cost per unit of dissimilarity
+        ambiguity_margin: float = 0.5,  # meters between best and second-best candidate
+        embedding_momentum: float = 0.8  # how much of a track's old embedding to keep on refresh
     ):
         """
-        Initialize person tracker with configurable parameters.
+        Initialize the re-identifier.
         
         Args:
-            max_distance_threshold: Maximum distance (meters) to consider a match
-            max_frames_missing: Frames without detection before removing a person
-            min_detections_for_stability: Minimum detections for a stable track
+            lost_track_cache_size: Maximum number of lost tracks remembered
+            lost_track_timeout: Frames after which a lost track is evicted
+            similarity_threshold: Minimum cosine similarity to recover a lost track
+            appearance_weight: Weight of appearance dissimilarity in matching cost
+            ambiguity_margin: Candidates closer than this (meters) are ambiguous
+            embedding_momentum: Blend factor when refreshing a track embedding
         """
-        self.max_distance_threshold = max_distance_threshold
-        self.max_frames_missing = max_frames_missing
-        self.min_detections_for_stability = min_detections_for_stability
+        self.lost_track_cache_size = lost_track_cache_size
+        self.lost_track_timeout = lost_track_timeout
+        self.similarity_threshold = similarity_threshold
+        self.appearance_weight = appearance_weight
+        self.ambiguity_margin = ambiguity_margin
+        self.embedding_momentum = embedding_momentum
         
-        self.tracked_people: dict[int, TrackedPerson] = {}
-        self.next_person_id = 0
-        self.current_frame = 0
+        self.track_embeddings: dict[int, np.ndarray] = {}
+        self.lost_track_embeddings: OrderedDict[int, np.ndarray] = OrderedDict()
+        self._lost_track_frames: dict[int, int] = {}
+        self._evicted_track_ids: List[int] = []
+        
+        self.frame_time_ms = 0.0
+        self._frame: Optional[np.ndarray] = None
+        self._frame_embeddings: dict[int, Optional[np.ndarray]] = {}
     
-    def update_frame(self, detected_people: List[PersonDetection], frame_number: int) -> Tuple[List[PersonDetection], List[int]]:
+    def begin_frame(self, frame: Optional[np.ndarray]) -> None:
+        """Reset per-frame state; embeddings are computed from this frame on demand"""
+        self._frame = frame
+        self._frame_embeddings = {}
+        self.frame_time_ms = 0.0
+    
+    def embedding_for_detection(
+        self, 
+        detection_idx: int, 
+        person: PersonDetection
+    ) -> Optional[np.ndarray]:
+        """Get the embedding of a detection in the current frame, computing it at most once"""
+        if detection_idx not in self._frame_embeddings:
+            start_time = time.perf_counter()
+            self._frame_embeddings[detection_idx] = self.compute_embedding(
+                self._frame, person.bounding_box
+            )
+            self.frame_time_ms += (time.perf_counter() - start_time) * 1000
+        return self._frame_embeddings[detection_idx]
+    
+    def computed_embedding(self, detection_idx: int) -> Optional[np.ndarray]:
+        """Get a detection's embedding only if it was already needed this frame"""
+        return self._frame_embeddings.get(detection_idx)
+    
+    def compute_embedding(
+        self, 
+        frame: Optional[np.ndarray], 
+        bounding_box: Optional[BoundingBox]
+    ) -> Optional[np.ndarray]:
         """
-        Update tracking for a new frame and return people with stable IDs.
+        Compute an L2-normalized appearance embedding from a bounding box crop.
         
-        Args:
-            detected_people: List of detections from current frame
-            frame_number: Current frame number
-            
         Returns:
-            Tuple of:
-            - List of PersonDetection objects with stable person_ids
-            - List of person IDs that left the frame
+            Embedding vector, or None if there is no usable crop
         """
-        self.current_frame = frame_number
+        if frame is None or bounding_box is None:
+            return None
         
-        # Extract detections with floor positions for tracking
-        detections_with_positions = [
-            (i, person) for i, person in enumerate(detected_people)
-            if person.floor_position is not None
-        ]
+        frame_height, frame_width = frame.shape[:2]
+        x1, x2 = max(0, bounding_box.x1), min(frame_width, bounding_box.x2)
+        y1, y2 = max(0, bounding_box.y1), min(frame_height, bounding_box.y2)
+        if x2 - x1 < 4 or y2 - y1 < 8:
+            return None
         
-        # Match detections to existing tracked people
-        matched_pairs, unmatched_detections, unmatched_tracked = self._match_detections_to_tracks(
-            detections_with_positions
-        )
+        # A small fixed-size crop is plenty for colour statistics
+        crop = cv2.resize(frame[y1:y2, x1:x2], (16, 32), interpolation=cv2.INTER_AREA)
+        hsv_crop = cv2.cvtColor(crop, cv2.COLOR_BGR2HSV)
+        
+        histograms = []
+        for half in (hsv_crop[:16], hsv_crop[16:]):
+            histogram = cv2.calcHist([half], [0, 1], None, [16, 4], [0, 180, 0, 256])
+            histograms.append(histogram.ravel())
+        
+        # Square root (Hellinger) makes cosine similarity less dominated by one colour
+        embedding = np.sqrt(np.concatenate(histograms))
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm > 0 else None
+    
+    def appearance_costs(
+        self, 
+        embedding: Optional[np.ndarray], 
+        track_ids: List[int]
+    ) -> np.ndarray:
+        """Appearance dissimilarity cost of one detection against each track (0 if unknown)"""
+        costs = np.zeros(len(track_ids), dtype=np.float32)
+        if embedding is None:
+            return costs
+        for i, track_id in enumerate(track_ids):
+            track_embedding = self.track_embeddings.get(track_id)
+            if track_embedding is not None:
+                similarity = float(np.dot(embedding, track_embedding))
+                costs[i] = self.appearance_weight * (1.0 - similarity)
+        return costs
+    
+    def update_track(self, track_id: int, embedding: Optional[np.ndarray]) -> None:
+        """Store or refresh the embedding of an active track"""
+        if embedding is None:
+            return
+        previous = self.track_embeddings.get(track_id)
+        if previous is not None:
+            blended = self.embedding_momentum * previous + (1.0 - self.embedding_momentum) * embedding
+            embedding = blended / np.linalg.norm(blended)
+        self.track_embeddings[track_id] = embedding
+    
+    def forget_track(self, track_id: int, frame_number: int) -> bool:
+        """
+        Move a removed track's embedding into the lost track cache.
+        
+        Returns:
+            True if the track was cached (its removal is reported on eviction),
+            False if it has no embedding and is gone for good
+        """
+        embedding = self.track_embeddings.pop(track_id, None)
+        if embedding is None:
+            return False
+        self.lost_track_embeddings[track_id] = embedding
+        self.lost_track_embeddings.move_to_end(track_id)
+        self._lost_track_frames[track_id] = frame_number
+        while len(self.lost_track_embeddings) > self.lost_track_cache_size:
+            evicted_id, _ = self.lost_track_embeddings.popitem(last=False)
+            del self._lost_track_frames[evicted_id]
+            self._evicted_track_ids.append(evicted_id)
+        return True
+    
+    def expire_lost_tracks(self, frame_number: int) -> List[int]:
+        """
+        Evict lost tracks older than the timeout.
+        
+        Returns:
+            IDs evicted since the last call (by age or cache size), which can no
+            longer be recovered
+        """
+        # The cache is in loss order, so the oldest entries are at the front
+        while self.lost_track_embeddings:
+            track_id = next(iter(self.lost_track_embeddings))
+            if frame_number - self._lost_track_frames[track_id] <= self.lost_track_timeout:
+                break
+            del self.lost_track_embeddings[track_id]
+            del self._lost_track_frames[track_id]
+            self._evicted_track_ids.append(track_id)
+        
+        evicted_track_ids = self._evicted_track_ids
+        self._evicted_track_ids = []
+        return evicted_track_ids
+    
+    def recover_track(self, embedding: Optional[np.ndarray]) -> Optional[int]:
+        """
+        Find the recently lost track that best matches an embedding.
+        
+        Returns:
+            The recovered track ID (removed from the cache), or None
+        """
+        if embedding is None or not self.lost_track_embeddings:
+            return None
+        
+        best_track_id = None
+        best_similarity = self.similarity_threshold
+        for track_id, lost_embedding in self.lost_track_embeddings.items():
+            similarity = float(np.dot(embedding, lost_embedding))
+            if similarity >= best_similarity:
+                best_similarity = similarity
+                best_track_id = track_id
+        
+        if best_track_id is not None:
+            del self.lost_track_embeddings[best_track_id]
+            del self._lost_track_frames[best_track_id]
+        return best_track_id
+
+
+# ================================
+# SMOOTHING
+# ================================
+
+class OneEuroFilterBank:
+    """
+    One-Euro filters for 2D points of many tracks, indexed by track slot.
+    
+    The One-Euro filter is a low-pass filter whose cutoff frequency rises with
+    the speed of the signal: slow movements (mostly jitter) are smoothed
+    strongly, fast movements pass with little lag. Each slot holds `point_count`
+    points, and all slots are filtered at once with array operations.
+    """
+    
+    def __init__(
+        self,
+        point_count: int,
+        min_cutoff: float = 1.0,
+        beta: float = 0.0,
+        derivative_cutoff: float = 1.0
+    ):
+        """
+        Initialize an empty filter bank.
+        
+        Args:
+            point_count: Number of 2D points filtered per slot
+            min_cutoff: Cutoff frequency (Hz) at rest; lower means smoother
+            beta: Cutoff increase per unit of speed; higher means less lag
+            derivative_cutoff: Cutoff frequency (Hz) for the speed estimate
+        """
+        self.point_count = point_count
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.derivative_cutoff = derivative_cutoff
+        
+        self.capacity = 0
+        self.values = np.empty((0, point_count, 2), dtype=np.float64)
+        self.derivatives = np.empty((0, point_count, 2), dtype=np.float64)
+        self.timestamps = np.empty(0, dtype=np.float64)
+        self.initialized = np.empty(0, dtype=bool)
+    
+    def ensure_capacity(self, capacity: int) -> None:
+        """Grow the state arrays to hold at least `capacity` slots"""
+        if capacity <= self.capacity:
+            return
+        extra = capacity - self.capacity
+        self.values = np.concatenate([self.values, np.zeros((extra, self.point_count, 2))])
+        self.derivatives = np.concatenate([self.derivatives, np.zeros((extra, self.point_count, 2))])
+        self.timestamps = np.concatenate([self.timestamps, np.zeros(extra)])
+        self.initialized = np.concatenate([self.initialized, np.zeros(extra, dtype=bool)])
+        self.capacity = capacity
+    
+    def reset(self, slots: np.ndarray) -> None:
+        """Forget the state of the given slots; their next sample passes unfiltered"""
+        self.ensure_capacity(int(np.max(slots, initial=-1)) + 1)
+        self.initialized[slots] = False
+    
+    @staticmethod
+    def _smoothing_factor(cutoff: np.ndarray, elapsed: np.ndarray) -> np.ndarray:
+        time_constant = 1.0 / (2 * np.pi * cutoff)
+        return 1.0 / (1.0 + time_constant / elapsed)
+    
+    def filter(self, slots: np.ndarray, points: np.ndarray, timestamp: float) -> np.ndarray:
+        """
+        Filter one new sample per slot.
+        
+        Args:
+            slots: Track slots (N,), each appearing at most once
+            points: New samples (N, point_count, 2)
+            timestamp: Time of the samples in seconds
+            
+        Returns:
+            Filtered points (N, point_count, 2)
+        """
+        self.ensure_capacity(int(np.max(slots, initial=-1)) + 1)
+        points = np.asarray(points, dtype=np.float64)
+        
+        # Time since each slot's previous sample (tracks may have missed frames)
+        elapsed = np.maximum(timestamp - self.timestamps[slots], 1e-3)[:, None, None]
+        previous_values = self.values[slots]
+        
+        derivatives = (points - previous_values) / elapsed
+        derivatives = self.derivatives[slots] + self._smoothing_factor(
+            self.derivative_cutoff, elapsed
+        ) * (derivatives - self.derivatives[slots])
+        
+        speed = np.linalg.norm(derivatives, axis=2, keepdims=True)
+        cutoff = self.min_cutoff + self.beta * speed
+        filtered = previous_values + self._smoothing_factor(cutoff, elapsed) * (points - previous_values)
+        
+        # First sample of a track: start the filter at the measurement
+        fresh = ~self.initialized[slots]
+        filtered[fresh] = points[fresh]
+        derivatives[fresh] = 0.0
+        
+        self.values[slots] = filtered
+        self.derivatives[slots] = derivatives
+        self.timestamps[slots] = timestamp
+        self.initialized[slots] = True
+        return filtered
+
+
+class TrackSmoother:
+    """
+    Smooths the keypoints and floor position of every track with One-Euro filters.
+    
+    Filter state is kept per track slot; PersonTracker resets it whenever a
+    slot is allocated to a new track or released.
+    """
+    
+    def __init__(
+        self,
+        min_cutoff: float = 1.0,
+        keypoint_beta: float = 0.01,
+        floor_beta: float = 1.0,
+        derivative_cutoff: float = 1.0
+    ):
+        """
+        Initialize the smoother.
+        
+        Args:
+            min_cutoff: Cutoff frequency (Hz) at rest
+            keypoint_beta: Speed coefficient for keypoints (speed in pixels/s)
+            floor_beta: Speed coefficient for floor positions (speed in meters/s)
+            derivative_cutoff: Cutoff frequency (Hz) for the speed estimates
+        """
+        self.keypoint_filters = OneEuroFilterBank(
+            len(COCO_KEYPOINT_NAMES), min_cutoff, keypoint_beta, derivative_cutoff
+        )
+        self.floor_filters = OneEuroFilterBank(1, min_cutoff, floor_beta, derivative_cutoff)
+    
+    def reset(self, slots: np.ndarray) -> None:
+        """Clear the filter state of the given track slots"""
+        self.keypoint_filters.reset(slots)
+        self.floor_filters.reset(slots)
+    
+    def smooth(
+        self,
+        slots: np.ndarray,
+        keypoints: np.ndarray,
+        floor_positions: np.ndarray,
+        timestamp: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Smooth this frame's detections of the given tracks.
+        
+        Args:
+            slots: Track slots (N,)
+            keypoints: Raw keypoints (N, 17, 3); confidences are passed through
+            floor_positions: Floor positions (N, 2) in meters
+            timestamp: Time of the frame in seconds
+            
+        Returns:
+            Tuple of (smoothed keypoints (N, 17, 3), smoothed floor positions (N, 2))
+        """
+        smoothed_keypoints = np.array(keypoints, dtype=np.float32)
+        smoothed_keypoints[:, :, :2] = self.keypoint_filters.filter(slots, keypoints[:, :, :2], timestamp)
+        smoothed_floor = self.floor_filters.filter(slots, floor_positions[:, None, :], timestamp)[:, 0]
+        return smoothed_keypoints, smoothed_floor
+
+
+# ================================
+# TRACKING
+# ================================
+
+class TrackStore:
+    """
+    Compact array-backed storage for the state of tracked people.
+    
+    Every track occupies one slot in a set of preallocated NumPy arrays, so
+    aging, removal and distance computation are whole-array operations instead
+    of Python loops. Released slots go on a free list and are reused; the arrays
+    only grow (by doubling) if more tracks are alive at once than ever before.
+    
+    Each slot also has ring buffers of the track's last `history_length`
+    detections (keypoints, floor positions and timestamps).
+    """
+    
+    def __init__(self, initial_capacity: int = 64, history_length: int = 16):
+        """
+        Initialize the track store.
+        
+        Args:
+            initial_capacity: Number of track slots to preallocate
+            history_length: Number of past detections kept per track
+        """
+        self.history_length = history_length
+        self.capacity = 0
+        self.person_ids = np.empty(0, dtype=np.int64)
+        self.positions = np.empty((0, 2), dtype=np.float32)  # last floor x/y in meters, NaN if unknown
+        self.frames_since_detection = np.empty(0, dtype=np.int32)
+        self.total_detections = np.empty(0, dtype=np.int32)
+        self.first_seen_frames = np.empty(0, dtype=np.int64)
+        self.last_seen_frames = np.empty(0, dtype=np.int64)
+        self.active = np.empty(0, dtype=bool)
+        self._free_slots: List[int] = []
+        
+        # Ring buffers: history_heads is the next write position, history_counts
+        # the number of valid entries (up to history_length)
+        self.keypoint_history = np.empty((0, history_length, len(COCO_KEYPOINT_NAMES), 3), dtype=np.float32)
+        self.floor_history = np.empty((0, history_length, 2), dtype=np.float32)
+        self.time_history = np.empty((0, history_length), dtype=np.float64)
+        self.history_heads = np.empty(0, dtype=np.intp)
+        self.history_counts = np.empty(0, dtype=np.intp)
+        
+        self._grow(max(1, initial_capacity))
+    
+    def _grow(self, new_capacity: int) -> None:
+        """Enlarge all arrays to `new_capacity` slots, keeping existing tracks"""
+        def extend(array: np.ndarray, fill_value) -> np.ndarray:
+            extension = np.full((new_capacity - self.capacity,) + array.shape[1:], fill_value, dtype=array.dtype)
+            return np.concatenate([array, extension])
+        
+        self.person_ids = extend(self.person_ids, -1)
+        self.positions = extend(self.positions, np.nan)
+        self.frames_since_detection = extend(self.frames_since_detection, 0)
+        self.total_detections = extend(self.total_detections, 0)
+        self.first_seen_frames = extend(self.first_seen_frames, 0)
+        self.last_seen_frames = extend(self.last_seen_frames, 0)
+        self.active = extend(self.active, False)
+        self.keypoint_history = extend(self.keypoint_history, 0.0)
+        self.floor_history = extend(self.floor_history, np.nan)
+        self.time_history = extend(self.time_history, 0.0)
+        self.history_heads = extend(self.history_heads, 0)
+        self.history_counts = extend(self.history_counts, 0)
+        
+        # Free list is a stack; lowest slots are handed out first
+        self._free_slots.extend(range(new_capacity - 1, self.capacity - 1, -1))
+        self.capacity = new_capacity
+    
+    def __len__(self) -> int:
+        return self.capacity - len(self._free_slots)
+    
+    def active_slots(self) -> np.ndarray:
+        """Get the slot indices of all live tracks"""
+        return np.flatnonzero(self.active)
+    
+    def allocate(
+        self, 
+        person_id: int, 
+        floor_position: Optional[FloorPosition], 
+        frame_number: int,
+        keypoints: Optional[np.ndarray] = None,
+        timestamp: float = 0.0
+    ) -> int:
+        """Store a new track in a free slot and return the slot index"""
+        if not self._free_slots:
+            self._grow(self.capacity * 2)
+        slot = self._free_slots.pop()
+        
+        self.person_ids[slot] = person_id
+        self.positions[slot] = (
+            (floor_position.floor_x, floor_position.floor_y) if floor_position else np.nan
+        )
+        self.frames_since_detection[slot] = 0
+        self.total_detections[slot] = 1
+        self.first_seen_frames[slot] = frame_number
+        self.last_seen_frames[slot] = frame_number
+        self.active[slot] = True
+        
+        self.history_heads[slot] = 0
+        self.history_counts[slot] = 0
+        self._append_history(
+            np.array([slot]),
+            np.zeros((1, len(COCO_KEYPOINT_NAMES), 3), dtype=np.float32) if keypoints is None else keypoints[np.newaxis],
+            self.positions[slot][np.newaxis],
+            timestamp
+        )
+        return slot
+    
+    def record_detections(
+        self, 
+        slots: np.ndarray, 
+        positions: np.ndarray, 
+        frame_number: int,
+        keypoints: Optional[np.ndarray] = None,
+        timestamp: float = 0.0
+    ) -> None:
+        """Update the given tracks with this frame's floor positions (N, 2) and keypoints (N, 17, 3)"""
+        self.positions[slots] = positions
+        self.frames_since_detection[slots] = 0
+        self.total_detections[slots] += 1
+        self.last_seen_frames[slots] = frame_number
+        
+        if keypoints is None:
+            keypoints = np.zeros((len(slots), len(COCO_KEYPOINT_NAMES), 3), dtype=np.float32)
+        self._append_history(slots, keypoints, positions, timestamp)
+    
+    def _append_history(
+        self, 
+        slots: np.ndarray, 
+        keypoints: np.ndarray, 
+        positions: np.ndarray, 
+        timestamp: float
+    ) -> None:
+        """Write one detection per slot into the ring buffers"""
+        heads = self.history_heads[slots]
+        self.keypoint_history[slots, heads] = keypoints
+        self.floor_history[slots, heads] = positions
+        self.time_history[slots, heads] = timestamp
+        self.history_heads[slots] = (heads + 1) % self.history_length
+        self.history_counts[slots] = np.minimum(self.history_counts[slots] + 1, self.history_length)
+    
+    def history_positions(self, slots: np.ndarray, lags: np.ndarray) -> np.ndarray:
+        """Ring buffer positions `lags` detections before the latest one, per slot"""
+        return (self.history_heads[slots] - 1 - lags) % self.history_length
+    
+    def release(self, slots: np.ndarray) -> None:
+        """Free the given slots for reuse"""
+        self.active[slots] = False
+        self.person_ids[slots] = -1
+        self.positions[slots] = np.nan
+        self._free_slots.extend(int(slot) for slot in slots)
+
+
+class PersonTracker:
+    """
+    Manages stable person IDs across frames using floor position tracking.
+    
+    This class maintains a registry of people and matches new detections to
+    existing tracked people based on floor position proximity, ensuring
+    stable IDs for tracking applications.
+    """
+    
+    def __init__(
+        self,
+        max_distance_threshold: float = 2.0,  # meters
+        max_frames_missing: int = 30,  # frames before considering person "lost"
+        min_detections_for_stability: int = 3,  # minimum detections before ID is considered stable
+        reidentifier: Optional[AppearanceReidentifier] = None,
+        initial_track_capacity: int = 64,
+        history_length: int = 16,
+        smoother: Optional[TrackSmoother] = None
+    ):
+        """
+        Initialize person tracker with configurable parameters.
+        
+        Args:
+            max_distance_threshold: Maximum distance (meters) to consider a match
+            max_frames_missing: Frames without detection before removing a person
+            min_detections_for_stability: Minimum detections for a stable track
+            reidentifier: Optional appearance re-identification for ambiguous
+                matches and recovering lost tracks
+            initial_track_capacity: Track slots to preallocate in the track store
+            history_length: Past detections kept per track for kinematics
+            smoother: Optional filters whose per-track state follows the track slots
+        """
+        self.max_distance_threshold = max_distance_threshold
+        self.max_frames_missing = max_frames_missing
+        self.min_detections_for_stability = min_detections_for_stability
+        self.reidentifier = reidentifier
+        self.smoother = smoother
+        
+        self.tracks = TrackStore(initial_track_capacity, history_length)
+        self.slot_by_person_id: dict[int, int] = {}
+        self.next_person_id = 0
+        self.current_frame = 0
+    
+    def update_frame(
+        self, 
+        detected_people: List[PersonDetection], 
+        frame_number: int,
+        frame: Optional[np.ndarray] = None,
+        timestamp: Optional[float] = None
+    ) -> Tuple[List[PersonDetection], List[int]]:
+        """
+        Update tracking for a new frame and return people with stable IDs.
+        
+        Args:
+            detected_people: List of detections from current frame
+            frame_number: Current frame number
+            frame: Camera frame the detections came from (used for re-identification)
+            timestamp: Time of the frame in seconds (defaults to now, monotonic clock)
+            
+        Returns:
+            Tuple of:
+            - List of PersonDetection objects with stable person_ids
+            - List of person IDs that left the frame
+        """
+        self.current_frame = frame_number
+        if timestamp is None:
+            timestamp = time.monotonic()
+        if self.reidentifier:
+            self.reidentifier.begin_frame(frame)
+        
+        # Extract detections with floor positions for tracking
+        detections_with_positions = [
+            (i, person) for i, person in enumerate(detected_people)
+            if person.floor_position is not None
+        ]
+        
+        # Match detections to existing tracked people
+        matched_pairs, unmatched_detections, unmatched_slots = self._match_detections_to_tracks(
+            detections_with_positions
+        )
         
         # Update existing tracks with matches
         updated_people = list(detected_people)  # Start with original detections
         
-        for detection_idx, track_id in matched_pairs:
-            original_person = detected_people[detection_idx]
-            tracked_person = self.tracked_people[track_id]
-            
-            # Update tracking state
-            tracked_person.update_detection(original_person.floor_position, frame_number)
+        if matched_pairs:
+            matched_slots = np.array([slot for _, slot in matched_pairs], dtype=np.intp)
+            matched_positions = np.array([
+                (detected_people[detection_idx].floor_position.floor_x,
+                 detected_people[detection_idx].floor_position.floor_y)
+                for detection_idx, _ in matched_pairs
+            ], dtype=np.float32)
+            matched_keypoints = np.stack([
+                self._keypoint_array_or_zeros(detected_people[detection_idx])
+                for detection_idx, _ in matched_pairs
+            ])
+            self.tracks.record_detections(
+                matched_slots, matched_positions, frame_number, matched_keypoints, timestamp
+            )
+        
+        for detection_idx, slot in matched_pairs:
+            track_id = int(self.tracks.person_ids[slot])
+            if self.reidentifier:
+                self.reidentifier.update_track(
+                    track_id, self.reidentifier.computed_embedding(detection_idx)
+                )
             
             # Create new PersonDetection with stable ID
             updated_person = self._create_person_with_stable_id(
-                original_person, track_id
+                detected_people[detection_idx], track_id
             )
             updated_people[detection_idx] = updated_person
         
         # Create new tracks for unmatched detections
         for detection_idx in unmatched_detections:
             original_person = detected_people[detection_idx]
-            new_track_id = self._create_new_track(original_person, frame_number)
+            new_track_id = self._create_new_track(
+                original_person, frame_number, detection_idx, timestamp
+            )
             
             # Create PersonDetection with new stable ID
             updated_person = self._create_person_with_stable_id(
@@ -659,8 +1974,7 @@ class PersonTracker:
             updated_people[detection_idx] = updated_person
         
         # Update unmatched tracked people (increment missed frames)
-        for track_id in unmatched_tracked:
-            self.tracked_people[track_id].increment_missed_frames()
+        self.tracks.frames_since_detection[unmatched_slots] += 1
         
         # Remove lost tracks and get their IDs
         removed_person_ids = self._remove_lost_tracks()
@@ -670,98 +1984,121 @@ class PersonTracker:
     def _match_detections_to_tracks(
         self, 
         detections_with_positions: List[Tuple[int, PersonDetection]]
-    ) -> Tuple[List[Tuple[int, int]], List[int], List[int]]:
+    ) -> Tuple[List[Tuple[int, int]], List[int], np.ndarray]:
         """
         Match current detections to existing tracks using floor position distance.
         
         Returns:
-            - matched_pairs: List of (detection_index, track_id) pairs
+            - matched_pairs: List of (detection_index, track_slot) pairs
             - unmatched_detections: List of detection indices without matches
-            - unmatched_tracked: List of track IDs without matches
+            - unmatched_slots: Array of track slots without matches
         """
-        if not self.tracked_people or not detections_with_positions:
+        active_slots = self.tracks.active_slots()
+        if len(active_slots) == 0 or not detections_with_positions:
             unmatched_detections = [idx for idx, _ in detections_with_positions]
-            unmatched_tracked = list(self.tracked_people.keys())
-            return [], unmatched_detections, unmatched_tracked
-        
-        # Calculate distance matrix between detections and tracks
-        distance_matrix = []
-        track_ids = list(self.tracked_people.keys())
-        
-        for detection_idx, person in detections_with_positions:
-            detection_distances = []
-            for track_id in track_ids:
-                tracked_person = self.tracked_people[track_id]
-                if (tracked_person.last_floor_position and person.floor_position):
-                    distance = self._calculate_floor_distance(
-                        person.floor_position, tracked_person.last_floor_position
-                    )
-                    detection_distances.append(distance)
-                else:
-                    detection_distances.append(float('inf'))
-            distance_matrix.append(detection_distances)
-        
-        # Simple greedy matching (could be improved with Hungarian algorithm)
+            return [], unmatched_detections, active_slots
+        
+        # Distance matrix between detections (rows) and tracks (columns)
+        detection_positions = np.array([
+            (person.floor_position.floor_x, person.floor_position.floor_y)
+            for _, person in detections_with_positions
+        ], dtype=np.float32)
+        offsets = detection_positions[:, np.newaxis, :] - self.tracks.positions[active_slots][np.newaxis, :, :]
+        distance_matrix = np.hypot(offsets[..., 0], offsets[..., 1])
+        
+        # Matching cost: floor distance, gated by the distance threshold
+        # (tracks without a known position compare as NaN and are gated out too)
+        cost_matrix = np.where(distance_matrix <= self.max_distance_threshold, distance_matrix, np.inf)
+        
+        if self.reidentifier:
+            track_ids = self.tracks.person_ids[active_slots].tolist()
+            self._add_appearance_costs(cost_matrix, detections_with_positions, track_ids)
+        
+        # Simple greedy matching (could be improved with Hungarian algorithm):
+        # visit the gated pairs cheapest first, taking each whose detection and
+        # track are both still free
         matched_pairs = []
-        unmatched_detections = set(range(len(detections_with_positions)))
-        unmatched_tracked = set(range(len(track_ids)))
-        
-        # Find best matches iteratively
-        while unmatched_detections and unmatched_tracked:
-            best_distance = float('inf')
-            best_detection_idx = None
-            best_track_idx = None
-            
-            for det_idx in unmatched_detections:
-                for track_idx in unmatched_tracked:
-                    distance = distance_matrix[det_idx][track_idx]
-                    if distance < best_distance and distance <= self.max_distance_threshold:
-                        best_distance = distance
-                        best_detection_idx = det_idx
-                        best_track_idx = track_idx
-            
-            if best_detection_idx is not None and best_track_idx is not None:
-                # Record match using original detection index and track ID
-                original_detection_idx = detections_with_positions[best_detection_idx][0]
-                track_id = track_ids[best_track_idx]
-                matched_pairs.append((original_detection_idx, track_id))
-                
-                unmatched_detections.remove(best_detection_idx)
-                unmatched_tracked.remove(best_track_idx)
-            else:
-                break  # No more valid matches
+        matched_rows = np.zeros(len(detections_with_positions), dtype=bool)
+        matched_columns = np.zeros(len(active_slots), dtype=bool)
+        
+        candidate_rows, candidate_columns = np.nonzero(np.isfinite(cost_matrix))
+        order = np.argsort(cost_matrix[candidate_rows, candidate_columns], kind="stable")
+        
+        for row, column in zip(candidate_rows[order].tolist(), candidate_columns[order].tolist()):
+            if matched_rows[row] or matched_columns[column]:
+                continue
+            original_detection_idx = detections_with_positions[row][0]
+            matched_pairs.append((original_detection_idx, int(active_slots[column])))
+            matched_rows[row] = True
+            matched_columns[column] = True
         
-        # Convert remaining unmatched indices back to original detection indices
         unmatched_detection_indices = [
-            detections_with_positions[i][0] for i in unmatched_detections
+            detections_with_positions[row][0] for row in np.flatnonzero(~matched_rows)
         ]
-        unmatched_track_ids = [track_ids[i] for i in unmatched_tracked]
         
-        return matched_pairs, unmatched_detection_indices, unmatched_track_ids
+        return matched_pairs, unmatched_detection_indices, active_slots[~matched_columns]
+    
+    def _add_appearance_costs(
+        self,
+        cost_matrix: np.ndarray,
+        detections_with_positions: List[Tuple[int, PersonDetection]],
+        track_ids: List[int]
+    ) -> None:
+        """
+        Add appearance dissimilarity to the gated cost matrix, in place.
+        
+        A detection is ambiguous when two candidates (tracks for the detection,
+        or detections for one of its tracks) are both in range and within
+        `ambiguity_margin` of each other. Only those detections get embeddings.
+        Appearance re-ranks candidates but never extends the distance gate.
+        """
+        in_range = np.isfinite(cost_matrix)
+        margin = self.reidentifier.ambiguity_margin
+        
+        def ambiguous_along(axis: int) -> np.ndarray:
+            if cost_matrix.shape[axis] < 2:
+                return np.zeros(cost_matrix.shape[1 - axis], dtype=bool)
+            best, second = np.moveaxis(np.sort(cost_matrix, axis=axis).take([0, 1], axis=axis), axis, 0)
+            return np.isfinite(second) & (second - best < margin)
+        
+        ambiguous_detections = ambiguous_along(1)
+        ambiguous_tracks = ambiguous_along(0)
+        ambiguous_detections |= (in_range & ambiguous_tracks[np.newaxis, :]).any(axis=1)
+        
+        for row in np.flatnonzero(ambiguous_detections):
+            detection_idx, person = detections_with_positions[row]
+            embedding = self.reidentifier.embedding_for_detection(detection_idx, person)
+            cost_matrix[row] += self.reidentifier.appearance_costs(embedding, track_ids)
     
-    def _calculate_floor_distance(
+    def _create_new_track(
         self, 
-        pos1: FloorPosition, 
-        pos2: FloorPosition
-    ) -> float:
-        """Calculate Euclidean distance between two floor positions in meters"""
-        dx = pos1.floor_x - pos2.floor_x
-        dy = pos1.floor_y - pos2.floor_y
-        return math.sqrt(dx * dx + dy * dy)
-    
-    def _create_new_track(self, person: PersonDetection, frame_number: int) -> int:
-        """Create a new track for an unmatched detection"""
-        new_id = self.next_person_id
-        self.next_person_id += 1
-        
-        self.tracked_people[new_id] = TrackedPerson(
-            person_id=new_id,
-            last_floor_position=person.floor_position,
-            frames_since_detection=0,
-            total_detections=1,
-            first_seen_frame=frame_number,
-            last_seen_frame=frame_number
+        person: PersonDetection, 
+        frame_number: int, 
+        detection_idx: int,
+        timestamp: float
+    ) -> int:
+        """Create a new track for an unmatched detection, recovering a lost ID if possible"""
+        new_id = None
+        if self.reidentifier:
+            # Every new track gets an embedding once: it may be a returning
+            # person now, and it's needed later to resolve crossings
+            embedding = self.reidentifier.embedding_for_detection(detection_idx, person)
+            new_id = self.reidentifier.recover_track(embedding)
+            
+        if new_id is None:
+            new_id = self.next_person_id
+            self.next_person_id += 1
+        
+        if self.reidentifier:
+            self.reidentifier.update_track(new_id, embedding)
+        
+        slot = self.tracks.allocate(
+            new_id, person.floor_position, frame_number,
+            self._keypoint_array_or_zeros(person), timestamp
         )
+        self.slot_by_person_id[new_id] = slot
+        if self.smoother:
+            self.smoother.reset(np.array([slot]))
         
         return new_id
     
@@ -776,32 +2113,137 @@ class PersonTracker:
             keypoints=original_person.keypoints,
             skeleton_bones=original_person.skeleton_bones,
             bounding_box=original_person.bounding_box,
-            floor_position=original_person.floor_position
+            floor_position=original_person.floor_position,
+            keypoint_array=original_person.keypoint_array
+        )
+    
+    def _keypoint_array_or_zeros(self, person: PersonDetection) -> np.ndarray:
+        """Raw keypoints of a detection, or all-zero (never confident) keypoints"""
+        if person.keypoint_array is None:
+            return np.zeros((len(COCO_KEYPOINT_NAMES), 3), dtype=np.float32)
+        return person.keypoint_array
+    
+    def compute_kinematics(
+        self, 
+        keypoint_confidence_threshold: float,
+        velocity_lag: int = 3
+    ) -> Tuple[PersonKinematics, ...]:
+        """
+        Compute movement features for all tracks detected in the current frame.
+        
+        Velocity and acceleration come from finite differences of the floor
+        position history, `velocity_lag` detections apart (less for young
+        tracks). Arm and leg features come from the latest keypoints and are
+        normalized by torso length so they don't depend on distance to camera.
+        Everything is computed for all tracks at once.
+        
+        Args:
+            keypoint_confidence_threshold: Minimum confidence for keypoints used
+            velocity_lag: Detections between samples used for differencing
+            
+        Returns:
+            Tuple of PersonKinematics, one per currently detected track
+        """
+        tracks = self.tracks
+        slots = np.flatnonzero(tracks.active & (tracks.frames_since_detection == 0))
+        if len(slots) == 0:
+            return ()
+        
+        # Floor kinematics from three samples: latest, one lag back, two lags back
+        lags = np.clip((tracks.history_counts[slots] - 1) // 2, 0, velocity_lag)
+        recent_index = tracks.history_positions(slots, np.zeros_like(lags))
+        middle_index = tracks.history_positions(slots, lags)
+        oldest_index = tracks.history_positions(slots, 2 * lags)
+        
+        p0 = tracks.floor_history[slots, recent_index]
+        p1 = tracks.floor_history[slots, middle_index]
+        p2 = tracks.floor_history[slots, oldest_index]
+        t0 = tracks.time_history[slots, recent_index]
+        t1 = tracks.time_history[slots, middle_index]
+        t2 = tracks.time_history[slots, oldest_index]
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            velocity = (p0 - p1) / (t0 - t1)[:, np.newaxis]
+            previous_velocity = (p1 - p2) / (t1 - t2)[:, np.newaxis]
+            acceleration = (velocity - previous_velocity) / ((t0 - t2) / 2.0)[:, np.newaxis]
+        velocity = np.nan_to_num(velocity, nan=0.0, posinf=0.0, neginf=0.0)
+        acceleration = np.nan_to_num(acceleration, nan=0.0, posinf=0.0, neginf=0.0)
+        
+        # Pose features from the latest keypoints, in image space; unreliable
+        # keypoints become NaN and propagate into the features that use them
+        keypoints = tracks.keypoint_history[slots, recent_index].astype(np.float64)
+        reliable = keypoints[..., 2] > keypoint_confidence_threshold
+        xy = np.where(reliable[..., np.newaxis], keypoints[..., :2], np.nan)
+        
+        shoulder_center = (xy[:, KeypointIndices.LEFT_SHOULDER] + xy[:, KeypointIndices.RIGHT_SHOULDER]) / 2.0
+        hip_center = (xy[:, KeypointIndices.LEFT_HIP] + xy[:, KeypointIndices.RIGHT_HIP]) / 2.0
+        torso_length = np.linalg.norm(shoulder_center - hip_center, axis=1)
+        torso_length = np.where(torso_length >= 1.0, torso_length, np.nan)
+        
+        def limb_extension(start_idx: int, end_idx: int) -> np.ndarray:
+            return np.linalg.norm(xy[:, end_idx] - xy[:, start_idx], axis=1) / torso_length
+        
+        def arm_height(shoulder_idx: int, wrist_idx: int) -> np.ndarray:
+            # Image y grows downward, so wrist above shoulder is positive
+            return (xy[:, shoulder_idx, 1] - xy[:, wrist_idx, 1]) / torso_length
+        
+        features = np.column_stack([
+            velocity, acceleration,
+            arm_height(KeypointIndices.LEFT_SHOULDER, KeypointIndices.LEFT_WRIST),
+            arm_height(KeypointIndices.RIGHT_SHOULDER, KeypointIndices.RIGHT_WRIST),
+            limb_extension(KeypointIndices.LEFT_SHOULDER, KeypointIndices.LEFT_WRIST),
+            limb_extension(KeypointIndices.RIGHT_SHOULDER, KeypointIndices.RIGHT_WRIST),
+            limb_extension(KeypointIndices.LEFT_HIP, KeypointIndices.LEFT_ANKLE),
+            limb_extension(KeypointIndices.RIGHT_HIP, KeypointIndices.RIGHT_ANKLE),
+        ]).tolist()
+        
+        return tuple(
+            PersonKinematics(person_id, *person_features)
+            for person_id, person_features in zip(tracks.person_ids[slots].tolist(), features)
         )
     
     def _remove_lost_tracks(self) -> List[int]:
-        """Remove tracks that haven't been detected for too many frames"""
-        tracks_to_remove = [
-            track_id for track_id, tracked_person in self.tracked_people.items()
-            if tracked_person.frames_since_detection > self.max_frames_missing
-        ]
+        """
+        Remove tracks that haven't been detected for too many frames.
+        
+        Returns:
+            IDs that are gone for good: lost tracks the re-identifier can't
+            recover, and recoverable tracks it has evicted from its cache
+        """
+        lost_slots = np.flatnonzero(
+            self.tracks.active & (self.tracks.frames_since_detection > self.max_frames_missing)
+        )
         
-        for track_id in tracks_to_remove:
-            del self.tracked_people[track_id]
+        removed_ids = []
+        if len(lost_slots) > 0:
+            tracks_to_remove = self.tracks.person_ids[lost_slots].tolist()
+            self.tracks.release(lost_slots)
+            if self.smoother:
+                self.smoother.reset(lost_slots)
+            
+            for track_id in tracks_to_remove:
+                del self.slot_by_person_id[track_id]
+                # A cached track may still come back under its ID: its removal
+                # is announced when the cache evicts it, not now
+                if not (self.reidentifier and self.reidentifier.forget_track(track_id, self.current_frame)):
+                    removed_ids.append(track_id)
         
-        return tracks_to_remove
+        if self.reidentifier:
+            removed_ids.extend(self.reidentifier.expire_lost_tracks(self.current_frame))
+        return removed_ids
     
     def get_active_tracks_info(self) -> dict[int, dict]:
         """Get information about currently active tracks for debugging"""
+        tracks = self.tracks
         return {
             track_id: {
-                'frames_since_detection': tracked.frames_since_detection,
-                'total_detections': tracked.total_detections,
-                'first_seen': tracked.first_seen_frame,
-                'last_seen': tracked.last_seen_frame,
-                'stable': tracked.total_detections >= self.min_detections_for_stability
+                'frames_since_detection': int(tracks.frames_since_detection[slot]),
+                'total_detections': int(tracks.total_detections[slot]),
+                'first_seen': int(tracks.first_seen_frames[slot]),
+                'last_seen': int(tracks.last_seen_frames[slot]),
+                'stable': bool(tracks.total_detections[slot] >= self.min_detections_for_stability)
             }
-            for track_id, tracked in self.tracked_people.items()
+            for track_id, slot in self.slot_by_person_id.items()
         }
 
 
@@ -853,153 +2295,2226 @@ def determine_person_floor_position(
     return None, None
 
 
-class SkeletonTracker:
+# ================================
+# MOTION GATING
+# ================================
+
+class MotionGate:
     """
-    Main class for real-time skeleton tracking and floor position mapping.
+    Cheap scene-change test used to skip pose inference on static frames.
     
-    This class handles pose detection and coordinate transformation with
-    stable person ID tracking across frames.
+    Each frame is shrunk to a small blurred grayscale image and compared with
+    the one from the last frame that inference actually ran on. If too few
+    pixels changed, the previous detections can be reused. Comparing against
+    the last inferred frame (rather than the previous frame) means slow changes
+    still add up, and a refresh interval bounds how long detections are reused.
     """
     
     def __init__(
         self,
-        pose_model_path: str,
-        homography_file_path: str,
-        tracking_distance_threshold: float = 2.0,
-        tracking_max_frames_missing: int = 30
+        changed_fraction_threshold: float = 0.005,  # fraction of pixels that must change
+        pixel_difference_threshold: int = 15,  # gray level change that counts as changed
+        downscale_width: int = 160,
+        refresh_interval: int = 30  # frames between forced inferences
     ):
         """
-        Initialize the skeleton tracker with required models and tracking parameters.
+        Initialize the motion gate.
         
         Args:
-            pose_model_path: Path to YOLOv8 pose detection model file
-            homography_file_path: Path to pre-computed homography matrix (.npy file)
-            tracking_distance_threshold: Max distance (meters) for person matching
-            tracking_max_frames_missing: Frames before considering person lost
+            changed_fraction_threshold: Fraction of changed pixels that counts as motion
+            pixel_difference_threshold: Minimum gray level difference for a changed pixel
+            downscale_width: Width of the downscaled comparison image
+            refresh_interval: Maximum consecutive frames without inference
         """
-        self.pose_model = YOLO(pose_model_path)
+        self.changed_fraction_threshold = changed_fraction_threshold
+        self.pixel_difference_threshold = pixel_difference_threshold
+        self.downscale_width = downscale_width
+        self.refresh_interval = refresh_interval
         
-        try:
-            self.floor_homography_matrix = np.load(homography_file_path)
-        except Exception as error:
-            raise RuntimeError(
-                f"Failed to load homography matrix from '{homography_file_path}': {error}"
-            )
-        
-        self._frame_counter = 0
-        self.person_tracker = PersonTracker(
-            max_distance_threshold=tracking_distance_threshold,
-            max_frames_missing=tracking_max_frames_missing
+        self.last_motion_score = 0.0
+        self._reference: Optional[np.ndarray] = None
+        self._pending: Optional[np.ndarray] = None
+        self._frames_since_inference = 0
+    
+    def should_run_inference(self, frame: np.ndarray) -> bool:
+        """Decide whether this frame changed enough to need pose inference"""
+        frame_height, frame_width = frame.shape[:2]
+        downscale_height = max(1, round(frame_height * self.downscale_width / frame_width))
+        small_frame = cv2.resize(
+            frame, (self.downscale_width, downscale_height), interpolation=cv2.INTER_AREA
         )
-        self._last_removed_person_ids: List[int] = []
+        if small_frame.ndim == 3:
+            small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2GRAY)
+        self._pending = cv2.GaussianBlur(small_frame, (5, 5), 0)
+        
+        if (self._reference is None or 
+            self._reference.shape != self._pending.shape or
+            self._frames_since_inference >= self.refresh_interval):
+            return True
+        
+        difference = cv2.absdiff(self._pending, self._reference)
+        self.last_motion_score = np.count_nonzero(difference > self.pixel_difference_threshold) / difference.size
+        return self.last_motion_score >= self.changed_fraction_threshold
+    
+    def record_inference(self) -> None:
+        """Make the last tested frame the new reference after inference ran on it"""
+        self._reference = self._pending
+        self._frames_since_inference = 0
+    
+    def record_skip(self) -> None:
+        """Count a frame whose inference was skipped"""
+        self._frames_since_inference += 1
+
+
+# ================================
+# FLOOR REGION
+# ================================
+
+class FloorRegion:
+    """
+    The tracked floor area as a polygon in meters, and where it appears in the image.
+    
+    People standing on the floor reach up to `body_height_m` above it, so the
+    image area where they can appear is the floor polygon plus everything up to
+    a body height above it.
+    """
+    
+    def __init__(
+        self,
+        floor_polygon: np.ndarray,
+        homography_matrix: np.ndarray,
+        body_height_m: float = 2.0,
+        edge_samples: int = 8
+    ):
+        """
+        Project the floor polygon into the image.
+        
+        Args:
+            floor_polygon: (K, 2) polygon vertices in floor meters
+            homography_matrix: Pixel-to-floor homography of the camera
+            body_height_m: Tallest person to allow for above the floor
+            edge_samples: Points sampled along each polygon edge for the image area
+        """
+        self.floor_polygon = np.asarray(floor_polygon, dtype=np.float64)
+        floor_to_pixel = np.linalg.inv(homography_matrix)
+        
+        def project(floor_points: np.ndarray) -> np.ndarray:
+            homogeneous = np.hstack([floor_points, np.ones((len(floor_points), 1))]) @ floor_to_pixel.T
+            return homogeneous[:, :2] / homogeneous[:, 2:3]
+        
+        self.image_polygon = project(self.floor_polygon)
+        
+        # Sample the polygon outline and estimate the image scale at each sample
+        # from small floor steps; a standing person's height in pixels is about
+        # their height times the larger of the two scales
+        fractions = np.linspace(0.0, 1.0, edge_samples, endpoint=False)
+        next_vertices = np.roll(self.floor_polygon, -1, axis=0)
+        outline = (self.floor_polygon[:, None, :] + fractions[None, :, None] *
+                   (next_vertices - self.floor_polygon)[:, None, :]).reshape(-1, 2)
+        feet = project(outline)
+        step = 0.1
+        pixels_per_meter = np.maximum(
+            np.linalg.norm(project(outline + [step, 0.0]) - feet, axis=1),
+            np.linalg.norm(project(outline + [0.0, step]) - feet, axis=1)
+        ) / step
+        body_pixels = body_height_m * pixels_per_meter
+        heads = feet - np.stack([np.zeros_like(body_pixels), body_pixels], axis=1)
+        half_widths = np.stack([0.25 * body_pixels, np.zeros_like(body_pixels)], axis=1)
+        
+        # Where people on the floor can appear in the image
+        self.person_image_polygon = cv2.convexHull(
+            np.concatenate([feet - half_widths, feet + half_widths, heads - half_widths, heads + half_widths])
+            .astype(np.float32)
+        ).reshape(-1, 2)
+    
+    def inference_rect(self, frame_shape: Tuple[int, ...]) -> Tuple[int, int, int, int]:
+        """Bounding rectangle (x1, y1, x2, y2) of the person area, clipped to the frame"""
+        frame_height, frame_width = frame_shape[:2]
+        x1, y1 = np.floor(self.person_image_polygon.min(axis=0)).astype(int)
+        x2, y2 = np.ceil(self.person_image_polygon.max(axis=0)).astype(int)
+        return (
+            int(np.clip(x1, 0, frame_width)), int(np.clip(y1, 0, frame_height)),
+            int(np.clip(x2, 0, frame_width)), int(np.clip(y2, 0, frame_height))
+        )
+    
+    def contains(self, floor_points: np.ndarray) -> np.ndarray:
+        """Check which (N, 2) floor points lie inside the floor polygon (even-odd rule)"""
+        return points_in_polygon(floor_points, self.floor_polygon)
+    
+    def person_region_mask(self, frame_shape: Tuple[int, ...], scale: float = 1.0) -> np.ndarray:
+        """Boolean mask of the image area where people on the floor can appear"""
+        height, width = int(frame_shape[0] * scale), int(frame_shape[1] * scale)
+        mask = np.zeros((height, width), dtype=np.uint8)
+        cv2.fillPoly(mask, [np.round(self.person_image_polygon * scale).astype(np.int32)], 1)
+        return mask.astype(bool)
+
+
+def parse_floor_polygon(values: List[float]) -> np.ndarray:
+    """Turn a flat list of x y coordinates into a (K, 2) polygon, K >= 3"""
+    if len(values) < 6 or len(values) % 2:
+        raise ValueError("Floor polygon needs at least three x y pairs")
+    return np.array(values, dtype=np.float64).reshape(-1, 2)
+
+
+# ================================
+# TILED INFERENCE
+# ================================
+
+def box_iou(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """Intersection over union between (N, 4) and (M, 4) xyxy boxes, as an (N, M) matrix"""
+    top_left = np.maximum(boxes_a[:, None, :2], boxes_b[None, :, :2])
+    bottom_right = np.minimum(boxes_a[:, None, 2:], boxes_b[None, :, 2:])
+    intersection = np.prod(np.clip(bottom_right - top_left, 0, None), axis=2)
+    area_a = np.prod(boxes_a[:, 2:] - boxes_a[:, :2], axis=1)
+    area_b = np.prod(boxes_b[:, 2:] - boxes_b[:, :2], axis=1)
+    return intersection / np.maximum(area_a[:, None] + area_b[None, :] - intersection, 1e-9)
+
+
+def boxes_from_keypoints(keypoints: np.ndarray) -> np.ndarray:
+    """Tight (N, 4) xyxy boxes around (N, 17, 3) keypoints"""
+    return np.concatenate([keypoints[:, :, :2].min(axis=1), keypoints[:, :, :2].max(axis=1)], axis=1)
+
+
+# Per-keypoint OKS falloff constants from the COCO keypoint benchmark
+COCO_KEYPOINT_SIGMAS = np.array([
+    0.26, 0.25, 0.25, 0.35, 0.35, 0.79, 0.79, 0.72, 0.72,
+    0.62, 0.62, 1.07, 1.07, 0.87, 0.87, 0.89, 0.89
+]) / 10.0
+
+
+def keypoint_similarity(keypoints: np.ndarray, boxes: np.ndarray, visibility_threshold: float = 0.3) -> np.ndarray:
+    """
+    Object keypoint similarity (OKS) between all pairs of (N, 17, 3) detections.
+    
+    Only keypoints confident in both detections count; pairs without any such
+    keypoint get similarity 0.
+    """
+    areas = np.prod(boxes[:, 2:] - boxes[:, :2], axis=1)
+    pair_areas = np.maximum((areas[:, None] + areas[None, :]) / 2, 1.0)
+    
+    offsets = keypoints[:, None, :, :2] - keypoints[None, :, :, :2]
+    squared_distances = np.sum(offsets ** 2, axis=3)
+    falloff = 2 * pair_areas[:, :, None] * (2 * COCO_KEYPOINT_SIGMAS) ** 2
+    
+    visible = keypoints[:, :, 2] > visibility_threshold
+    both_visible = visible[:, None, :] & visible[None, :, :]
+    similarity_sum = np.sum(np.exp(-squared_distances / falloff) * both_visible, axis=2)
+    return similarity_sum / np.maximum(both_visible.sum(axis=2), 1)
+
+
+def keypoint_nms(
+    keypoints: np.ndarray,
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    oks_threshold: float = 0.5,
+    iou_threshold: float = 0.8
+) -> np.ndarray:
+    """
+    Greedy non-maximum suppression for pose detections.
+    
+    A detection is suppressed by a higher-scoring one if their keypoints agree
+    (OKS) or their boxes almost coincide. Comparing keypoints keeps two people
+    standing close together, whose boxes overlap a lot, apart.
+    
+    Returns:
+        Indices of the kept detections, highest score first
+    """
+    order = np.argsort(-scores, kind="stable")
+    duplicates = (keypoint_similarity(keypoints, boxes) > oks_threshold) | (box_iou(boxes, boxes) > iou_threshold)
+    
+    suppressed = np.zeros(len(scores), dtype=bool)
+    kept = []
+    for index in order:
+        if suppressed[index]:
+            continue
+        kept.append(index)
+        suppressed |= duplicates[index]
+    return np.array(kept, dtype=np.intp)
+
+
+class TiledPoseInference:
+    """
+    Runs the pose model on overlapping tiles of a large frame in one batch.
+    
+    Small, distant people keep their full resolution instead of being shrunk to
+    the inference size with the rest of the frame. Only tiles overlapping the
+    image area where people on the floor can appear are used. The whole frame
+    (or just the floor region's rectangle) is added to the batch so people
+    larger than a tile are still found.
+    Detections cut off at an inner tile edge are dropped (the overlapping
+    neighbour tile sees them whole), and duplicates across tile seams are
+    merged with keypoint-aware NMS.
+    """
+    
+    def __init__(
+        self,
+        tile_size: int = 640,
+        overlap: float = 0.25,
+        include_full_frame: bool = True,
+        floor_region: Optional[FloorRegion] = None,
+        edge_margin: int = 4
+    ):
+        """
+        Initialize tiling.
+        
+        Args:
+            tile_size: Tile width and height in pixels, also the inference size
+            overlap: Overlap between neighbouring tiles, relative to tile size
+            include_full_frame: Also run the whole frame for people larger than a tile
+            floor_region: If given, skip tiles where no one on the floor can appear
+            edge_margin: Distance (pixels) to an inner tile edge that counts as cut off
+        """
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.include_full_frame = include_full_frame
+        self.floor_region = floor_region
+        self.edge_margin = edge_margin
+        self._tiles: Optional[np.ndarray] = None
+        self._tiles_frame_shape: Optional[Tuple[int, ...]] = None
+        self.frame_time_ms = 0.0
+    
+    def _tile_starts(self, length: int) -> np.ndarray:
+        if length <= self.tile_size:
+            return np.array([0])
+        stride = self.tile_size * (1.0 - self.overlap)
+        count = int(np.ceil((length - self.tile_size) / stride)) + 1
+        return np.round(np.linspace(0, length - self.tile_size, count)).astype(int)
+    
+    def plan_tiles(self, frame_shape: Tuple[int, ...]) -> np.ndarray:
+        """Tile rectangles (T, 4) as x1, y1, x2, y2 for frames of this shape"""
+        if self._tiles is not None and self._tiles_frame_shape == frame_shape[:2]:
+            return self._tiles
+        
+        frame_height, frame_width = frame_shape[:2]
+        tiles = np.array([
+            (x, y, min(x + self.tile_size, frame_width), min(y + self.tile_size, frame_height))
+            for y in self._tile_starts(frame_height)
+            for x in self._tile_starts(frame_width)
+        ])
+        
+        if self.floor_region is not None:
+            mask_scale = 0.125  # Coarse mask is enough to decide tile coverage
+            mask = self.floor_region.person_region_mask(frame_shape, mask_scale)
+            scaled = np.round(tiles * mask_scale).astype(int)
+            tiles = tiles[[mask[y1:y2, x1:x2].any() for x1, y1, x2, y2 in scaled]]
+        
+        self._tiles = tiles
+        self._tiles_frame_shape = frame_shape[:2]
+        return tiles
+    
+    def predict(self, pose_model: YOLO, input_frame: np.ndarray, detection_confidence: float) -> RawPoseDetections:
+        """Run the pose model on all tiles (and the full frame) and merge the detections"""
+        start_time = time.perf_counter()
+        frame_height, frame_width = input_frame.shape[:2]
+        tiles = self.plan_tiles(input_frame.shape)
+        
+        crops = [input_frame[y1:y2, x1:x2] for x1, y1, x2, y2 in tiles]
+        regions = list(tiles)
+        if self.include_full_frame:
+            if self.floor_region is not None:
+                x1, y1, x2, y2 = self.floor_region.inference_rect(input_frame.shape)
+            else:
+                x1, y1, x2, y2 = 0, 0, frame_width, frame_height
+            if x2 > x1 and y2 > y1:
+                crops.append(input_frame[y1:y2, x1:x2])
+                regions.append(np.array([x1, y1, x2, y2]))
+        if not crops:
+            self.frame_time_ms = (time.perf_counter() - start_time) * 1000
+            return RawPoseDetections(
+                keypoints=np.zeros((0, len(COCO_KEYPOINT_NAMES), 3), dtype=np.float32), boxes=None, scores=None
+            )
+        
+        results = pose_model.predict(
+            source=crops, imgsz=self.tile_size, conf=detection_confidence, verbose=False
+        )
+        
+        all_keypoints, all_boxes, all_scores = [], [], []
+        for region, result in zip(regions, results):
+            if result.keypoints is None or len(result.keypoints) == 0 or result.boxes is None:
+                continue
+            x1, y1, x2, y2 = region
+            keypoints = result.keypoints.data.cpu().numpy()
+            boxes = result.boxes.xyxy.cpu().numpy()
+            
+            # Drop detections touching a tile edge that isn't a frame edge
+            margin = self.edge_margin
+            cut_off = (
+                ((boxes[:, 0] <= margin) & (x1 > 0)) |
+                ((boxes[:, 1] <= margin) & (y1 > 0)) |
+                ((boxes[:, 2] >= x2 - x1 - margin) & (x2 < frame_width)) |
+                ((boxes[:, 3] >= y2 - y1 - margin) & (y2 < frame_height))
+            )
+            keep = ~cut_off
+            keypoints = keypoints[keep]
+            keypoints[:, :, :2] += (x1, y1)
+            all_keypoints.append(keypoints)
+            all_boxes.append(boxes[keep] + (x1, y1, x1, y1))
+            all_scores.append(result.boxes.conf.cpu().numpy()[keep])
+        
+        if not all_keypoints or sum(len(scores) for scores in all_scores) == 0:
+            self.frame_time_ms = (time.perf_counter() - start_time) * 1000
+            return RawPoseDetections(
+                keypoints=np.zeros((0, len(COCO_KEYPOINT_NAMES), 3), dtype=np.float32), boxes=None, scores=None
+            )
+        
+        keypoints = np.concatenate(all_keypoints)
+        boxes = np.concatenate(all_boxes)
+        scores = np.concatenate(all_scores)
+        kept = keypoint_nms(keypoints, boxes, scores)
+        
+        self.frame_time_ms = (time.perf_counter() - start_time) * 1000
+        return RawPoseDetections(keypoints=keypoints[kept], boxes=boxes[kept], scores=scores[kept])
+
+
+# ================================
+# MODEL CASCADE
+# ================================
+
+class PoseCascade:
+    """
+    Re-runs a heavier pose model on crops of people the fast model is unsure about.
+    
+    Floor positions come from the ankles, so a person is escalated when neither
+    ankle reached the confidence threshold. All crops of a frame go to the heavy
+    model as one batch; each escalated person takes the keypoints of the heavy
+    detection overlapping them most in the crop, if any.
+    """
+    
+    def __init__(
+        self,
+        heavy_model_path: str,
+        ankle_confidence_threshold: float = 0.5,
+        crop_padding: float = 0.2,
+        crop_inference_size: int = 320,
+        min_crop_iou: float = 0.3
+    ):
+        """
+        Load the heavy model.
+        
+        Args:
+            heavy_model_path: Path to the accurate (slower) YOLOv8 pose model
+            ankle_confidence_threshold: Escalate people whose best ankle is below this
+            crop_padding: Padding added around each person box, relative to its size
+            crop_inference_size: Inference size for the crops
+            min_crop_iou: Minimum overlap between a heavy detection and the
+                original box for the heavy detection to replace it
+        """
+        self.heavy_model = YOLO(heavy_model_path)
+        self.ankle_confidence_threshold = ankle_confidence_threshold
+        self.crop_padding = crop_padding
+        self.crop_inference_size = crop_inference_size
+        self.min_crop_iou = min_crop_iou
+        
+        self.people_seen = 0
+        self.people_escalated = 0
+        self.people_improved = 0  # escalations where the heavy model found the person
+        self.frame_time_ms = 0.0
+    
+    @property
+    def escalation_fraction(self) -> float:
+        """Fraction of all people seen so far that went to the heavy model"""
+        return self.people_escalated / self.people_seen if self.people_seen else 0.0
+    
+    def refine(
+        self,
+        input_frame: np.ndarray,
+        raw_detections: RawPoseDetections,
+        detection_confidence: float
+    ) -> RawPoseDetections:
+        """
+        Replace uncertain detections with heavy-model detections on padded crops.
+        
+        Args:
+            input_frame: Frame the detections came from
+            raw_detections: Fast model output for the frame
+            detection_confidence: Minimum confidence for heavy-model detections
+            
+        Returns:
+            Detections with the escalated people's keypoints and boxes replaced
+        """
+        start_time = time.perf_counter()
+        keypoints = raw_detections.keypoints
+        self.people_seen += len(keypoints)
+        
+        best_ankle_confidence = keypoints[:, [KeypointIndices.LEFT_ANKLE, KeypointIndices.RIGHT_ANKLE], 2].max(
+            axis=1, initial=0.0
+        )
+        escalated = np.flatnonzero(best_ankle_confidence < self.ankle_confidence_threshold)
+        self.people_escalated += len(escalated)
+        if len(escalated) == 0:
+            self.frame_time_ms = (time.perf_counter() - start_time) * 1000
+            return raw_detections
+        
+        boxes = raw_detections.boxes if raw_detections.boxes is not None else boxes_from_keypoints(keypoints)
+        frame_height, frame_width = input_frame.shape[:2]
+        
+        # Padded crop regions, extended downwards by more than the padding
+        # because cut-off feet are the usual reason for missing ankles
+        person_boxes = boxes[escalated]
+        sizes = person_boxes[:, 2:] - person_boxes[:, :2]
+        padding = sizes * self.crop_padding
+        crop_regions = np.concatenate([
+            person_boxes[:, :2] - padding,
+            person_boxes[:, 2:] + padding * np.array([1.0, 2.0])
+        ], axis=1)
+        crop_regions = np.clip(crop_regions, 0, [frame_width, frame_height, frame_width, frame_height]).astype(int)
+        crops = [input_frame[y1:y2, x1:x2] for x1, y1, x2, y2 in crop_regions]
+        
+        heavy_results = self.heavy_model.predict(
+            source=crops, imgsz=self.crop_inference_size, conf=detection_confidence, verbose=False
+        )
+        
+        refined_keypoints = keypoints.copy()
+        refined_boxes = boxes.copy()
+        for person_index, crop_region, result in zip(escalated, crop_regions, heavy_results):
+            if result.keypoints is None or len(result.keypoints) == 0 or result.boxes is None:
+                continue
+            offset = crop_region[:2].astype(np.float32)
+            heavy_boxes = result.boxes.xyxy.cpu().numpy() + np.tile(offset, 2)
+            overlaps = box_iou(boxes[person_index][np.newaxis], heavy_boxes)[0]
+            best = int(np.argmax(overlaps))
+            if overlaps[best] < self.min_crop_iou:
+                continue
+            
+            heavy_keypoints = result.keypoints.data[best].cpu().numpy()
+            heavy_keypoints[:, :2] += offset
+            refined_keypoints[person_index] = heavy_keypoints
+            refined_boxes[person_index] = heavy_boxes[best]
+            self.people_improved += 1
+        
+        self.frame_time_ms = (time.perf_counter() - start_time) * 1000
+        return RawPoseDetections(
+            keypoints=refined_keypoints, boxes=refined_boxes, scores=raw_detections.scores
+        )
+
+
+# ================================
+# LEAN INFERENCE
+# ================================
+
+class LeanPoseInference:
+    """
+    Runs the pose network directly instead of through the ultralytics predictor.
+    
+    `YOLO.predict` handles every call generically: it inspects the source,
+    merges arguments, letterboxes into a fresh array, and builds Results
+    objects that we immediately convert back to NumPy. This class reproduces
+    the same steps for a single BGR frame. It letterboxes into a preallocated
+    input tensor (padding only to the next stride multiple, like predict),
+    runs the fused network under torch.inference_mode, applies torchvision
+    NMS, and maps boxes and keypoints back to frame pixels. The network's pose
+    head already decodes keypoints, so no per-detection work is left.
+    """
+    
+    def __init__(
+        self,
+        pose_model: YOLO,
+        iou_threshold: float = 0.7,
+        max_detections: int = 300,
+        max_nms_candidates: int = 30000
+    ):
+        """
+        Prepare the network of a loaded pose model for direct inference.
+        
+        Args:
+            pose_model: Loaded ultralytics pose model
+            iou_threshold: NMS IoU threshold (predict's default)
+            max_detections: Most detections kept after NMS
+            max_nms_candidates: Most boxes passed into NMS, highest scores first
+        """
+        self.iou_threshold = iou_threshold
+        self.max_detections = max_detections
+        self.max_nms_candidates = max_nms_candidates
+        
+        device = torch.device("cuda:0" if torch.cuda.is_available() else "cpu")
+        # oneDNN convolutions on x86 CPUs are faster in channels-last layout
+        # (recent ultralytics versions switch to it as well)
+        channels_last = (
+            device.type == "cpu" and platform.machine() in ("AMD64", "x86_64") and
+            torch.backends.mkldnn.is_available() and torch.backends.mkldnn.enabled
+        )
+        self.memory_format = torch.channels_last if channels_last else torch.contiguous_format
+        self.network = pose_model.model.fuse(verbose=False).to(device, memory_format=self.memory_format).eval()
+        self.device = device
+        self.stride = int(self.network.stride.max())
+        self.keypoint_shape = tuple(self.network.kpt_shape)
+        
+        # Letterbox geometry and buffers, rebuilt when the frame shape or size changes
+        self._geometry_key: Optional[Tuple[Tuple[int, ...], int]] = None
+        self._resized_frame: Optional[np.ndarray] = None
+        self._input: Optional[torch.Tensor] = None
+        self._input_view: Optional[torch.Tensor] = None
+        self._scale = (1.0, 1.0)
+        self._offset = (0, 0)
+    
+    def _prepare_input(self, frame_shape: Tuple[int, ...], inference_size: int) -> None:
+        """Compute the letterbox for a frame shape and allocate the input tensor"""
+        frame_height, frame_width = frame_shape[:2]
+        size = math.ceil(inference_size / self.stride) * self.stride
+        ratio = min(size / frame_height, size / frame_width)
+        resized_width, resized_height = round(frame_width * ratio), round(frame_height * ratio)
+        pad_width = (size - resized_width) % self.stride
+        pad_height = (size - resized_height) % self.stride
+        left, top = round(pad_width / 2 - 0.1), round(pad_height / 2 - 0.1)
+        
+        self._resized_frame = np.empty((resized_height, resized_width, 3), dtype=np.uint8)
+        # Padding is grey 114, normalized the same way as the image
+        self._input = torch.full(
+            (1, 3, resized_height + pad_height, resized_width + pad_width), 114.0, device=self.device
+        ).div_(255).contiguous(memory_format=self.memory_format)
+        self._input_view = self._input[0, :, top:top + resized_height, left:left + resized_width]
+        self._scale = (resized_width / frame_width, resized_height / frame_height)
+        self._offset = (left, top)
+        self._geometry_key = (frame_shape, inference_size)
+    
+    def predict(
+        self,
+        input_frame: np.ndarray,
+        detection_confidence: float,
+        inference_size: int
+    ) -> RawPoseDetections:
+        """
+        Detect poses in a BGR frame.
+        
+        Args:
+            input_frame: Frame to run the model on
+            detection_confidence: Minimum detection confidence
+            inference_size: Longest side of the model input
+            
+        Returns:
+            RawPoseDetections in frame pixel coordinates, highest scores first
+        """
+        if self._geometry_key != (input_frame.shape, inference_size):
+            self._prepare_input(input_frame.shape, inference_size)
+        
+        if self._resized_frame.shape[:2] == input_frame.shape[:2]:
+            np.copyto(self._resized_frame, input_frame)
+        else:
+            cv2.resize(input_frame, self._resized_frame.shape[1::-1], dst=self._resized_frame,
+                       interpolation=cv2.INTER_LINEAR)
+        
+        with torch.inference_mode():
+            # HWC BGR uint8 -> CHW RGB float in [0, 1], written into the padded input
+            frame_tensor = torch.from_numpy(self._resized_frame).to(self.device, non_blocking=True)
+            self._input_view.copy_(frame_tensor.permute(2, 0, 1).flip(0)).div_(255)
+            
+            # (4 box + classes + keypoints, anchors) -> (anchors, ...)
+            prediction = self.network(self._input)[0][0].transpose(0, 1)
+            keypoint_values = self.keypoint_shape[0] * self.keypoint_shape[1]
+            class_count = prediction.shape[1] - 4 - keypoint_values
+            class_scores = prediction[:, 4:4 + class_count]
+            scores, classes = class_scores.max(1)
+            candidates = scores > detection_confidence
+            prediction, scores, classes = prediction[candidates], scores[candidates], classes[candidates]
+            if len(scores) > self.max_nms_candidates:
+                top = scores.argsort(descending=True)[:self.max_nms_candidates]
+                prediction, scores, classes = prediction[top], scores[top], classes[top]
+            
+            center_x, center_y, width, height = prediction[:, :4].unbind(1)
+            boxes = torch.stack([center_x - width / 2, center_y - height / 2,
+                                 center_x + width / 2, center_y + height / 2], dim=1)
+            kept = torchvision.ops.batched_nms(boxes, scores, classes, self.iou_threshold)[:self.max_detections]
+            
+            boxes = boxes[kept].cpu().numpy()
+            scores = scores[kept].cpu().numpy()
+            keypoints = prediction[kept, 4 + class_count:].reshape(-1, *self.keypoint_shape).cpu().numpy()
+        
+        # Undo the letterbox and clip to the frame like ultralytics' scale_boxes/scale_coords
+        frame_height, frame_width = input_frame.shape[:2]
+        scale_x, scale_y = self._scale
+        offset_x, offset_y = self._offset
+        boxes = (boxes - (offset_x, offset_y, offset_x, offset_y)) / (scale_x, scale_y, scale_x, scale_y)
+        boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, frame_width)
+        boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, frame_height)
+        keypoints[:, :, 0] = ((keypoints[:, :, 0] - offset_x) / scale_x).clip(0, frame_width)
+        keypoints[:, :, 1] = ((keypoints[:, :, 1] - offset_y) / scale_y).clip(0, frame_height)
+        return RawPoseDetections(
+            keypoints=keypoints.astype(np.float32),
+            boxes=boxes.astype(np.float32),
+            scores=scores.astype(np.float32)
+        )
+
+
+# ================================
+# ON-DEMAND PROFILING
+# ================================
+
+class FrameProfiler:
+    """
+    Profiles the next N frames when requested, e.g. from a signal handler.
+    
+    Nothing runs until a request arrives; until then each frame only checks a
+    flag. While active, a sampling thread records the Python stacks of all
+    threads, and the torch profiler records operator-level timings (pose model
+    calls are labelled "pose_model.predict"). When the frames are done, both
+    profilers are stopped and the results are formatted and written on a
+    background thread, so the frame loop doesn't stall, to files named after
+    the profiled frame range:
+    
+        <prefix>.folded   sampled stacks, one "frame;frame;... count" line each
+                          (input format of flamegraph.pl and speedscope)
+        <prefix>.txt      top functions by samples and torch operator summary
+        <prefix>.trace.json  torch profiler trace (chrome://tracing, Perfetto)
+    """
+    
+    def __init__(
+        self,
+        output_directory: str,
+        default_frame_count: int = 100,
+        sample_interval_seconds: float = 0.005
+    ):
+        """
+        Initialize an idle profiler.
+        
+        Args:
+            output_directory: Directory the profile files are written to
+            default_frame_count: Frames profiled per request without a count
+            sample_interval_seconds: Time between Python stack samples
+        """
+        self.output_directory = output_directory
+        self.default_frame_count = default_frame_count
+        self.sample_interval_seconds = sample_interval_seconds
+        
+        self._requested_frame_count: Optional[int] = None
+        self.active = False
+        self._frames_remaining = 0
+        self._first_frame: Optional[int] = None
+        self._last_frame: Optional[int] = None
+        self._stack_counts: dict[str, int] = defaultdict(int)
+        self._sampler_stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._torch_profiler = None
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="profile-writer")
+    
+    def request(self, frame_count: Optional[int] = None) -> None:
+        """Ask for the next frames to be profiled (safe to call from signal handlers)"""
+        self._requested_frame_count = frame_count or self.default_frame_count
+    
+    def begin_frame(self) -> None:
+        """Start profiling before the next frame if requested"""
+        if self._requested_frame_count is None or self.active:
+            return
+        self._frames_remaining = self._requested_frame_count
+        self._requested_frame_count = None
+        self._first_frame = None
+        self._stack_counts = defaultdict(int)
+        self.active = True
+        
+        import torch.profiler
+        activities = [torch.profiler.ProfilerActivity.CPU]
+        if torch.cuda.is_available():
+            activities.append(torch.profiler.ProfilerActivity.CUDA)
+        self._torch_profiler = torch.profiler.profile(activities=activities)
+        self._torch_profiler.start()
+        
+        self._sampler_stop.clear()
+        self._sampler = threading.Thread(target=self._sample_stacks, name="stack-sampler", daemon=True)
+        self._sampler.start()
+        print(f"Profiling the next {self._frames_remaining} frames...")
+    
+    def end_frame(self, frame_number: int) -> None:
+        """Count a finished frame; write the profile after the last one"""
+        if not self.active:
+            return
+        if self._first_frame is None:
+            self._first_frame = frame_number
+        self._last_frame = frame_number
+        self._frames_remaining -= 1
+        if self._frames_remaining <= 0:
+            self._finish()
+    
+    def model_region(self):
+        """Context manager labelling pose model calls in the torch profile"""
+        if not self.active:
+            return contextlib.nullcontext()
+        import torch.profiler
+        return torch.profiler.record_function("pose_model.predict")
+    
+    def _sample_stacks(self) -> None:
+        """Record the stack of every other thread at a fixed interval, rooted at the thread name"""
+        sampler_thread_id = threading.get_ident()
+        while not self._sampler_stop.wait(self.sample_interval_seconds):
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == sampler_thread_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(f"[{thread_names.get(thread_id, thread_id)}]")
+                self._stack_counts[";".join(reversed(stack))] += 1
+    
+    def close(self) -> None:
+        """Wait for profiles still being written"""
+        self._writer.shutdown(wait=True)
+    
+    def _finish(self) -> None:
+        """Stop both profilers and hand the results to the writer thread"""
+        self._sampler_stop.set()
+        self._sampler.join()
+        self._torch_profiler.stop()
+        self.active = False
+        
+        # The next request starts with fresh stack counts and a new torch profiler
+        self._writer.submit(
+            self._write_profile, self._stack_counts, self._torch_profiler,
+            self._first_frame, self._last_frame
+        )
+        self._torch_profiler = None
+    
+    def _write_profile(
+        self,
+        stack_counts: dict[str, int],
+        torch_profiler,
+        first_frame: int,
+        last_frame: int
+    ) -> None:
+        """Write the result files of one profile (runs on the writer thread)"""
+        os.makedirs(self.output_directory, exist_ok=True)
+        prefix = os.path.join(
+            self.output_directory,
+            f"profile_frames_{first_frame}-{last_frame}_{time.strftime('%Y%m%d-%H%M%S')}"
+        )
+        
+        with open(f"{prefix}.folded", "w") as folded_file:
+            for stack, count in sorted(stack_counts.items(), key=lambda item: -item[1]):
+                folded_file.write(f"{stack} {count}\n")
+        
+        # Per thread: self samples (innermost function) and total samples (anywhere on the stack)
+        thread_samples: dict[str, int] = defaultdict(int)
+        self_samples: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        total_samples: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for stack, count in stack_counts.items():
+            thread_name, *functions = stack.split(";")
+            thread_samples[thread_name] += count
+            if functions:
+                self_samples[thread_name][functions[-1]] += count
+            for function in set(functions):
+                total_samples[thread_name][function] += count
+        
+        with open(f"{prefix}.txt", "w") as summary_file:
+            summary_file.write(f"Frames {first_frame}-{last_frame}, stack sampled "
+                               f"every {self.sample_interval_seconds * 1000:g}ms\n\n")
+            for thread_name, sample_count in sorted(thread_samples.items(), key=lambda item: -item[1]):
+                summary_file.write(f"{thread_name} ({sample_count} samples)\n")
+                for title, counts in (("Self", self_samples[thread_name]), ("Total", total_samples[thread_name])):
+                    summary_file.write(f"  {title}:\n")
+                    for function, count in sorted(counts.items(), key=lambda item: -item[1])[:15]:
+                        summary_file.write(f"    {count / sample_count:6.1%}  {function}\n")
+                summary_file.write("\n")
+            summary_file.write("Torch operators:\n")
+            # Torch parses its recorded events lazily, on this first query
+            summary_file.write(torch_profiler.key_averages().table(sort_by="self_cpu_time_total", row_limit=30))
+        
+        torch_profiler.export_chrome_trace(f"{prefix}.trace.json")
+        print(f"Profile of frames {first_frame}-{last_frame} written to {prefix}.*")
+
+
+class OSCControlServer:
+    """
+    Receives OSC control messages for a running tracker on a background thread.
+    
+    Supported messages:
+        /tracker/profile [frame_count]   profile the next frames (FrameProfiler)
+    
+    Control messages come from the network, so malformed ones are reported
+    and ignored instead of raising on the server thread.
+    """
+    
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        frame_profiler: Optional[FrameProfiler] = None,
+        max_profile_frames: int = 1000
+    ):
+        self.frame_profiler = frame_profiler
+        self.max_profile_frames = max_profile_frames
+        dispatcher = Dispatcher()
+        if frame_profiler:
+            dispatcher.map("/tracker/profile", self._handle_profile)
+        self._server = ThreadingOSCUDPServer((host, port), dispatcher)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="osc-control", daemon=True)
+    
+    def _handle_profile(self, address: str, *args: Any) -> None:
+        """Request profiling of [frame_count] frames, clamped to 1..max_profile_frames"""
+        if not args:
+            self.frame_profiler.request()
+            return
+        frame_count = args[0]
+        if (isinstance(frame_count, bool) or not isinstance(frame_count, (int, float)) or
+                not math.isfinite(frame_count)):
+            print(f"Ignoring {address} with invalid frame count {frame_count!r}")
+            return
+        self.frame_profiler.request(min(max(int(frame_count), 1), self.max_profile_frames))
+    
+    def start(self) -> None:
+        self._thread.start()
+    
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+# ================================
+# SKELETON TRACKING
+# ================================
+
+class SkeletonTracker:
+    """
+    Main class for real-time skeleton tracking and floor position mapping.
+    
+    This class handles pose detection and coordinate transformation with
+    stable person ID tracking across frames.
+    """
+    
+    def __init__(
+        self,
+        pose_model_path: Optional[str],
+        homography_file_path: str,
+        tracking_distance_threshold: float = 2.0,
+        tracking_max_frames_missing: int = 30,
+        reidentifier: Optional[AppearanceReidentifier] = None,
+        compute_kinematics: bool = False,
+        motion_gate: Optional[MotionGate] = None,
+        smoother: Optional[TrackSmoother] = None,
+        cascade: Optional[PoseCascade] = None,
+        tiler: Optional[TiledPoseInference] = None,
+        floor_region: Optional[FloorRegion] = None,
+        frame_profiler: Optional[FrameProfiler] = None,
+        lean_inference: bool = False,
+        frame_valid: Optional[Callable[[], bool]] = None
+    ):
+        """
+        Initialize the skeleton tracker with required models and tracking parameters.
+        
+        Args:
+            pose_model_path: Path to YOLOv8 pose detection model file, or None to
+                only feed detections to analyze_detections (e.g. synthetic ones)
+            homography_file_path: Path to pre-computed homography matrix (.npy file)
+            tracking_distance_threshold: Max distance (meters) for person matching
+            tracking_max_frames_missing: Frames before considering person lost
+            reidentifier: Optional appearance re-identification for the tracker
+            compute_kinematics: Whether to include per-person movement features
+            motion_gate: Optional gate that skips inference on unchanged frames
+            smoother: Optional One-Euro smoothing of output keypoints and positions
+            cascade: Optional heavy model for people the pose model is unsure about
+            tiler: Optional tiled inference for high-resolution frames
+            floor_region: Optional tracked floor area; inference is cropped to it
+                and people standing outside it are dropped before tracking
+            frame_profiler: Optional on-demand profiler; labels pose model calls
+            lean_inference: Run the pose network directly instead of through
+                YOLO.predict (tiled inference and the cascade still use predict)
+            frame_valid: Optional check that the frame being analyzed is still
+                intact (FrameBusReader.frame_still_valid for zero-copy frames)
+        """
+        self.pose_model = YOLO(pose_model_path) if pose_model_path else None
+        self.lean_inference = (
+            LeanPoseInference(self.pose_model) if lean_inference and self.pose_model else None
+        )
+        
+        try:
+            self.floor_homography_matrix = np.load(homography_file_path)
+        except Exception as error:
+            raise RuntimeError(
+                f"Failed to load homography matrix from '{homography_file_path}': {error}"
+            )
+        
+        self._frame_counter = 0
+        self.person_tracker = PersonTracker(
+            max_distance_threshold=tracking_distance_threshold,
+            max_frames_missing=tracking_max_frames_missing,
+            reidentifier=reidentifier,
+            smoother=smoother
+        )
+        self.compute_kinematics = compute_kinematics
+        self.motion_gate = motion_gate
+        self.cascade = cascade
+        self.tiler = tiler
+        self.floor_region = floor_region
+        self.frame_profiler = frame_profiler
+        self.frame_valid = frame_valid
+        self.people_outside_floor = 0
+        self.torn_frames = 0
+        self._last_raw_detections: Optional[RawPoseDetections] = None
+        self._last_removed_person_ids: List[int] = []
 
     def get_last_removed_person_ids(self) -> List[int]:
         """Get person IDs that were removed in the last frame analysis"""
         return self._last_removed_person_ids
 
-    def analyze_frame(
+    def analyze_frame(
+        self, 
+        input_frame: np.ndarray, 
+        detection_confidence: float,
+        keypoint_confidence: float,
+        inference_size: int,
+        capture_timestamp: Optional[float] = None
+    ) -> Optional[FrameAnalysis]:
+        """
+        Analyze a single frame and return detection results.
+        
+        Args:
+            input_frame: Original camera/video frame
+            detection_confidence: Minimum confidence for person detection
+            keypoint_confidence: Minimum confidence for individual keypoints
+            inference_size: Size for model inference
+            capture_timestamp: time.time() when the frame was captured, defaults to now
+            
+        Returns:
+            FrameAnalysis object with all detection results, or None if
+            frame_valid reported the frame overwritten while it was read
+        """
+        start_time = time.time()
+        stage_times_ms = {}
+        
+        # Skip inference and reuse the last detections if the scene is unchanged
+        inference_skipped = False
+        if self.motion_gate:
+            gate_start_time = time.perf_counter()
+            run_inference = (self.motion_gate.should_run_inference(input_frame) or
+                             self._last_raw_detections is None)
+            stage_times_ms["motion_gate"] = (time.perf_counter() - gate_start_time) * 1000
+            inference_skipped = not run_inference
+        
+        if inference_skipped:
+            raw_detections = self._last_raw_detections
+        else:
+            model_start_time = time.perf_counter()
+            raw_detections = self._run_pose_model(
+                input_frame, detection_confidence, inference_size
+            )
+            if self.cascade:
+                stage_times_ms["pose_model"] = (time.perf_counter() - model_start_time) * 1000
+                raw_detections = self.cascade.refine(input_frame, raw_detections, detection_confidence)
+                stage_times_ms["cascade"] = self.cascade.frame_time_ms
+        
+        # A frame overwritten while the gate or the model read it is a mix of
+        # two images: drop it before any tracking or gate state learns from it.
+        # Overwrites are permanent, so a frame still valid now was intact so far
+        if self.frame_valid and not self.frame_valid():
+            self.torn_frames += 1
+            return None
+        
+        if inference_skipped:
+            self.motion_gate.record_skip()
+        else:
+            self._last_raw_detections = raw_detections
+            if self.motion_gate:
+                self.motion_gate.record_inference()
+        
+        frame_analysis = self.analyze_detections(raw_detections, keypoint_confidence, input_frame)
+        
+        processing_time = (time.time() - start_time) * 1000  # Convert to milliseconds
+        
+        return dataclasses.replace(
+            frame_analysis,
+            processing_time_ms=processing_time,
+            stage_times_ms={**stage_times_ms, **frame_analysis.stage_times_ms},
+            inference_skipped=inference_skipped,
+            capture_timestamp=start_time if capture_timestamp is None else capture_timestamp
+        )
+    
+    def _run_pose_model(
+        self,
+        input_frame: np.ndarray,
+        detection_confidence: float,
+        inference_size: int
+    ) -> RawPoseDetections:
+        """Run pose detection on a frame and return the raw arrays"""
+        if self.frame_profiler and self.frame_profiler.active:
+            with self.frame_profiler.model_region():
+                return self._predict_poses(input_frame, detection_confidence, inference_size)
+        return self._predict_poses(input_frame, detection_confidence, inference_size)
+    
+    def _predict_poses(
+        self,
+        input_frame: np.ndarray,
+        detection_confidence: float,
+        inference_size: int
+    ) -> RawPoseDetections:
+        """Run the pose model (tiled or on the floor region) and collect its output arrays"""
+        if self.tiler:
+            return self.tiler.predict(self.pose_model, input_frame, detection_confidence)
+        
+        # Only run the model on the part of the frame where people on the floor can appear
+        crop_x, crop_y = 0, 0
+        if self.floor_region:
+            crop_x, crop_y, crop_x2, crop_y2 = self.floor_region.inference_rect(input_frame.shape)
+            input_frame = input_frame[crop_y:crop_y2, crop_x:crop_x2]
+            if input_frame.size == 0:
+                return RawPoseDetections(
+                    keypoints=np.zeros((0, len(COCO_KEYPOINT_NAMES), 3), dtype=np.float32),
+                    boxes=None,
+                    scores=None
+                )
+        
+        if self.lean_inference:
+            raw_detections = self.lean_inference.predict(input_frame, detection_confidence, inference_size)
+            raw_detections.keypoints[:, :, :2] += (crop_x, crop_y)
+            return raw_detections._replace(boxes=raw_detections.boxes + (crop_x, crop_y, crop_x, crop_y))
+        
+        detection_results = self.pose_model.predict(
+            source=input_frame,
+            imgsz=inference_size,
+            conf=detection_confidence,
+            verbose=False
+        )
+        primary_result = detection_results[0]
+
+        if primary_result.keypoints is None or len(primary_result.keypoints) == 0:
+            return RawPoseDetections(
+                keypoints=np.zeros((0, len(COCO_KEYPOINT_NAMES), 3), dtype=np.float32),
+                boxes=None,
+                scores=None
+            )
+        
+        boxes = primary_result.boxes
+        keypoints = primary_result.keypoints.data.cpu().numpy()
+        keypoints[:, :, :2] += (crop_x, crop_y)
+        return RawPoseDetections(
+            keypoints=keypoints,
+            boxes=boxes.xyxy.cpu().numpy() + (crop_x, crop_y, crop_x, crop_y) if boxes is not None else None,
+            scores=boxes.conf.cpu().numpy() if boxes is not None else None
+        )
+    
+    def analyze_detections(
+        self,
+        raw_detections: RawPoseDetections,
+        keypoint_confidence: float,
+        input_frame: Optional[np.ndarray] = None,
+        frame_size: Optional[Tuple[int, int]] = None
+    ) -> FrameAnalysis:
+        """
+        Turn raw pose detections into a tracked FrameAnalysis (everything after the model).
+        
+        Args:
+            raw_detections: Keypoints and boxes in frame pixel coordinates
+            keypoint_confidence: Minimum confidence for individual keypoints
+            input_frame: Frame the detections came from, if available
+            frame_size: (width, height) of the frame when input_frame isn't given
+            
+        Returns:
+            FrameAnalysis object with all detection results
+        """
+        start_time = time.time()
+        frame_timestamp = time.monotonic()
+        self._frame_counter += 1
+
+        # Process each detected person with temporary indices first
+        detected_people = []
+        bounding_boxes = raw_detections.boxes
+        for person_index, person_keypoints in enumerate(raw_detections.keypoints):
+            # People standing outside the tracked floor area never reach the tracker
+            if self.floor_region and self._outside_floor_region(person_keypoints, keypoint_confidence):
+                self.people_outside_floor += 1
+                continue
+            
+            person_detection = self._create_person_detection(
+                person_keypoints, 
+                person_index,  # Temporary index, will be replaced by tracker
+                keypoint_confidence,
+                bounding_boxes[person_index] if bounding_boxes is not None else None
+            )
+            detected_people.append(person_detection)
+
+        # Apply person tracking to assign stable IDs
+        detected_people_with_stable_ids, removed_person_ids = self.person_tracker.update_frame(
+            detected_people, self._frame_counter, input_frame, frame_timestamp
+        )
+        
+        stage_times_ms = {}
+        if self.person_tracker.smoother:
+            smoothing_start_time = time.perf_counter()
+            detected_people_with_stable_ids = self._smooth_tracked_people(
+                detected_people_with_stable_ids, keypoint_confidence, frame_timestamp
+            )
+            stage_times_ms["smoothing"] = (time.perf_counter() - smoothing_start_time) * 1000
+        
+        # Store removed person IDs for later use
+        self._last_removed_person_ids = removed_person_ids
+        
+        kinematics = ()
+        if self.compute_kinematics:
+            kinematics = self.person_tracker.compute_kinematics(keypoint_confidence)
+
+        processing_time = (time.time() - start_time) * 1000  # Convert to milliseconds
+        
+        if self.person_tracker.reidentifier:
+            stage_times_ms["reid"] = self.person_tracker.reidentifier.frame_time_ms
+
+        return FrameAnalysis(
+            frame_number=self._frame_counter,
+            detected_people=tuple(detected_people_with_stable_ids),
+            processing_time_ms=processing_time,
+            stage_times_ms=stage_times_ms,
+            kinematics=kinematics,
+            frame_size=(input_frame.shape[1], input_frame.shape[0]) if input_frame is not None else frame_size,
+            removed_person_ids=tuple(removed_person_ids)
+        )
+    
+    def _outside_floor_region(self, person_keypoints: np.ndarray, keypoint_confidence: float) -> bool:
+        """Check if a person's floor position is known and outside the floor region"""
+        pixel_x, pixel_y = determine_person_floor_position(person_keypoints, keypoint_confidence)
+        if pixel_x is None:
+            return False
+        floor_point = transform_pixel_to_floor_coordinates(pixel_x, pixel_y, self.floor_homography_matrix)
+        return not self.floor_region.contains(np.array([floor_point]))[0]
+    
+    def _smooth_tracked_people(
+        self,
+        people: List[PersonDetection],
+        keypoint_confidence: float,
+        timestamp: float
+    ) -> List[PersonDetection]:
+        """Replace the keypoints and floor positions of tracked people with smoothed ones"""
+        tracked_indices = [
+            index for index, person in enumerate(people) if person.floor_position is not None
+        ]
+        if not tracked_indices:
+            return people
+        
+        slot_by_person_id = self.person_tracker.slot_by_person_id
+        slots = np.array([slot_by_person_id[people[index].person_id] for index in tracked_indices])
+        raw_keypoints = np.stack([people[index].keypoint_array for index in tracked_indices])
+        raw_floor_positions = np.array([
+            (people[index].floor_position.floor_x, people[index].floor_position.floor_y)
+            for index in tracked_indices
+        ])
+        smoothed_keypoints, smoothed_floor_positions = self.person_tracker.smoother.smooth(
+            slots, raw_keypoints, raw_floor_positions, timestamp
+        )
+        
+        smoothed_people = list(people)
+        for row, index in enumerate(tracked_indices):
+            person = people[index]
+            person_keypoints = smoothed_keypoints[row]
+            smoothed_people[index] = dataclasses.replace(
+                person,
+                keypoints=create_keypoints_from_detection(person_keypoints, keypoint_confidence),
+                skeleton_bones=create_skeleton_bones_from_keypoints(person_keypoints, keypoint_confidence),
+                floor_position=dataclasses.replace(
+                    person.floor_position,
+                    floor_x=float(smoothed_floor_positions[row, 0]),
+                    floor_y=float(smoothed_floor_positions[row, 1])
+                ),
+                keypoint_array=person_keypoints
+            )
+        return smoothed_people
+    
+    def _create_person_detection(
+        self,
+        person_keypoints: np.ndarray,
+        person_index: int,
+        keypoint_confidence: float,
+        bounding_box_data: Optional[np.ndarray]
+    ) -> PersonDetection:
+        """Create PersonDetection from raw detection data"""
+        # Create keypoints
+        keypoints = create_keypoints_from_detection(
+            person_keypoints, keypoint_confidence
+        )
+        
+        # Create skeleton bones
+        skeleton_bones = create_skeleton_bones_from_keypoints(
+            person_keypoints, keypoint_confidence
+        )
+        
+        # Create bounding box if available
+        bounding_box = None
+        if bounding_box_data is not None:
+            x1, y1, x2, y2 = bounding_box_data
+            bounding_box = BoundingBox(
+                x1=int(x1), y1=int(y1), x2=int(x2), y2=int(y2)
+            )
+        
+        # Create floor position
+        floor_position = create_floor_position_from_keypoints(
+            person_keypoints, person_index, keypoint_confidence, self.floor_homography_matrix
+        )
+        
+        return PersonDetection(
+            person_id=person_index,
+            keypoints=keypoints,
+            skeleton_bones=skeleton_bones,
+            bounding_box=bounding_box,
+            floor_position=floor_position,
+            keypoint_array=person_keypoints
+        )
+
+
+# ================================
+# CAMERA CAPTURE
+# ================================
+
+@dataclass(frozen=True)
+class CaptureSettings:
+    """Requested camera properties; None leaves the driver's default"""
+    width: Optional[int] = None
+    height: Optional[int] = None
+    fps: Optional[float] = None
+    use_mjpg: bool = False  # compressed frames allow higher resolution/FPS over USB
+    buffer_size: Optional[int] = None  # frames queued inside the driver
+    match_size: Optional[int] = None  # longer side when width/height aren't given; keeps the camera's aspect ratio
+
+
+def open_camera_capture(camera_index: int, settings: CaptureSettings) -> cv2.VideoCapture:
+    """
+    Open a camera and request the given capture properties.
+    
+    Drivers may silently pick different values, so check the result with
+    describe_capture().
+    
+    Args:
+        camera_index: Camera index for cv2.VideoCapture
+        settings: Requested capture properties
+        
+    Returns:
+        The opened (or failed) cv2.VideoCapture
+    """
+    video_capture = cv2.VideoCapture(camera_index)
+    if not video_capture.isOpened():
+        return video_capture
+    
+    # Many V4L2 drivers only offer high resolutions/FPS for MJPG, so the pixel
+    # format has to be set before the frame size
+    if settings.use_mjpg:
+        video_capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+    width, height = settings.width, settings.height
+    if settings.match_size is not None and width is None and height is None:
+        width, height = matching_capture_size(video_capture, settings.match_size)
+    if width is not None:
+        video_capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    if height is not None:
+        video_capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    if settings.fps is not None:
+        video_capture.set(cv2.CAP_PROP_FPS, settings.fps)
+    if settings.buffer_size is not None:
+        video_capture.set(cv2.CAP_PROP_BUFFERSIZE, settings.buffer_size)
+    
+    return video_capture
+
+
+def matching_capture_size(
+    video_capture: cv2.VideoCapture, 
+    longer_side: int
+) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Pick a capture size with the camera's default aspect ratio and the given longer side.
+    
+    Returns:
+        (width, height), or (None, None) if the camera doesn't report its size
+    """
+    default_width = video_capture.get(cv2.CAP_PROP_FRAME_WIDTH)
+    default_height = video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT)
+    if default_width <= 0 or default_height <= 0:
+        return None, None
+    
+    # Drivers generally only accept even frame sizes
+    if default_width >= default_height:
+        return longer_side, 2 * round(longer_side * default_height / default_width / 2)
+    return 2 * round(longer_side * default_width / default_height / 2), longer_side
+
+
+def describe_capture(video_capture: cv2.VideoCapture) -> str:
+    """Summarize the capture properties the driver actually granted"""
+    fourcc_code = int(video_capture.get(cv2.CAP_PROP_FOURCC))
+    fourcc = "".join(chr((fourcc_code >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00") or "unknown"
+    width = int(video_capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    fps = video_capture.get(cv2.CAP_PROP_FPS)
+    buffer_size = int(video_capture.get(cv2.CAP_PROP_BUFFERSIZE))
+    
+    buffer_text = f"{buffer_size} frame(s)" if buffer_size > 0 else "driver default"
+    return (
+        f"{width}x{height} @ {fps:.1f} FPS, format {fourcc}, "
+        f"buffer {buffer_text}, backend {video_capture.getBackendName()}"
+    )
+
+
+class LatestFrameCapture:
+    """
+    Capture wrapper whose read() skips queued frames and decodes only the newest.
+    
+    Drivers queue several frames, so a plain read() can return a frame that is
+    already several frame intervals old. grab() doesn't decode and returns
+    almost instantly while frames are queued, but has to wait once the queue is
+    empty. So we grab until a grab had to wait for the camera, then decode only
+    that last frame.
+    """
+    
+    def __init__(
+        self,
+        video_capture: cv2.VideoCapture,
+        queued_grab_seconds: float = 0.002,  # grabs faster than this came from the queue
+        max_drained_frames: int = 8
+    ):
+        """
+        Wrap a camera capture.
+        
+        Args:
+            video_capture: Opened camera capture
+            queued_grab_seconds: Grab duration below which a frame counts as queued
+            max_drained_frames: Upper bound on frames skipped per read
+        """
+        self.video_capture = video_capture
+        self.queued_grab_seconds = queued_grab_seconds
+        self.max_drained_frames = max_drained_frames
+        self.drained_frames = 0
+        self.last_capture_timestamp: Optional[float] = None
+    
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        for grab_count in range(self.max_drained_frames + 1):
+            grab_start = time.perf_counter()
+            if not self.video_capture.grab():
+                return False, None
+            if time.perf_counter() - grab_start >= self.queued_grab_seconds:
+                break  # This grab waited for a new frame, so it's the newest
+        
+        self.last_capture_timestamp = time.time()
+        self.drained_frames += grab_count
+        return self.video_capture.retrieve()
+    
+    def isOpened(self) -> bool:
+        return self.video_capture.isOpened()
+    
+    def release(self) -> None:
+        self.video_capture.release()
+    
+    def get(self, property_id: int) -> float:
+        return self.video_capture.get(property_id)
+
+
+class RealtimeVideoCapture:
+    """
+    Plays a video file like a live camera, for reproducing live timing on a dev box.
+    
+    A background thread releases the file's frames at their native frame rate,
+    whether or not anyone reads them, into a small queue like a camera
+    driver's. When the queue is full the oldest frame is dropped. read() returns
+    the oldest queued frame, waiting for the next one if the queue is empty. If
+    decoding can't keep up, frames are skipped without decoding to stay on
+    schedule, as a camera would keep capturing.
+    """
+    
+    def __init__(
+        self,
+        video_path: str,
+        speed: float = 1.0,
+        buffer_size: int = 1,
+        fallback_fps: float = 30.0
+    ):
+        """
+        Open a video file and start playing it.
+        
+        Args:
+            video_path: Video file to play
+            speed: Playback speed relative to the file's frame rate
+            buffer_size: Frames queued before the oldest is dropped (a camera's
+                driver buffer; 1 always delivers the newest frame)
+            fallback_fps: Frame rate used when the file doesn't report one
+        """
+        self.video_capture = cv2.VideoCapture(video_path)
+        file_fps = self.video_capture.get(cv2.CAP_PROP_FPS)
+        self.fps = file_fps if file_fps and file_fps > 0 else fallback_fps
+        self.frame_interval = 1.0 / (self.fps * speed)
+        self._frame_size = (self.video_capture.get(cv2.CAP_PROP_FRAME_WIDTH),
+                            self.video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        
+        self.frames_played = 0     # frames released by the emulated camera
+        self.frames_read = 0
+        self.dropped_frames = 0    # released but replaced before being read
+        self.late_frames = 0       # skipped because decoding fell behind
+        self.last_capture_timestamp: Optional[float] = None
+        self._staleness_sum = 0.0
+        self._queue: deque = deque()
+        self._buffer_size = max(buffer_size, 1)
+        self._condition = threading.Condition()
+        self._ended = False
+        self._stop = threading.Event()
+        self._start_time: Optional[float] = None
+        self._first_read_time: Optional[float] = None
+        self._thread = threading.Thread(target=self._play, name="realtime-video", daemon=True)
+        if self.video_capture.isOpened():
+            self._thread.start()
+    
+    def _play(self) -> None:
+        """Release frames on the file's timeline until the file ends"""
+        self._start_time = time.monotonic()
+        frame_index = 0
+        while not self._stop.is_set():
+            due_time = self._start_time + frame_index * self.frame_interval
+            delay = due_time - time.monotonic()
+            if delay > 0:
+                if self._stop.wait(delay):
+                    break  # released while waiting for the frame to be due
+            elif -delay > self.frame_interval:
+                # More than a frame behind: skip this one without decoding
+                if not self.video_capture.grab():
+                    break
+                self.late_frames += 1
+                frame_index += 1
+                continue
+            
+            frame_captured_successfully, frame = self.video_capture.read()
+            if not frame_captured_successfully or self._stop.is_set():
+                break
+            with self._condition:
+                if len(self._queue) == self._buffer_size:
+                    self._queue.popleft()
+                    self.dropped_frames += 1
+                self._queue.append((frame, time.time()))
+                self.frames_played += 1
+                self._condition.notify()
+            frame_index += 1
+        
+        with self._condition:
+            self._ended = True
+            self._condition.notify_all()
+    
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Return the oldest queued frame, waiting for one; fails once the file has ended"""
+        with self._condition:
+            while not self._queue and not self._ended:
+                self._condition.wait()
+            if not self._queue:
+                return False, None
+            frame, capture_timestamp = self._queue.popleft()
+        
+        now = time.time()
+        if self._first_read_time is None:
+            self._first_read_time = time.monotonic()
+        self.frames_read += 1
+        self._staleness_sum += now - capture_timestamp
+        self.last_capture_timestamp = capture_timestamp
+        return True, frame
+    
+    def describe_playback(self) -> str:
+        """Summarize dropped frames, output rate and frame age at read time"""
+        elapsed = time.monotonic() - self._first_read_time if self._first_read_time else 0.0
+        output_fps = (self.frames_read - 1) / elapsed if elapsed > 0 and self.frames_read > 1 else 0.0
+        mean_staleness_ms = self._staleness_sum / self.frames_read * 1000 if self.frames_read else 0.0
+        return (f"Realtime playback at {1.0 / self.frame_interval:.1f} fps: {self.frames_read} of "
+                f"{self.frames_played + self.late_frames} frames read, {self.dropped_frames} dropped "
+                f"unread, {self.late_frames} skipped by late decoding; output {output_fps:.1f} fps, "
+                f"mean frame age at read {mean_staleness_ms:.1f} ms")
+    
+    def isOpened(self) -> bool:
+        return self.video_capture.isOpened()
+    
+    def release(self) -> None:
+        """Stop playback, waiting for the thread's last decode before closing the file"""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.video_capture.release()
+    
+    def get(self, property_id: int) -> float:
+        """Report the file's frame size and frame rate like cv2.VideoCapture.get; other properties are 0"""
+        if property_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return self._frame_size[0]
+        if property_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return self._frame_size[1]
+        if property_id == cv2.CAP_PROP_FPS:
+            return self.fps
+        return 0.0
+
+
+# ================================
+# MULTI-CAMERA FUSION
+# ================================
+
+class MultiCameraFusion:
+    """
+    Fuses the tracks of several overlapping cameras into one global track list.
+    
+    Every camera's floor positions are already in shared floor meters (via its
+    own homography), so the same person seen by two cameras shows up as two
+    nearby positions. Those are merged by confidence-weighted averaging, and
+    each (camera, local person ID) is mapped to a global ID that persists while
+    the person walks from one camera's view into another's.
+    
+    Cameras may deliver frames at different rates: each camera's latest frame is
+    kept and used until it is older than `max_observation_age`.
+    """
+    
+    def __init__(
+        self,
+        merge_distance: float = 0.75,  # meters between duplicates of one person
+        handoff_distance: float = 1.0,  # meters a new local track may be from a global one
+        max_observation_age: float = 0.5,  # seconds before a camera's frame is ignored
+        global_track_timeout: float = 2.0  # seconds before an unseen global ID is dropped
+    ):
+        """
+        Initialize the fusion layer.
+        
+        Args:
+            merge_distance: Max distance (meters) between detections of one person
+            handoff_distance: Max distance (meters) for a new local track to
+                inherit a recently seen global ID
+            max_observation_age: Max age (seconds) of a camera's latest frame
+            global_track_timeout: Seconds without observation before a global ID is dropped
+        """
+        self.merge_distance = merge_distance
+        self.handoff_distance = handoff_distance
+        self.max_observation_age = max_observation_age
+        self.global_track_timeout = global_track_timeout
+        
+        self._camera_frames: dict[int, Tuple[float, FrameAnalysis]] = {}
+        self._global_id_by_local_id: dict[Tuple[int, int], int] = {}
+        self._global_tracks: dict[int, Tuple[float, float, float]] = {}  # id -> (x, y, last seen)
+        self._lock = threading.Lock()
+        self._frame_counter = 0
+        self.next_global_id = 0
+    
+    def add_camera_frame(
         self, 
-        input_frame: np.ndarray, 
-        detection_confidence: float,
-        keypoint_confidence: float,
-        inference_size: int
-    ) -> FrameAnalysis:
+        camera_id: int, 
+        frame_analysis: FrameAnalysis, 
+        timestamp: float
+    ) -> None:
+        """Store the latest analysis of one camera (safe to call from any thread)"""
+        with self._lock:
+            self._camera_frames[camera_id] = (timestamp, frame_analysis)
+    
+    def global_id_of(self, camera_id: int, local_person_id: int) -> Optional[int]:
+        """Global ID the last fuse gave to a camera's local track, if any"""
+        return self._global_id_by_local_id.get((camera_id, local_person_id))
+    
+    def fuse(self, timestamp: float) -> FrameAnalysis:
         """
-        Analyze a single frame and return detection results.
+        Merge the latest fresh frame of every camera into one analysis with global IDs.
         
         Args:
-            input_frame: Original camera/video frame
-            detection_confidence: Minimum confidence for person detection
-            keypoint_confidence: Minimum confidence for individual keypoints
-            inference_size: Size for model inference
+            timestamp: Current time in seconds (same clock as add_camera_frame)
             
         Returns:
-            FrameAnalysis object with all detection results
+            FrameAnalysis whose people carry global IDs and fused floor positions
         """
         start_time = time.time()
         self._frame_counter += 1
-
-        # Run pose detection
-        detection_results = self.pose_model.predict(
-            source=input_frame,
-            imgsz=inference_size,
-            conf=detection_confidence,
-            verbose=False
+        
+        with self._lock:
+            camera_frames = list(self._camera_frames.items())
+        
+        # Gather every positioned person from every fresh camera frame
+        observations: List[Tuple[int, PersonDetection]] = []
+        kinematics_by_local_id: dict[Tuple[int, int], PersonKinematics] = {}
+        for camera_id, (frame_timestamp, frame_analysis) in camera_frames:
+            if timestamp - frame_timestamp > self.max_observation_age:
+                continue
+            for person in frame_analysis.detected_people:
+                if person.floor_position is not None:
+                    observations.append((camera_id, person))
+            for kinematics in frame_analysis.kinematics:
+                kinematics_by_local_id[(camera_id, kinematics.person_id)] = kinematics
+        
+        clusters = self._cluster_observations(observations)
+        fused_people, fused_kinematics = self._assign_global_ids(
+            clusters, kinematics_by_local_id, timestamp
+        )
+        expired_ids = self._expire_global_tracks(timestamp)
+        
+        return FrameAnalysis(
+            frame_number=self._frame_counter,
+            detected_people=tuple(fused_people),
+            processing_time_ms=(time.time() - start_time) * 1000,
+            kinematics=tuple(fused_kinematics),
+            removed_person_ids=tuple(sorted(expired_ids))
+        )
+    
+    def _cluster_observations(
+        self, 
+        observations: List[Tuple[int, PersonDetection]]
+    ) -> List[List[Tuple[int, PersonDetection]]]:
+        """Group observations of the same person, at most one per camera, closest pairs first"""
+        if not observations:
+            return []
+        
+        positions = np.array([
+            (person.floor_position.floor_x, person.floor_position.floor_y)
+            for _, person in observations
+        ], dtype=np.float32)
+        cameras = np.array([camera_id for camera_id, _ in observations])
+        
+        offsets = positions[:, np.newaxis, :] - positions[np.newaxis, :, :]
+        distances = np.hypot(offsets[..., 0], offsets[..., 1])
+        candidates = (
+            (distances <= self.merge_distance)
+            & (cameras[:, np.newaxis] != cameras[np.newaxis, :])
+            & np.triu(np.ones_like(distances, dtype=bool), k=1)
         )
+        rows, columns = np.nonzero(candidates)
+        order = np.argsort(distances[rows, columns], kind="stable")
+        
+        cluster_of = list(range(len(observations)))
+        members = {i: [i] for i in range(len(observations))}
+        for i, j in zip(rows[order].tolist(), columns[order].tolist()):
+            cluster_i, cluster_j = cluster_of[i], cluster_of[j]
+            if cluster_i == cluster_j:
+                continue
+            # A camera never sees the same person twice, so never merge two of its tracks
+            if set(cameras[members[cluster_i]]) & set(cameras[members[cluster_j]]):
+                continue
+            for member in members[cluster_j]:
+                cluster_of[member] = cluster_i
+            members[cluster_i].extend(members.pop(cluster_j))
+        
+        return [[observations[i] for i in indices] for indices in members.values()]
+    
+    def _assign_global_ids(
+        self,
+        clusters: List[List[Tuple[int, PersonDetection]]],
+        kinematics_by_local_id: dict[Tuple[int, int], PersonKinematics],
+        timestamp: float
+    ) -> Tuple[List[PersonDetection], List[PersonKinematics]]:
+        """Give each cluster a global ID and build its fused PersonDetection"""
+        claimed_ids: set[int] = set()
+        fused_people = []
+        fused_kinematics = []
+        
+        # Clusters that already contain a known local track go first, so new
+        # local tracks can't take over the ID of someone still in view
+        def known_ids(cluster: List[Tuple[int, PersonDetection]]) -> List[int]:
+            return [
+                self._global_id_by_local_id[(camera_id, person.person_id)]
+                for camera_id, person in cluster
+                if (camera_id, person.person_id) in self._global_id_by_local_id
+            ]
+        
+        for cluster in sorted(clusters, key=lambda cluster: not known_ids(cluster)):
+            weights = np.array([person.floor_position.confidence for _, person in cluster], dtype=np.float64)
+            weights = np.maximum(weights, 1e-6)
+            positions = np.array([
+                (person.floor_position.floor_x, person.floor_position.floor_y)
+                for _, person in cluster
+            ])
+            fused_x, fused_y = (weights[:, np.newaxis] * positions).sum(axis=0) / weights.sum()
+            
+            # Prefer the ID most members already agree on (oldest on ties)
+            candidate_ids = [global_id for global_id in known_ids(cluster) if global_id not in claimed_ids]
+            if candidate_ids:
+                global_id = min(set(candidate_ids), key=lambda gid: (-candidate_ids.count(gid), gid))
+            else:
+                global_id = self._find_handoff_id(fused_x, fused_y, claimed_ids)
+            if global_id is None:
+                global_id = self.next_global_id
+                self.next_global_id += 1
+            
+            claimed_ids.add(global_id)
+            for camera_id, person in cluster:
+                self._global_id_by_local_id[(camera_id, person.person_id)] = global_id
+            self._global_tracks[global_id] = (float(fused_x), float(fused_y), timestamp)
+            
+            # Keypoints and pixel coordinates come from the most confident camera
+            best_camera_id, best_person = cluster[int(np.argmax(weights))]
+            fused_people.append(PersonDetection(
+                person_id=global_id,
+                keypoints=best_person.keypoints,
+                skeleton_bones=best_person.skeleton_bones,
+                bounding_box=best_person.bounding_box,
+                floor_position=FloorPosition(
+                    pixel_x=best_person.floor_position.pixel_x,
+                    pixel_y=best_person.floor_position.pixel_y,
+                    floor_x=float(fused_x),
+                    floor_y=float(fused_y),
+                    person_id=global_id,
+                    confidence=float(weights.max())
+                ),
+                keypoint_array=best_person.keypoint_array
+            ))
+            best_kinematics = kinematics_by_local_id.get((best_camera_id, best_person.person_id))
+            if best_kinematics is not None:
+                fused_kinematics.append(dataclasses.replace(best_kinematics, person_id=global_id))
+        
+        return fused_people, fused_kinematics
+    
+    def _find_handoff_id(self, floor_x: float, floor_y: float, claimed_ids: set[int]) -> Optional[int]:
+        """Find the nearest unclaimed, recently seen global track within handoff distance"""
+        best_id = None
+        best_distance = self.handoff_distance
+        for global_id, (track_x, track_y, _) in self._global_tracks.items():
+            if global_id in claimed_ids:
+                continue
+            distance = math.hypot(track_x - floor_x, track_y - floor_y)
+            if distance <= best_distance:
+                best_distance = distance
+                best_id = global_id
+        return best_id
+    
+    def _expire_global_tracks(self, timestamp: float) -> set[int]:
+        """Forget global IDs (and their local mappings) not seen for too long, returning the expired IDs"""
+        expired_ids = {
+            global_id for global_id, (_, _, last_seen) in self._global_tracks.items()
+            if timestamp - last_seen > self.global_track_timeout
+        }
+        if not expired_ids:
+            return expired_ids
+        for global_id in expired_ids:
+            del self._global_tracks[global_id]
+        self._global_id_by_local_id = {
+            local_id: global_id for local_id, global_id in self._global_id_by_local_id.items()
+            if global_id not in expired_ids
+        }
+        return expired_ids
 
-        # Process detection results into structured data
-        detected_people = []
-        primary_result = detection_results[0]
 
-        if primary_result.keypoints is not None and len(primary_result.keypoints) > 0:
-            all_keypoints = primary_result.keypoints.data.cpu().numpy()
-            bounding_boxes = (primary_result.boxes.xyxy.cpu().numpy() 
-                            if primary_result.boxes is not None else None)
-
-            # Process each detected person with temporary indices first
-            for person_index, person_keypoints in enumerate(all_keypoints):
-                person_detection = self._create_person_detection(
-                    person_keypoints, 
-                    person_index,  # Temporary index, will be replaced by tracker
-                    keypoint_confidence,
-                    bounding_boxes[person_index] if bounding_boxes is not None else None
-                )
-                detected_people.append(person_detection)
+class CameraFusionWorker(threading.Thread):
+    """Captures and analyzes one additional camera in the background, feeding the fusion layer"""
+    
+    def __init__(
+        self,
+        camera_id: int,
+        video_capture: cv2.VideoCapture,
+        skeleton_tracker: SkeletonTracker,
+        fusion: MultiCameraFusion,
+        analyze_kwargs: dict
+    ):
+        super().__init__(name=f"camera-{camera_id}", daemon=True)
+        self.camera_id = camera_id
+        self.video_capture = video_capture
+        self.skeleton_tracker = skeleton_tracker
+        self.fusion = fusion
+        self.analyze_kwargs = analyze_kwargs
+        self.latest_frame: Optional[Tuple[np.ndarray, FrameAnalysis]] = None
+        self._stop_requested = threading.Event()
+    
+    def run(self) -> None:
+        while not self._stop_requested.is_set():
+            frame_captured_successfully, frame = self.video_capture.read()
+            if not frame_captured_successfully:
+                print(f"Failed to capture frame from camera {self.camera_id}.")
+                break
+            frame_analysis = self.skeleton_tracker.analyze_frame(input_frame=frame, **self.analyze_kwargs)
+            self.fusion.add_camera_frame(self.camera_id, frame_analysis, time.monotonic())
+            self.latest_frame = (frame, frame_analysis)
+    
+    def stop(self) -> None:
+        self._stop_requested.set()
 
-        # Apply person tracking to assign stable IDs
-        detected_people_with_stable_ids, removed_person_ids = self.person_tracker.update_frame(
-            detected_people, self._frame_counter
-        )
-        
-        # Store removed person IDs for later use
-        self._last_removed_person_ids = removed_person_ids
 
-        processing_time = (time.time() - start_time) * 1000  # Convert to milliseconds
+# ================================
+# ASYNCIO RUNTIME
+# ================================
 
-        return FrameAnalysis(
-            frame_number=self._frame_counter,
-            detected_people=tuple(detected_people_with_stable_ids),
-            processing_time_ms=processing_time
+class AsyncOutputHandler(Protocol):
+    """Protocol for output handlers that run as coroutines on the event loop"""
+    
+    async def log_detection_info(self, frame_analysis: FrameAnalysis) -> None:
+        """Log detection information to console or other output"""
+        ...
+    
+    async def send_positions_frame(self, frame_analysis: FrameAnalysis) -> None:
+        """Send all positions for the current frame"""
+        ...
+
+
+class AsyncioOSCClient:
+    """
+    OSC client sending through an asyncio datagram transport.
+    
+    Sending only queues the datagram on the event loop's transport, so it never
+    blocks the loop. Create it with `await AsyncioOSCClient.connect(...)`.
+    """
+    
+    def __init__(self, transport: asyncio.DatagramTransport):
+        self._transport = transport
+    
+    @classmethod
+    async def connect(cls, osc_host: str, osc_port: int) -> "AsyncioOSCClient":
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(
+            asyncio.DatagramProtocol, remote_addr=(osc_host, osc_port)
         )
+        return cls(transport)
     
-    def _create_person_detection(
+    def send_message(self, address: str, value: Any) -> None:
+        builder = OscMessageBuilder(address=address)
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for argument in values:
+            builder.add_arg(argument)
+        self._transport.sendto(builder.build().dgram)
+    
+    def close(self) -> None:
+        self._transport.close()
+
+
+class InlineOutputHandler:
+    """Async adapter calling a synchronous OutputHandler directly on the event loop.
+    
+    Only for handlers that never block, e.g. OSC handlers using an AsyncioOSCClient.
+    """
+    
+    def __init__(self, handler: OutputHandler):
+        self.handler = handler
+    
+    async def log_detection_info(self, frame_analysis: FrameAnalysis) -> None:
+        self.handler.log_detection_info(frame_analysis)
+    
+    async def send_positions_frame(self, frame_analysis: FrameAnalysis) -> None:
+        self.handler.send_positions_frame(frame_analysis)
+
+
+class ExecutorOutputHandler:
+    """Async adapter running a (possibly blocking) synchronous OutputHandler on its own thread.
+    
+    One worker thread per handler keeps its calls in order, while a slow handler
+    (e.g. console printing) can't hold up other handlers or the event loop.
+    """
+    
+    def __init__(self, handler: OutputHandler):
+        self.handler = handler
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=type(handler).__name__)
+    
+    async def log_detection_info(self, frame_analysis: FrameAnalysis) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self.handler.log_detection_info, frame_analysis)
+    
+    async def send_positions_frame(self, frame_analysis: FrameAnalysis) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self.handler.send_positions_frame, frame_analysis)
+    
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+class AsyncSkeletonRuntime:
+    """
+    asyncio runtime for the capture/analysis loop and all I/O around it.
+    
+    The frame loop awaits capture and inference on worker threads, and hands
+    each analysis to the output handlers through a short queue. Output handlers
+    and the optional stats server run as coroutines on the event loop, so adding
+    outputs doesn't add latency to the frame path: if outputs fall behind, the
+    oldest pending frame is dropped instead of stalling capture.
+    """
+    
+    def __init__(
         self,
-        person_keypoints: np.ndarray,
-        person_index: int,
-        keypoint_confidence: float,
-        bounding_box_data: Optional[np.ndarray]
-    ) -> PersonDetection:
-        """Create PersonDetection from raw detection data"""
-        # Create keypoints
-        keypoints = create_keypoints_from_detection(
-            person_keypoints, keypoint_confidence
-        )
+        read_frame: Callable[[], Tuple[bool, Optional[np.ndarray]]],
+        analyze_frame: Callable[[np.ndarray], Optional[Tuple[FrameAnalysis, FrameAnalysis]]],
+        show_frame: Callable[[np.ndarray, FrameAnalysis], bool],
+        output_handlers: List[AsyncOutputHandler],
+        stats_port: Optional[int] = None,
+        max_pending_frames: int = 2
+    ):
+        """
+        Initialize the runtime.
         
-        # Create skeleton bones
-        skeleton_bones = create_skeleton_bones_from_keypoints(
-            person_keypoints, keypoint_confidence
-        )
+        Args:
+            read_frame: Blocking frame capture, returning (success, frame)
+            analyze_frame: Blocking analysis, returning (camera analysis, output analysis),
+                or None for a frame that had to be dropped
+            show_frame: Visualization step run on the loop thread; returns True to quit
+            output_handlers: Handlers receiving every output analysis
+            stats_port: TCP port for a JSON stats endpoint, or None to disable
+            max_pending_frames: Analyses buffered for the outputs before dropping
+        """
+        self.read_frame = read_frame
+        self.analyze_frame = analyze_frame
+        self.show_frame = show_frame
+        self.output_handlers = output_handlers
+        self.stats_port = stats_port
+        self.max_pending_frames = max_pending_frames
         
-        # Create bounding box if available
-        bounding_box = None
-        if bounding_box_data is not None:
-            x1, y1, x2, y2 = bounding_box_data
-            bounding_box = BoundingBox(
-                x1=int(x1), y1=int(y1), x2=int(x2), y2=int(y2)
-            )
+        self._capture_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="capture")
+        self._inference_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
+        self._stats = {
+            "frames": 0,
+            "fps": 0.0,
+            "dropped_output_frames": 0,
+            "last_processing_time_ms": 0.0,
+            "last_stage_times_ms": {},
+            "people": 0
+        }
+    
+    async def run(self) -> str:
+        """
+        Run until capture ends or the visualization requests quitting.
         
-        # Create floor position
-        floor_position = create_floor_position_from_keypoints(
-            person_keypoints, person_index, keypoint_confidence, self.floor_homography_matrix
+        Returns:
+            "capture_ended" or "quit"
+        """
+        loop = asyncio.get_running_loop()
+        output_queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_pending_frames)
+        dispatcher = asyncio.create_task(self._dispatch_outputs(output_queue))
+        
+        stats_server = None
+        if self.stats_port is not None:
+            stats_server = await asyncio.start_server(self._serve_stats, "127.0.0.1", self.stats_port)
+            print(f"Stats available at http://127.0.0.1:{self.stats_port}/")
+        
+        stop_reason = "capture_ended"
+        last_frame_time = None
+        try:
+            while True:
+                frame_captured_successfully, frame = await loop.run_in_executor(
+                    self._capture_executor, self.read_frame
+                )
+                if not frame_captured_successfully:
+                    break
+                
+                analyses = await loop.run_in_executor(
+                    self._inference_executor, self.analyze_frame, frame
+                )
+                if analyses is None:
+                    continue
+                frame_analysis, output_analysis = analyses
+                
+                # Never wait on the outputs: drop their oldest frame instead
+                if output_queue.full():
+                    output_queue.get_nowait()
+                    output_queue.task_done()
+                    self._stats["dropped_output_frames"] += 1
+                output_queue.put_nowait(output_analysis)
+                
+                now = time.monotonic()
+                if last_frame_time is not None:
+                    instantaneous_fps = 1.0 / max(now - last_frame_time, 1e-6)
+                    self._stats["fps"] = 0.9 * self._stats["fps"] + 0.1 * instantaneous_fps
+                last_frame_time = now
+                self._stats["frames"] += 1
+                self._stats["last_processing_time_ms"] = frame_analysis.processing_time_ms
+                self._stats["last_stage_times_ms"] = frame_analysis.stage_times_ms
+                self._stats["people"] = len(output_analysis.detected_people)
+                
+                if self.show_frame(frame, frame_analysis):
+                    stop_reason = "quit"
+                    break
+            
+            await output_queue.join()
+        finally:
+            dispatcher.cancel()
+            if stats_server is not None:
+                stats_server.close()
+                await stats_server.wait_closed()
+            self._capture_executor.shutdown(wait=False)
+            self._inference_executor.shutdown(wait=False)
+        
+        return stop_reason
+    
+    async def _dispatch_outputs(self, output_queue: asyncio.Queue) -> None:
+        """Deliver queued analyses to all output handlers concurrently"""
+        while True:
+            frame_analysis = await output_queue.get()
+            try:
+                results = await asyncio.gather(*(
+                    self._send_to_handler(handler, frame_analysis)
+                    for handler in self.output_handlers
+                ), return_exceptions=True)
+                for result in results:
+                    if isinstance(result, Exception):
+                        print(f"Output handler error: {result}")
+            finally:
+                output_queue.task_done()
+    
+    async def _send_to_handler(self, handler: AsyncOutputHandler, frame_analysis: FrameAnalysis) -> None:
+        await handler.log_detection_info(frame_analysis)
+        await handler.send_positions_frame(frame_analysis)
+    
+    async def _serve_stats(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer any HTTP request with the current runtime stats as JSON"""
+        try:
+            await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        body = json.dumps(self._stats).encode()
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+            + f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+            + body
         )
+        await writer.drain()
+        writer.close()
+
+
+# ================================
+# RESOURCE MONITORING
+# ================================
+
+def _subsystem_of(filename: str) -> str:
+    """Attribute a source file to a subsystem: its installed package, or the file itself"""
+    parts = filename.replace("\\", "/").split("/")
+    for index, part in enumerate(parts[:-1]):
+        if part in ("site-packages", "dist-packages"):
+            return parts[index + 1].removesuffix(".py")
+    for index, part in enumerate(parts[:-1]):
+        if part.startswith("python3") and index > 0 and parts[index - 1] == "lib":
+            return "stdlib:" + parts[index + 1].removesuffix(".py")
+    return parts[-1]
+
+
+def _read_rss_megabytes() -> Optional[float]:
+    """Current resident set size of this process (Linux), None where unavailable"""
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _count_open_file_descriptors() -> Optional[int]:
+    """Number of open file descriptors (Linux/macOS), None where unavailable"""
+    for fd_directory in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(fd_directory))
+        except OSError:
+            continue
+    return None
+
+
+class ResourceMonitor:
+    """
+    Samples process resources at a low rate and appends them to a rotating log.
+    
+    Each sample is one JSON line with RSS, open file descriptors, thread count,
+    GC collections and pause times since the previous sample, the traced Python
+    heap grouped by subsystem (tracemalloc), live object counts by type, and
+    any state probes (e.g. track counts). Comparing two samples shows which
+    subsystem or object type grew; see resource_report.py.
+    
+    tracemalloc slows down allocation-heavy code noticeably, so it's only
+    running while a monitor is.
+    """
+    
+    def __init__(
+        self,
+        log_path: str,
+        interval_seconds: float = 60.0,
+        state_probes: Optional[dict[str, Callable[[], Any]]] = None,
+        max_log_bytes: int = 10 * 2**20,
+        log_backup_count: int = 10
+    ):
+        """
+        Initialize the monitor (sampling starts with `start`).
         
-        return PersonDetection(
-            person_id=person_index,
-            keypoints=keypoints,
-            skeleton_bones=skeleton_bones,
-            bounding_box=bounding_box,
-            floor_position=floor_position
+        Args:
+            log_path: Path of the JSON-lines log; rotated files get .1, .2, ...
+            interval_seconds: Time between samples
+            state_probes: Named callables whose results are logged with every sample
+            max_log_bytes: Log size at which it's rotated
+            log_backup_count: Rotated logs kept (a sample is ~30 kB, so the
+                defaults keep about three days at one sample per minute)
+        """
+        self.interval_seconds = interval_seconds
+        self.state_probes = state_probes or {}
+        
+        self._logger = logging.getLogger(f"{__name__}.resources")
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._log_handler = logging.handlers.RotatingFileHandler(
+            log_path, maxBytes=max_log_bytes, backupCount=log_backup_count
         )
+        self._logger.addHandler(self._log_handler)
+        
+        self._gc_start_time: Optional[float] = None
+        self._gc_pauses_ms: List[float] = []
+        self._gc_collections = [0, 0, 0]
+        self._start_time = time.monotonic()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def _on_gc(self, phase: str, info: dict) -> None:
+        """gc.callbacks hook timing every collection"""
+        if phase == "start":
+            self._gc_start_time = time.perf_counter()
+        elif self._gc_start_time is not None:
+            self._gc_pauses_ms.append((time.perf_counter() - self._gc_start_time) * 1000)
+            self._gc_collections[info["generation"]] += 1
+            self._gc_start_time = None
+    
+    def start(self) -> None:
+        """Start tracing and sampling on a background thread"""
+        tracemalloc.start()
+        gc.callbacks.append(self._on_gc)
+        self._thread = threading.Thread(target=self._run, name="resource-monitor", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Take a final sample and stop"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        tracemalloc.stop()
+        self._logger.removeHandler(self._log_handler)
+        self._log_handler.close()
+    
+    def _run(self) -> None:
+        self._log_sample()
+        while not self._stop_event.wait(self.interval_seconds):
+            self._log_sample()
+        self._log_sample()
+    
+    def _log_sample(self) -> None:
+        self._logger.info(json.dumps(self.sample()))
+    
+    def sample(self) -> dict:
+        """Collect one resource sample"""
+        pauses_ms, self._gc_pauses_ms = self._gc_pauses_ms, []
+        collections, self._gc_collections = self._gc_collections, [0, 0, 0]
+        
+        heap_by_subsystem: dict[str, int] = defaultdict(int)
+        traced_current, traced_peak = 0, 0
+        if tracemalloc.is_tracing():
+            for statistic in tracemalloc.take_snapshot().statistics("filename"):
+                heap_by_subsystem[_subsystem_of(statistic.traceback[0].filename)] += statistic.size
+            traced_current, traced_peak = tracemalloc.get_traced_memory()
+        
+        object_counts: dict[str, int] = defaultdict(int)
+        for live_object in gc.get_objects():
+            object_counts[type(live_object).__name__] += 1
+        
+        state = {}
+        for name, probe in self.state_probes.items():
+            try:
+                state[name] = probe()
+            except Exception as error:
+                state[name] = f"error: {error}"
+        
+        # Only report torch's allocator if the model already imported torch
+        torch_module = sys.modules.get("torch")
+        if torch_module is not None and torch_module.cuda.is_available():
+            state["torch_cuda_allocated_mb"] = round(torch_module.cuda.memory_allocated() / 2**20, 3)
+            state["torch_cuda_reserved_mb"] = round(torch_module.cuda.memory_reserved() / 2**20, 3)
+        
+        return {
+            "time": time.time(),
+            "uptime_s": round(time.monotonic() - self._start_time, 1),
+            "rss_mb": _read_rss_megabytes(),
+            "open_fds": _count_open_file_descriptors(),
+            "threads": threading.active_count(),
+            "gc_collections": collections,
+            "gc_pause_total_ms": round(sum(pauses_ms), 3),
+            "gc_pause_max_ms": round(max(pauses_ms, default=0.0), 3),
+            "traced_heap_mb": round(traced_current / 2**20, 3),
+            "traced_heap_peak_mb": round(traced_peak / 2**20, 3),
+            # Complete maps: an entry missing from a sample really is zero,
+            # so growth into or out of any top list can't be misread
+            "heap_by_subsystem": dict(heap_by_subsystem),
+            "objects_by_type": dict(object_counts),
+            "complete_counts": True,
+            "state": state
+        }
+
+
+def tracker_state_probes(skeleton_tracker: "SkeletonTracker") -> dict[str, Callable[[], Any]]:
+    """State sizes of a skeleton tracker worth watching for unbounded growth"""
+    person_tracker = skeleton_tracker.person_tracker
+    probes = {
+        "next_person_id": lambda: person_tracker.next_person_id,
+        "live_tracks": lambda: len(person_tracker.tracks),
+        "track_capacity": lambda: person_tracker.tracks.capacity,
+    }
+    if person_tracker.reidentifier:
+        reidentifier = person_tracker.reidentifier
+        probes["reid_track_embeddings"] = lambda: len(reidentifier.track_embeddings)
+        probes["reid_lost_embeddings"] = lambda: len(reidentifier.lost_track_embeddings)
+    return probes
 
 
 def create_argument_parser() -> argparse.ArgumentParser:
@@ -1027,6 +4542,28 @@ def create_argument_parser() -> argparse.ArgumentParser:
         type=str, 
         help="Path to video file for processing"
     )
+    input_group.add_argument(
+        "--frame_bus", 
+        nargs="?", 
+        const=DEFAULT_BUS_NAME, 
+        help="Read frames from a shared-memory frame bus published by frame_bus.py"
+    )
+    
+    parser.add_argument(
+        "--extra_cam", 
+        nargs=2, 
+        action="append", 
+        default=[], 
+        metavar=("CAM", "HOMOGRAPHY"), 
+        help="Additional overlapping camera index and its homography file; "
+             "repeatable, tracks of all cameras are fused into global IDs"
+    )
+    parser.add_argument(
+        "--fusion_distance", 
+        type=float, 
+        default=0.75, 
+        help="Maximum distance (meters) between two cameras' detections of the same person"
+    )
     
     # Model configuration
     parser.add_argument(
@@ -1052,6 +4589,57 @@ def create_argument_parser() -> argparse.ArgumentParser:
         default=960, 
         help="Model inference size in pixels (larger = more accurate but slower)"
     )
+    parser.add_argument(
+        "--lean_inference", 
+        action="store_true", 
+        help="Run the pose network directly (preallocated letterbox, inference_mode, torchvision NMS) "
+             "instead of through YOLO.predict; check it with benchmark_inference.py"
+    )
+    parser.add_argument(
+        "--tiled", 
+        action="store_true", 
+        help="Run the model on overlapping --tile_size tiles in one batch, for high-resolution cameras"
+    )
+    parser.add_argument(
+        "--tile_size", 
+        type=int, 
+        default=640, 
+        help="Tile size in pixels, also used as the inference size in tiled mode"
+    )
+    parser.add_argument(
+        "--tile_overlap", 
+        type=float, 
+        default=0.25, 
+        help="Overlap between neighbouring tiles, relative to the tile size"
+    )
+    parser.add_argument(
+        "--tiles_only", 
+        action="store_true", 
+        help="Don't add the whole frame to the tile batch (misses people larger than a tile)"
+    )
+    parser.add_argument(
+        "--cascade_model", 
+        help="Heavier pose model re-run on crops of people whose ankles --model is unsure about "
+             "(use a fast --model such as yolov8n-pose.pt)"
+    )
+    parser.add_argument(
+        "--cascade_ankle_conf", 
+        type=float, 
+        default=0.5, 
+        help="Escalate people to --cascade_model when neither ankle reaches this confidence"
+    )
+    parser.add_argument(
+        "--cascade_padding", 
+        type=float, 
+        default=0.2, 
+        help="Padding around escalated person boxes, relative to box size"
+    )
+    parser.add_argument(
+        "--cascade_imgsz", 
+        type=int, 
+        default=320, 
+        help="Inference size for the escalated crops"
+    )
     
     # Coordinate transformation
     parser.add_argument(
@@ -1059,6 +4647,77 @@ def create_argument_parser() -> argparse.ArgumentParser:
         default="motion-tracking/floor_homography.npy", 
         help="Path to homography matrix file for pixel-to-floor coordinate transformation"
     )
+    parser.add_argument(
+        "--floor_polygon", 
+        type=float, 
+        nargs="+", 
+        metavar="X Y", 
+        help="Tracked floor area as polygon vertices in meters (x1 y1 x2 y2 x3 y3 ...); "
+             "inference is cropped to it and people outside it are ignored"
+    )
+    parser.add_argument(
+        "--calibration_size", 
+        type=int, 
+        nargs=2, 
+        metavar=("WIDTH", "HEIGHT"), 
+        help="Frame size the homography was calibrated at; it is rescaled if frames differ"
+    )
+    
+    # Camera capture
+    parser.add_argument(
+        "--cam_width", 
+        type=int, 
+        help="Requested camera frame width in pixels"
+    )
+    parser.add_argument(
+        "--cam_height", 
+        type=int, 
+        help="Requested camera frame height in pixels"
+    )
+    parser.add_argument(
+        "--cam_fps", 
+        type=float, 
+        help="Requested camera frame rate"
+    )
+    parser.add_argument(
+        "--cam_mjpg", 
+        action="store_true", 
+        help="Request MJPG frames from the camera (usually higher FPS/resolution than YUYV)"
+    )
+    parser.add_argument(
+        "--cam_buffer", 
+        type=int, 
+        help="Requested number of frames buffered by the camera driver"
+    )
+    parser.add_argument(
+        "--cam_match_imgsz", 
+        action="store_true", 
+        help="Request a capture size whose longer side matches --imgsz, in the camera's default aspect ratio, "
+             "unless --cam_width/--cam_height are given"
+    )
+    parser.add_argument(
+        "--latest_frame", 
+        action="store_true", 
+        help="Drain queued camera frames so only the newest one is decoded"
+    )
+    parser.add_argument(
+        "--realtime", 
+        action="store_true", 
+        help="Play --video at its native frame rate like a live camera, dropping frames that "
+             "aren't read in time (for reproducing live latency and frame drops)"
+    )
+    parser.add_argument(
+        "--realtime_speed", 
+        type=float, 
+        default=1.0, 
+        help="Playback speed for --realtime relative to the file's frame rate"
+    )
+    parser.add_argument(
+        "--realtime_buffer", 
+        type=int, 
+        default=1, 
+        help="Frames the emulated camera queues for --realtime before dropping the oldest"
+    )
     
     # Visualization options
     parser.add_argument(
@@ -1080,6 +4739,95 @@ def create_argument_parser() -> argparse.ArgumentParser:
         default=9000, 
         help="OSC server port for sending position data"
     )
+    parser.add_argument(
+        "--osc_fanout", 
+        type=parse_osc_destination, 
+        nargs="+", 
+        metavar="HOST:PORT[@HZ]", 
+        help="Also send all OSC output to these destinations (multicast groups allowed), encoded "
+             "once and sent from a background thread; @HZ limits a destination's rate per OSC address"
+    )
+    parser.add_argument(
+        "--osc_multicast_ttl", 
+        type=int, 
+        default=1, 
+        help="Router hops multicast OSC datagrams may cross (1 keeps them on the local network)"
+    )
+    parser.add_argument(
+        "--osc_timestamp", 
+        action="store_true", 
+        help="Append the frame capture time (int64 microseconds since the epoch) to /people/positions"
+    )
+    parser.add_argument(
+        "--osc_deadband", 
+        type=float, 
+        default=0.0, 
+        help="Only resend positions once someone moved more than this many meters (0 sends every change)"
+    )
+    parser.add_argument(
+        "--osc_skeletons", 
+        action="store_true", 
+        help="Also stream all tracked skeletons as one quantized blob per frame via OSC (/people/skeletons)"
+    )
+    parser.add_argument(
+        "--skeleton_keyframe_interval", 
+        type=float, 
+        default=1.0, 
+        help="Seconds between skeleton keyframes, which resend everyone so late joiners resync"
+    )
+    parser.add_argument(
+        "--skeleton_deadband", 
+        type=float, 
+        default=0.002, 
+        help="Between keyframes, only resend a skeleton once a keypoint moved more than this "
+             "fraction of the frame size"
+    )
+    
+    # Runtime
+    parser.add_argument(
+        "--async_io", 
+        action="store_true", 
+        help="Run outputs and servers on an asyncio event loop, with capture and inference on worker threads"
+    )
+    parser.add_argument(
+        "--stats_port", 
+        type=int, 
+        help="Serve runtime stats as JSON over HTTP on this local port (requires --async_io)"
+    )
+    
+    # Long-running diagnostics
+    parser.add_argument(
+        "--resource_log", 
+        help="Sample memory, GC pauses, file descriptors and tracker state into this rotating "
+             "JSON-lines log (compare samples with resource_report.py); slows allocation somewhat"
+    )
+    parser.add_argument(
+        "--resource_interval", 
+        type=float, 
+        default=60.0, 
+        help="Seconds between resource samples"
+    )
+    parser.add_argument(
+        "--profile_dir", 
+        help="Enable on-demand profiling: SIGUSR1 or the OSC control message /tracker/profile "
+             "[frames] profiles the next frames and writes the results into this directory"
+    )
+    parser.add_argument(
+        "--profile_frames", 
+        type=int, 
+        default=100, 
+        help="Frames profiled per request when the request doesn't give a count"
+    )
+    parser.add_argument(
+        "--control_port", 
+        type=int, 
+        help="Listen for OSC control messages (e.g. /tracker/profile) on this UDP port"
+    )
+    parser.add_argument(
+        "--control_host", 
+        default="127.0.0.1", 
+        help="Address the OSC control port listens on"
+    )
     
     # Person tracking
     parser.add_argument(
@@ -1094,9 +4842,272 @@ def create_argument_parser() -> argparse.ArgumentParser:
         default=30, 
         help="Frames without detection before considering person lost"
     )
+    parser.add_argument(
+        "--reid", 
+        action="store_true", 
+        help="Use appearance re-identification for ambiguous matches and returning people"
+    )
+    parser.add_argument(
+        "--reid_cache", 
+        type=int, 
+        default=32, 
+        help="Number of recently lost tracks remembered for re-identification"
+    )
+    parser.add_argument(
+        "--reid_timeout", 
+        type=int, 
+        default=150, 
+        help="Frames a lost track stays recoverable before its removal is reported"
+    )
+    parser.add_argument(
+        "--reid_threshold", 
+        type=float, 
+        default=0.8, 
+        help="Appearance similarity (0.0-1.0) needed to give a returning person their old ID"
+    )
+    
+    # Motion gating
+    parser.add_argument(
+        "--motion_gate", 
+        action="store_true", 
+        help="Skip pose inference and reuse the last detections while the scene is unchanged"
+    )
+    parser.add_argument(
+        "--motion_threshold", 
+        type=float, 
+        default=0.005, 
+        help="Fraction of (downscaled) pixels that must change to count as motion"
+    )
+    parser.add_argument(
+        "--motion_refresh", 
+        type=int, 
+        default=30, 
+        help="Maximum frames to reuse detections before forcing inference"
+    )
+    
+    # Output smoothing
+    parser.add_argument(
+        "--smoothing", 
+        action="store_true", 
+        help="Smooth tracked keypoints and floor positions with One-Euro filters"
+    )
+    parser.add_argument(
+        "--smoothing_min_cutoff", 
+        type=float, 
+        default=1.0, 
+        help="One-Euro cutoff frequency (Hz) at rest; lower is smoother but lags more"
+    )
+    parser.add_argument(
+        "--smoothing_keypoint_beta", 
+        type=float, 
+        default=0.01, 
+        help="One-Euro speed coefficient for keypoints (per pixel/s); higher lags less on fast moves"
+    )
+    parser.add_argument(
+        "--smoothing_floor_beta", 
+        type=float, 
+        default=1.0, 
+        help="One-Euro speed coefficient for floor positions (per meter/s)"
+    )
+    
+    # Movement features
+    parser.add_argument(
+        "--kinematics", 
+        action="store_true", 
+        help="Compute per-person velocity and pose features and send them via OSC (/people/kinematics)"
+    )
+    
+    # Floor occupancy heatmap
+    parser.add_argument(
+        "--occupancy", 
+        action="store_true", 
+        help="Maintain a floor occupancy heatmap and publish it via OSC (/floor/occupancy)"
+    )
+    parser.add_argument(
+        "--occupancy_bounds", 
+        type=float, 
+        nargs=4, 
+        default=[0.0, 0.0, 10.0, 10.0], 
+        metavar=("MIN_X", "MIN_Y", "MAX_X", "MAX_Y"), 
+        help="Floor area (meters) covered by the occupancy grid"
+    )
+    parser.add_argument(
+        "--occupancy_cell", 
+        type=float, 
+        default=0.5, 
+        help="Occupancy grid cell size (meters)"
+    )
+    parser.add_argument(
+        "--occupancy_half_life", 
+        type=float, 
+        default=2.0, 
+        help="Seconds for past occupancy to decay to half its value"
+    )
+    parser.add_argument(
+        "--occupancy_rate", 
+        type=float, 
+        default=5.0, 
+        help="Occupancy grid publish rate (Hz)"
+    )
+    
+    # Floor zones
+    parser.add_argument(
+        "--zones", 
+        type=str, 
+        default=None, 
+        help="JSON file of named floor zones (polygons in meters); sends /zones/enter, /zones/exit "
+             "and /zones/occupancy via OSC"
+    )
+    parser.add_argument(
+        "--zone_cell", 
+        type=float, 
+        default=0.1, 
+        help="Cell size (meters) of the grid index used for zone lookups"
+    )
+    parser.add_argument(
+        "--zone_exit_delay", 
+        type=float, 
+        default=0.3, 
+        help="Seconds someone must stay outside a zone before leaving it is reported"
+    )
+    parser.add_argument(
+        "--zone_refresh", 
+        type=float, 
+        default=5.0, 
+        help="Seconds between resends of every zone's head count (0 only sends changes)"
+    )
     
     return parser
 
+def create_osc_output_handlers(
+    args: argparse.Namespace, 
+    osc_client: Optional[OSCClient] = None
+) -> List[OutputHandler]:
+    """Create the OSC output handlers enabled on the command line, sharing one client"""
+    if osc_client is None:
+        osc_client = SimpleUDPClient(args.osc_host, args.osc_port)
+    
+    handlers: List[OutputHandler] = [OSCOutputHandler(
+        osc_client=osc_client,
+        include_capture_timestamp=args.osc_timestamp,
+        position_deadband=args.osc_deadband
+    )]
+    if args.kinematics:
+        handlers.append(KinematicsOSCOutputHandler(osc_client=osc_client))
+    if args.osc_skeletons:
+        handlers.append(SkeletonOSCOutputHandler(
+            osc_client=osc_client,
+            keyframe_interval_seconds=args.skeleton_keyframe_interval,
+            keypoint_deadband=args.skeleton_deadband
+        ))
+    if args.occupancy:
+        occupancy_grid = FloorOccupancyGrid(
+            floor_bounds=tuple(args.occupancy_bounds),
+            cell_size=args.occupancy_cell,
+            half_life_seconds=args.occupancy_half_life
+        )
+        handlers.append(OccupancyOSCOutputHandler(
+            occupancy_grid, publish_rate_hz=args.occupancy_rate, osc_client=osc_client
+        ))
+    if args.zones:
+        zone_index = FloorZoneIndex(load_floor_zones(args.zones), cell_size=args.zone_cell)
+        print(f"Loaded {len(zone_index.zone_names)} floor zones from {args.zones} "
+              f"({zone_index.columns}x{zone_index.rows} index cells, "
+              f"{zone_index.boundary_cell_fraction:.0%} on zone edges)")
+        handlers.append(ZoneOSCOutputHandler(
+            zone_index,
+            osc_client=osc_client,
+            exit_delay_seconds=args.zone_exit_delay,
+            refresh_interval_seconds=args.zone_refresh
+        ))
+    return handlers
+
+
+def create_fanout_osc_client(args: argparse.Namespace) -> Optional[FanOutOSCClient]:
+    """Create the fan-out OSC client for --osc_host/--osc_port plus --osc_fanout, if enabled"""
+    if not args.osc_fanout:
+        return None
+    return FanOutOSCClient(
+        [OSCDestination(args.osc_host, args.osc_port)] + args.osc_fanout,
+        multicast_ttl=args.osc_multicast_ttl
+    )
+
+
+def create_capture_settings(args: argparse.Namespace) -> CaptureSettings:
+    """Create camera capture settings from command-line arguments"""
+    return CaptureSettings(
+        width=args.cam_width,
+        height=args.cam_height,
+        fps=args.cam_fps,
+        use_mjpg=args.cam_mjpg,
+        buffer_size=args.cam_buffer,
+        # Decoding more pixels than the model's input size is wasted work
+        match_size=args.imgsz if args.cam_match_imgsz else None
+    )
+
+
+def create_floor_region(args: argparse.Namespace, homography_matrix: np.ndarray) -> Optional[FloorRegion]:
+    """Create the floor region for a camera's homography from command-line arguments, if given"""
+    if not args.floor_polygon:
+        return None
+    return FloorRegion(parse_floor_polygon(args.floor_polygon), homography_matrix)
+
+
+def create_tiled_inference(
+    args: argparse.Namespace, 
+    floor_region: Optional[FloorRegion]
+) -> Optional[TiledPoseInference]:
+    """Create tiled inference for a camera from command-line arguments, if enabled"""
+    if not args.tiled:
+        return None
+    return TiledPoseInference(
+        tile_size=args.tile_size,
+        overlap=args.tile_overlap,
+        include_full_frame=not args.tiles_only,
+        floor_region=floor_region
+    )
+
+
+def create_pose_cascade(args: argparse.Namespace) -> Optional[PoseCascade]:
+    """Create the heavy-model cascade from command-line arguments, if enabled"""
+    if not args.cascade_model:
+        return None
+    return PoseCascade(
+        args.cascade_model,
+        ankle_confidence_threshold=args.cascade_ankle_conf,
+        crop_padding=args.cascade_padding,
+        crop_inference_size=args.cascade_imgsz
+    )
+
+
+def create_track_smoother(args: argparse.Namespace) -> Optional[TrackSmoother]:
+    """Create One-Euro smoothing of tracker output from command-line arguments, if enabled"""
+    if not args.smoothing:
+        return None
+    return TrackSmoother(
+        min_cutoff=args.smoothing_min_cutoff,
+        keypoint_beta=args.smoothing_keypoint_beta,
+        floor_beta=args.smoothing_floor_beta
+    )
+
+
+def create_frame_profiler(args: argparse.Namespace) -> Optional[FrameProfiler]:
+    """Create the on-demand profiler from command-line arguments, if enabled"""
+    if not args.profile_dir:
+        return None
+    return FrameProfiler(args.profile_dir, default_frame_count=args.profile_frames)
+
+
+def create_motion_gate(args: argparse.Namespace) -> Optional[MotionGate]:
+    """Create a motion gate from command-line arguments, if enabled"""
+    if not args.motion_gate:
+        return None
+    return MotionGate(
+        changed_fraction_threshold=args.motion_threshold,
+        refresh_interval=args.motion_refresh
+    )
+
+
 def main():
     """
     Main entry point for the skeleton tracking application.
@@ -1107,6 +5118,20 @@ def main():
     # Parse command line arguments
     argument_parser = create_argument_parser()
     args = argument_parser.parse_args()
+    if args.floor_polygon and (len(args.floor_polygon) < 6 or len(args.floor_polygon) % 2):
+        argument_parser.error("--floor_polygon needs at least three x y pairs")
+
+    reidentifier = None
+    if args.reid:
+        reidentifier = AppearanceReidentifier(
+            lost_track_cache_size=args.reid_cache,
+            lost_track_timeout=args.reid_timeout,
+            similarity_threshold=args.reid_threshold
+        )
+
+    frame_profiler = create_frame_profiler(args)
+    if frame_profiler and hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, lambda signal_number, stack_frame: frame_profiler.request())
 
     # Initialize the skeleton tracker
     try:
@@ -1114,25 +5139,55 @@ def main():
             pose_model_path=args.model,
             homography_file_path=args.homography,
             tracking_distance_threshold=args.tracking_distance,
-            tracking_max_frames_missing=args.tracking_timeout
+            tracking_max_frames_missing=args.tracking_timeout,
+            reidentifier=reidentifier,
+            compute_kinematics=args.kinematics,
+            motion_gate=create_motion_gate(args),
+            smoother=create_track_smoother(args),
+            cascade=create_pose_cascade(args),
+            frame_profiler=frame_profiler,
+            lean_inference=args.lean_inference
         )
     except Exception as error:
         print(f"Failed to initialize skeleton tracker: {error}")
         return
 
-    # Set up output handlers
+    # Set up output handlers (asyncio mode creates its own on the event loop)
     console_handler = ConsoleOutputHandler()
-    osc_handler = OSCOutputHandler(args.osc_host, args.osc_port)
-    output_handler = CombinedOutputHandler([console_handler, osc_handler])
+    fanout_osc_client = create_fanout_osc_client(args)
+    if not args.async_io:
+        output_handler = CombinedOutputHandler(
+            [console_handler] + create_osc_output_handlers(args, fanout_osc_client)
+        )
     visualizer = OpenCVVisualizer()
+    
+    analyze_kwargs = dict(
+        detection_confidence=args.conf,
+        keypoint_confidence=args.kpt_conf,
+        inference_size=args.imgsz
+    )
 
-    # Set up video capture source (camera or file)
-    if args.video:
+    # Camera properties to request (only used for live cameras)
+    capture_settings = create_capture_settings(args)
+
+    # Set up video capture source (camera, file or frame bus)
+    if args.video and args.realtime:
+        video_capture = RealtimeVideoCapture(args.video, speed=args.realtime_speed, buffer_size=args.realtime_buffer)
+        print(f"Playing video file in real time: {args.video}")
+    elif args.video:
         video_capture = cv2.VideoCapture(args.video)
         print(f"Processing video file: {args.video}")
+    elif args.frame_bus:
+        video_capture = FrameBusReader(args.frame_bus)
+        skeleton_tracker.frame_valid = video_capture.frame_still_valid
+        print(f"Consuming frame bus: {args.frame_bus}")
     elif args.cam is not None:
-        video_capture = cv2.VideoCapture(args.cam)
+        video_capture = open_camera_capture(args.cam, capture_settings)
         print(f"Using camera index: {args.cam}")
+        if video_capture.isOpened():
+            print(f"Camera granted: {describe_capture(video_capture)}")
+            if args.latest_frame:
+                video_capture = LatestFrameCapture(video_capture)
     else:
         argument_parser.error("Must specify either --cam or --video")
 
@@ -1140,54 +5195,201 @@ def main():
     if not video_capture.isOpened():
         if args.video:
             raise RuntimeError(f"Could not open video file: {args.video}")
+        elif args.frame_bus:
+            raise RuntimeError(f"Could not attach to frame bus '{args.frame_bus}' (is frame_bus.py running?)")
         else:
             raise RuntimeError(f"Could not open camera index: {args.cam}")
 
+    # Match the homography to the frame size actually delivered
+    if args.calibration_size:
+        frame_size = (int(video_capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                      int(video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        if frame_size != tuple(args.calibration_size) and min(frame_size) > 0:
+            skeleton_tracker.floor_homography_matrix = scale_homography_to_frame_size(
+                skeleton_tracker.floor_homography_matrix, tuple(args.calibration_size), frame_size
+            )
+            print(f"Homography rescaled from {args.calibration_size[0]}x{args.calibration_size[1]} "
+                  f"to {frame_size[0]}x{frame_size[1]}")
+    elif args.cam_match_imgsz:
+        print("Warning: --cam_match_imgsz without --calibration_size; floor positions "
+              "are wrong if the homography was calibrated at another resolution")
+    
+    # The floor region (and the tiles chosen from it) need the final homography
+    skeleton_tracker.floor_region = create_floor_region(args, skeleton_tracker.floor_homography_matrix)
+    skeleton_tracker.tiler = create_tiled_inference(args, skeleton_tracker.floor_region)
+
+    # Set up additional cameras, each analyzed in its own thread and fused
+    # with the primary source into one global track list
+    fusion = None
+    camera_workers: List[CameraFusionWorker] = []
+    if args.extra_cam:
+        fusion = MultiCameraFusion(merge_distance=args.fusion_distance)
+        for extra_cam_index, extra_homography in args.extra_cam:
+            extra_capture = open_camera_capture(int(extra_cam_index), capture_settings)
+            if not extra_capture.isOpened():
+                raise RuntimeError(f"Could not open camera index: {extra_cam_index}")
+            print(f"Camera {extra_cam_index} granted: {describe_capture(extra_capture)}")
+            extra_tracker = SkeletonTracker(
+                pose_model_path=args.model,
+                homography_file_path=extra_homography,
+                tracking_distance_threshold=args.tracking_distance,
+                tracking_max_frames_missing=args.tracking_timeout,
+                compute_kinematics=args.kinematics,
+                motion_gate=create_motion_gate(args),
+                smoother=create_track_smoother(args),
+                cascade=create_pose_cascade(args),
+                lean_inference=args.lean_inference
+            )
+            if args.calibration_size:
+                extra_frame_size = (int(extra_capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                                    int(extra_capture.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+                extra_tracker.floor_homography_matrix = scale_homography_to_frame_size(
+                    extra_tracker.floor_homography_matrix, tuple(args.calibration_size), extra_frame_size
+                )
+            extra_tracker.floor_region = create_floor_region(args, extra_tracker.floor_homography_matrix)
+            extra_tracker.tiler = create_tiled_inference(args, extra_tracker.floor_region)
+            if args.latest_frame:
+                extra_capture = LatestFrameCapture(extra_capture)
+            camera_workers.append(CameraFusionWorker(
+                len(camera_workers) + 1, extra_capture, extra_tracker, fusion, analyze_kwargs
+            ))
+            print(f"Fusing additional camera index: {extra_cam_index}")
+        for worker in camera_workers:
+            worker.start()
+
+    capture_timestamp: Optional[float] = None
+
+    def read_frame() -> Tuple[bool, Optional[np.ndarray]]:
+        """Capture a frame from the video source and remember when it was captured"""
+        nonlocal capture_timestamp
+        frame_captured_successfully, current_frame = video_capture.read()
+        
+        # Frame bus and latest-frame captures know the actual capture time;
+        # otherwise the time the read returned is the best estimate
+        capture_timestamp = getattr(video_capture, "last_capture_timestamp", None) or time.time()
+        
+        # Apply horizontal flip if requested (useful for mirror-like camera view)
+        if frame_captured_successfully and args.flip:
+            current_frame = cv2.flip(current_frame, 1)
+        return frame_captured_successfully, current_frame
+
+    def analyze(current_frame: np.ndarray) -> Optional[Tuple[FrameAnalysis, FrameAnalysis]]:
+        """Analyze a frame; returns its own analysis and the one to send to outputs, or None if dropped"""
+        if frame_profiler:
+            frame_profiler.begin_frame()
+        frame_analysis = skeleton_tracker.analyze_frame(
+            input_frame=current_frame, capture_timestamp=capture_timestamp, **analyze_kwargs
+        )
+        if frame_analysis is None:
+            return None  # Overwritten on the frame bus before tracking saw it
+        
+        # With several cameras, outputs get the fused global tracks
+        output_analysis = frame_analysis
+        if fusion:
+            now = time.monotonic()
+            fusion.add_camera_frame(0, frame_analysis, now)
+            output_analysis = dataclasses.replace(
+                fusion.fuse(now),
+                capture_timestamp=frame_analysis.capture_timestamp,
+                frame_size=frame_analysis.frame_size
+            )
+        if frame_profiler:
+            frame_profiler.end_frame(frame_analysis.frame_number)
+        return frame_analysis, output_analysis
+
+    def show(current_frame: np.ndarray, frame_analysis: FrameAnalysis) -> bool:
+        """Display the visualization; returns True when quitting was requested"""
+        visualization_frame = visualizer.create_visualization_frame(
+            current_frame, frame_analysis
+        )
+        cv2.imshow("Real-time Skeleton Tracking with Floor Position Mapping", visualization_frame)
+        for worker in camera_workers:
+            if worker.latest_frame is not None:
+                extra_frame, extra_analysis = worker.latest_frame
+                cv2.imshow(
+                    f"Camera {worker.camera_id}",
+                    visualizer.create_visualization_frame(extra_frame, extra_analysis)
+                )
+        
+        # Check for quit command (press 'q' key)
+        return cv2.waitKey(1) & 0xFF == ord("q")
+
+    async def run_async() -> str:
+        """Run the asyncio runtime with OSC outputs on the event loop"""
+        # The fan-out client never blocks either, so it can serve the event loop too
+        osc_client = fanout_osc_client or await AsyncioOSCClient.connect(args.osc_host, args.osc_port)
+        async_handlers: List[AsyncOutputHandler] = [ExecutorOutputHandler(console_handler)] + [
+            InlineOutputHandler(handler) for handler in create_osc_output_handlers(args, osc_client)
+        ]
+        runtime = AsyncSkeletonRuntime(
+            read_frame, analyze, show, async_handlers, stats_port=args.stats_port
+        )
+        try:
+            return await runtime.run()
+        finally:
+            if osc_client is not fanout_osc_client:
+                osc_client.close()
+            async_handlers[0].close()
+
+    resource_monitor = None
+    if args.resource_log:
+        resource_monitor = ResourceMonitor(
+            args.resource_log,
+            interval_seconds=args.resource_interval,
+            state_probes=tracker_state_probes(skeleton_tracker)
+        )
+        resource_monitor.start()
+        print(f"Logging resource usage to {args.resource_log} every {args.resource_interval:g}s")
+
+    control_server = None
+    if args.control_port:
+        control_server = OSCControlServer(args.control_host, args.control_port, frame_profiler)
+        control_server.start()
+        print(f"Listening for OSC control messages on {args.control_host}:{args.control_port}")
+
     print("Skeleton tracking with floor mapping is running...")
     print("Press 'q' to quit, or close the window to stop.")
 
     try:
-        # Main processing loop
-        while True:
-            # Capture frame from video source
-            frame_captured_successfully, current_frame = video_capture.read()
-            
-            # Check if we've reached the end of a video file
-            if not frame_captured_successfully:
-                if args.video:
-                    print("Reached end of video file.")
-                else:
-                    print("Failed to capture frame from camera.")
-                break
-
-            # Apply horizontal flip if requested (useful for mirror-like camera view)
-            if args.flip:
-                current_frame = cv2.flip(current_frame, 1)
+        if args.async_io:
+            stop_reason = asyncio.run(run_async())
+        else:
+            # Main processing loop
+            stop_reason = "capture_ended"
+            while True:
+                # Capture frame from video source
+                frame_captured_successfully, current_frame = read_frame()
+                
+                # Check if we've reached the end of a video file
+                if not frame_captured_successfully:
+                    break
 
-            # Analyze the frame and get detection results
-            frame_analysis = skeleton_tracker.analyze_frame(
-                input_frame=current_frame,
-                detection_confidence=args.conf,
-                keypoint_confidence=args.kpt_conf,
-                inference_size=args.imgsz
-            )
+                # Analyze the frame and get detection results (None: a frame
+                # bus frame overwritten while it was read, already dropped)
+                analyses = analyze(current_frame)
+                if analyses is None:
+                    continue
+                frame_analysis, output_analysis = analyses
 
-            # Handle logging and communication
-            output_handler.log_detection_info(frame_analysis)
-            
-            # Send all positions for this frame (only if changed)
-            output_handler.send_positions_frame(frame_analysis)
+                # Handle logging and communication
+                output_handler.log_detection_info(output_analysis)
+                
+                # Send all positions for this frame (only if changed)
+                output_handler.send_positions_frame(output_analysis)
 
-            # Create and display visualization
-            visualization_frame = visualizer.create_visualization_frame(
-                current_frame, frame_analysis
-            )
-            cv2.imshow("Real-time Skeleton Tracking with Floor Position Mapping", visualization_frame)
-            
-            # Check for quit command (press 'q' key)
-            if cv2.waitKey(1) & 0xFF == ord("q"):
-                print("Quit command received.")
-                break
+                # Create and display visualization
+                if show(current_frame, frame_analysis):
+                    stop_reason = "quit"
+                    break
+        
+        if stop_reason == "quit":
+            print("Quit command received.")
+        elif args.video:
+            print("Reached end of video file.")
+        elif args.frame_bus:
+            print("No new frames on the frame bus.")
+        else:
+            print("Failed to capture frame from camera.")
                 
     except KeyboardInterrupt:
         print("\nInterrupted by user (Ctrl+C)")
@@ -1195,6 +5397,33 @@ def main():
         print(f"An error occurred during processing: {error}")
     finally:
         # Clean up resources
+        if resource_monitor:
+            resource_monitor.stop()
+        if frame_profiler:
+            frame_profiler.close()
+        if control_server:
+            control_server.stop()
+        if fanout_osc_client:
+            fanout_osc_client.close()
+            print(fanout_osc_client.describe())
+        for worker in camera_workers:
+            worker.stop()
+            worker.join(timeout=1.0)
+            worker.video_capture.release()
+        if skeleton_tracker.floor_region:
+            print(f"Dropped {skeleton_tracker.people_outside_floor} person detection(s) outside the floor polygon.")
+        if skeleton_tracker.cascade:
+            cascade = skeleton_tracker.cascade
+            print(f"Cascade: escalated {cascade.people_escalated} of {cascade.people_seen} person detections "
+                  f"({cascade.escalation_fraction:.1%}), {cascade.people_improved} found by the heavy model.")
+        if isinstance(video_capture, LatestFrameCapture):
+            print(f"Skipped {video_capture.drained_frames} stale camera frame(s).")
+        if isinstance(video_capture, RealtimeVideoCapture):
+            print(video_capture.describe_playback())
+        if isinstance(video_capture, FrameBusReader):
+            print(f"Frame bus: skipped {video_capture.skipped_frames} frame(s), dropped {skeleton_tracker.torn_frames} frame(s) "
+                  f"overwritten before tracking"
+                  + (", copied frames after falling behind." if video_capture.copying else "."))
         video_capture.release()
         cv2.destroyAllWindows()
         print("Resources cleaned up. Application terminated.")
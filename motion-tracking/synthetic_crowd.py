@@ -0,0 +1,734 @@
+"""
+Synthetic Crowd Benchmark
+
+Generates plausible pose detections for a crowd of people walking on the floor
+plane and feeds them straight into the post-model stages (tracking, OSC output
+encoding and visualization), so those stages can be load-tested at crowd sizes
+that can't be staged in front of a camera and without running YOLO.
+
+People walk between random waypoints, pausing at each, so their paths cross. Their skeletons are
+projected into the image through the inverse of the floor homography, with
+keypoint noise, occluded keypoints and missed detections. Because the true
+identity of every detection is known, the benchmark also counts ID switches.
+
+Usage examples:
+    # Benchmark the default crowd sizes with the repository homography
+    python3 synthetic_crowd.py --homography floor_homography.npy
+
+    # Check that two-camera fusion neither duplicates people nor loses IDs at handoffs
+    python3 synthetic_crowd.py --homography floor_homography.npy --check_fusion
+
+    # Larger crowds on a larger floor, tracking only
+    python3 synthetic_crowd.py --people 100 300 600 --floor_bounds -10 1 15 25 --no_visualizer
+"""
+
+import argparse
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+from pythonosc.osc_message_builder import OscMessageBuilder
+
+from skeleton import (
+    COCO_KEYPOINT_NAMES,
+    FloorZoneIndex,
+    MultiCameraFusion,
+    OpenCVVisualizer,
+    OSCOutputHandler,
+    RawPoseDetections,
+    SkeletonOSCOutputHandler,
+    SkeletonTracker,
+    TrackSmoother,
+    ZoneOSCOutputHandler,
+    load_floor_zones,
+)
+
+# Standing skeleton template: (lateral offset, height above the floor) as
+# fractions of body height, in COCO keypoint order
+BODY_TEMPLATE = np.array([
+    (0.0, 0.94),                  # nose
+    (0.02, 0.955), (-0.02, 0.955),  # eyes
+    (0.045, 0.945), (-0.045, 0.945),  # ears
+    (0.12, 0.82), (-0.12, 0.82),  # shoulders
+    (0.15, 0.63), (-0.15, 0.63),  # elbows
+    (0.15, 0.48), (-0.15, 0.48),  # wrists
+    (0.07, 0.52), (-0.07, 0.52),  # hips
+    (0.07, 0.28), (-0.07, 0.28),  # knees
+    (0.07, 0.04), (-0.07, 0.04),  # ankles
+], dtype=np.float32)
+
+# Lateral swing amplitude of each keypoint over the walking cycle; arms swing
+# against the legs on the same side
+GAIT_SWING = np.array([
+    0.0, 0.0, 0.0, 0.0, 0.0,
+    0.0, 0.0,
+    -0.03, 0.03,
+    -0.05, 0.05,
+    0.0, 0.0,
+    0.03, -0.03,
+    0.06, -0.06,
+], dtype=np.float32)
+
+
+class SyntheticCrowd:
+    """
+    Simulates people walking on the floor and renders them as pose detections.
+
+    Each call to next_frame advances the simulation by one frame and returns
+    the detections in random order together with their ground truth identities.
+    """
+
+    def __init__(
+        self,
+        num_people: int,
+        homography_matrix: np.ndarray,
+        floor_bounds: Tuple[float, float, float, float],
+        fps: float = 30.0,
+        keypoint_noise_px: float = 2.0,
+        occlusion_probability: float = 0.05,
+        miss_probability: float = 0.02,
+        body_height_m: float = 1.7,
+        max_pause_seconds: float = 3.0,
+        seed: int = 0
+    ):
+        """
+        Initialize the crowd with random positions and destinations.
+
+        Args:
+            num_people: Number of simulated people
+            homography_matrix: Pixel-to-floor homography of the camera
+            floor_bounds: (min_x, min_y, max_x, max_y) walking area in meters
+            fps: Simulated frame rate
+            keypoint_noise_px: Standard deviation of keypoint position noise
+            occlusion_probability: Chance of each keypoint being occluded
+            miss_probability: Chance of a person not being detected in a frame
+            body_height_m: Average body height
+            max_pause_seconds: Longest time someone stands still at a destination
+            seed: Random seed, for reproducible runs
+        """
+        self.num_people = num_people
+        self.floor_to_pixel = np.linalg.inv(homography_matrix)
+        self.floor_min = np.array(floor_bounds[:2], dtype=np.float64)
+        self.floor_max = np.array(floor_bounds[2:], dtype=np.float64)
+        self.frame_interval = 1.0 / fps
+        self.max_pause_seconds = max_pause_seconds
+        self.keypoint_noise_px = keypoint_noise_px
+        self.occlusion_probability = occlusion_probability
+        self.miss_probability = miss_probability
+        self.rng = np.random.default_rng(seed)
+
+        self.positions = self._random_floor_points(num_people)
+        self.destinations = self._random_floor_points(num_people)
+        self.speeds = np.clip(self.rng.normal(1.3, 0.25, num_people), 0.5, 2.2)
+        self.body_heights = np.clip(self.rng.normal(body_height_m, 0.08, num_people), 1.4, 2.0)
+        self.gait_phases = self.rng.uniform(0, 2 * np.pi, num_people)
+        self.pause_remaining = np.zeros(num_people)
+
+    def _random_floor_points(self, count: int) -> np.ndarray:
+        return self.rng.uniform(self.floor_min, self.floor_max, size=(count, 2))
+
+    def _project_to_pixels(self, floor_points: np.ndarray, floor_to_pixel: np.ndarray) -> np.ndarray:
+        """Map (N, 2) floor points to (N, 2) pixel coordinates"""
+        homogeneous = np.hstack([floor_points, np.ones((len(floor_points), 1))]) @ floor_to_pixel.T
+        return homogeneous[:, :2] / homogeneous[:, 2:3]
+
+    def step(self) -> None:
+        """Move everyone one frame towards their destination; on arrival pause, then pick a new one"""
+        self.pause_remaining -= self.frame_interval
+        walking = self.pause_remaining <= 0
+
+        offsets = self.destinations - self.positions
+        distances = np.linalg.norm(offsets, axis=1)
+        step_lengths = self.speeds * self.frame_interval
+
+        arrived = walking & (distances <= step_lengths)
+        moving = walking & ~arrived
+        self.positions[moving] += offsets[moving] * (step_lengths[moving] / distances[moving])[:, None]
+        self.positions[arrived] = self.destinations[arrived]
+        self.destinations[arrived] = self._random_floor_points(int(arrived.sum()))
+        self.pause_remaining[arrived] = self.rng.uniform(0, self.max_pause_seconds, int(arrived.sum()))
+
+        # About 1.8 steps per second at normal walking speed
+        self.gait_phases[moving] += 2 * np.pi * 0.9 * self.speeds[moving] * self.frame_interval
+
+    def render_detections(
+        self,
+        homography_matrix: Optional[np.ndarray] = None,
+        visible: Optional[np.ndarray] = None
+    ) -> Tuple[RawPoseDetections, np.ndarray]:
+        """
+        Render the current crowd as pose model output.
+
+        Args:
+            homography_matrix: Pixel-to-floor homography of the viewing camera,
+                defaults to the one the crowd was created with
+            visible: Boolean mask of the people in the camera's view, defaults to everyone
+
+        Returns:
+            Tuple of (detections in random order, ground truth person index of
+            each detection)
+        """
+        floor_to_pixel = self.floor_to_pixel if homography_matrix is None else np.linalg.inv(homography_matrix)
+        foot_pixels = self._project_to_pixels(self.positions, floor_to_pixel)
+
+        # Image scale at each person's feet, from a small lateral step on the floor
+        lateral_pixels = self._project_to_pixels(self.positions + np.array([0.1, 0.0]), floor_to_pixel)
+        pixels_per_meter = np.linalg.norm(lateral_pixels - foot_pixels, axis=1) / 0.1
+        body_pixels = (self.body_heights * pixels_per_meter).astype(np.float32)
+
+        swing = np.sin(self.gait_phases).astype(np.float32)[:, None] * GAIT_SWING[None, :]
+        keypoints = np.empty((self.num_people, len(COCO_KEYPOINT_NAMES), 3), dtype=np.float32)
+        keypoints[:, :, 0] = foot_pixels[:, None, 0] + (BODY_TEMPLATE[None, :, 0] + swing) * body_pixels[:, None]
+        keypoints[:, :, 1] = foot_pixels[:, None, 1] - BODY_TEMPLATE[None, :, 1] * body_pixels[:, None]
+        keypoints[:, :, :2] += self.rng.normal(
+            0.0, self.keypoint_noise_px, size=(self.num_people, len(COCO_KEYPOINT_NAMES), 2)
+        )
+        keypoints[:, :, 2] = self.rng.uniform(0.6, 0.98, size=(self.num_people, len(COCO_KEYPOINT_NAMES)))
+
+        occluded = self.rng.random((self.num_people, len(COCO_KEYPOINT_NAMES))) < self.occlusion_probability
+        keypoints[:, :, 2][occluded] = self.rng.uniform(0.0, 0.2, size=int(occluded.sum()))
+
+        # Drop missed detections and shuffle so detection order carries no identity
+        detected = self.rng.random(self.num_people) >= self.miss_probability
+        if visible is not None:
+            detected &= visible
+        ground_truth_ids = self.rng.permutation(np.flatnonzero(detected))
+        keypoints = keypoints[ground_truth_ids]
+
+        boxes = np.concatenate([keypoints[:, :, :2].min(axis=1), keypoints[:, :, :2].max(axis=1)], axis=1)
+        scores = keypoints[:, :, 2].mean(axis=1)
+        return RawPoseDetections(keypoints=keypoints, boxes=boxes, scores=scores), ground_truth_ids
+
+    def next_frame(self) -> Tuple[RawPoseDetections, np.ndarray]:
+        """Advance the simulation by one frame and render it"""
+        self.step()
+        return self.render_detections()
+
+
+class EncodingOSCClient:
+    """OSC client that encodes messages like SimpleUDPClient but only counts the bytes"""
+
+    def __init__(self):
+        self.messages_sent = 0
+        self.bytes_sent = 0
+
+    def send_message(self, address: str, value: Any) -> None:
+        builder = OscMessageBuilder(address=address)
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for argument in values:
+            builder.add_arg(argument)
+        self.bytes_sent += builder.build().size
+        self.messages_sent += 1
+
+
+def count_id_switches(
+    assigned_ids: dict[int, int],
+    ground_truth_ids: np.ndarray,
+    detected_people
+) -> int:
+    """
+    Count detections whose tracker ID differs from the one last given to the same true person.
+
+    Args:
+        assigned_ids: Last tracker ID per ground truth person, updated in place
+        ground_truth_ids: True person index of each detection
+        detected_people: Tracker output, in the same order as the detections
+
+    Returns:
+        Number of ID switches in this frame
+    """
+    id_switches = 0
+    for ground_truth_id, person in zip(ground_truth_ids, detected_people):
+        if person.floor_position is None:
+            continue  # Untracked detection
+        previous_id = assigned_ids.get(int(ground_truth_id))
+        if previous_id is not None and previous_id != person.person_id:
+            id_switches += 1
+        assigned_ids[int(ground_truth_id)] = person.person_id
+    return id_switches
+
+
+def count_global_id_errors(
+    assigned_ids: dict[int, int],
+    camera_observations: List[Tuple[int, np.ndarray, Tuple]],
+    fusion: MultiCameraFusion
+) -> Tuple[int, int]:
+    """
+    Count global ID switches and people who got more than one global ID in a fused frame.
+
+    Args:
+        assigned_ids: Last global ID per ground truth person, updated in place
+        camera_observations: (camera ID, ground truth IDs, tracker output) of
+            every camera frame used by the last fuse
+        fusion: Fusion layer that just fused those frames
+
+    Returns:
+        Tuple of (ID switches, duplicated people) in this frame
+    """
+    global_ids_by_person: dict[int, set] = defaultdict(set)
+    for camera_id, ground_truth_ids, detected_people in camera_observations:
+        for ground_truth_id, person in zip(ground_truth_ids, detected_people):
+            if person.floor_position is None:
+                continue
+            global_id = fusion.global_id_of(camera_id, person.person_id)
+            if global_id is not None:
+                global_ids_by_person[int(ground_truth_id)].add(global_id)
+
+    id_switches = 0
+    duplicates = 0
+    for ground_truth_id, global_ids in global_ids_by_person.items():
+        if len(global_ids) > 1:
+            duplicates += 1
+        previous_id = assigned_ids.get(ground_truth_id)
+        if previous_id in global_ids:
+            continue
+        if previous_id is not None:
+            id_switches += 1
+        assigned_ids[ground_truth_id] = min(global_ids)
+    return id_switches, duplicates
+
+
+def count_close_passes(positions: np.ndarray, previous_close: np.ndarray, distance: float) -> Tuple[int, np.ndarray]:
+    """Count pairs of people that just came within `distance` of each other"""
+    pairwise = np.linalg.norm(positions[:, None, :] - positions[None, :, :], axis=2)
+    close = np.triu(pairwise < distance, k=1)
+    return int((close & ~previous_close).sum()), close
+
+
+def benchmark_crowd_size(args: argparse.Namespace, num_people: int) -> dict:
+    """Run the synthetic crowd through the post-model stages and collect timings"""
+    skeleton_tracker = SkeletonTracker(
+        pose_model_path=None,
+        homography_file_path=args.homography,
+        tracking_distance_threshold=args.tracking_distance,
+        tracking_max_frames_missing=args.tracking_timeout,
+        compute_kinematics=args.kinematics,
+        smoother=TrackSmoother() if args.smoothing else None
+    )
+    crowd = SyntheticCrowd(
+        num_people,
+        skeleton_tracker.floor_homography_matrix,
+        tuple(args.floor_bounds),
+        fps=args.fps,
+        keypoint_noise_px=args.noise,
+        occlusion_probability=args.occlusion,
+        miss_probability=args.miss,
+        seed=args.seed
+    )
+    osc_client = EncodingOSCClient()
+    osc_handlers = [OSCOutputHandler(osc_client=osc_client, position_deadband=args.osc_deadband)]
+    if args.osc_skeletons:
+        osc_handlers.append(SkeletonOSCOutputHandler(osc_client=osc_client))
+    if args.zones:
+        zone_index = FloorZoneIndex(load_floor_zones(args.zones), cell_size=args.zone_cell)
+        osc_handlers.append(ZoneOSCOutputHandler(zone_index, osc_client=osc_client))
+    visualizer = None if args.no_visualizer else OpenCVVisualizer()
+    blank_frame = np.zeros((args.frame_size[1], args.frame_size[0], 3), dtype=np.uint8)
+
+    tracking_ms, osc_ms, visualization_ms = [], [], []
+    assigned_ids: dict[int, int] = {}
+    id_switches = 0
+    close_passes = 0
+    previous_close = np.zeros((num_people, num_people), dtype=bool)
+
+    for frame_index in range(args.warmup + args.frames):
+        raw_detections, ground_truth_ids = crowd.next_frame()
+
+        start_time = time.perf_counter()
+        frame_analysis = skeleton_tracker.analyze_detections(
+            raw_detections, args.kpt_conf, frame_size=tuple(args.frame_size)
+        )
+        tracking_time = time.perf_counter()
+        for osc_handler in osc_handlers:
+            osc_handler.send_positions_frame(frame_analysis)
+        osc_time = time.perf_counter()
+        if visualizer:
+            visualizer.create_visualization_frame(blank_frame, frame_analysis)
+        visualization_time = time.perf_counter()
+
+        frame_switches = count_id_switches(assigned_ids, ground_truth_ids, frame_analysis.detected_people)
+        new_close_passes, previous_close = count_close_passes(crowd.positions, previous_close, args.close_distance)
+        if frame_index < args.warmup:
+            continue
+
+        id_switches += frame_switches
+        close_passes += new_close_passes
+        tracking_ms.append((tracking_time - start_time) * 1000)
+        osc_ms.append((osc_time - tracking_time) * 1000)
+        visualization_ms.append((visualization_time - osc_time) * 1000)
+
+    return {
+        "people": num_people,
+        "tracking_ms": float(np.mean(tracking_ms)),
+        "tracking_p95_ms": float(np.percentile(tracking_ms, 95)),
+        "osc_ms": float(np.mean(osc_ms)),
+        "osc_bytes_per_frame": osc_client.bytes_sent / (args.warmup + args.frames),
+        "visualization_ms": float(np.mean(visualization_ms)) if visualizer else None,
+        "id_switches": id_switches,
+        "close_passes": close_passes,
+    }
+
+
+def benchmark_two_cameras(
+    args: argparse.Namespace,
+    num_people: int,
+    setup_crowd: Optional[Callable[[SyntheticCrowd], None]] = None
+) -> dict:
+    """
+    Run the synthetic crowd through two overlapping cameras and the fusion layer.
+
+    Camera 0 sees the floor left of the middle plus half the overlap, camera 1
+    the rest. Camera 1's homography is camera 0's with the floor shifted by
+    half the floor width, so the same floor point lands on different pixels,
+    and it runs at --second_camera_fps. The simulation (and camera 0) runs at
+    --fps, and every camera 0 frame is fused like in skeleton.py.
+
+    Args:
+        args: Benchmark arguments
+        num_people: Crowd size
+        setup_crowd: Optional function that places the crowd before the first frame
+    """
+    camera_trackers = [
+        SkeletonTracker(
+            pose_model_path=None,
+            homography_file_path=args.homography,
+            tracking_distance_threshold=args.tracking_distance,
+            tracking_max_frames_missing=args.tracking_timeout,
+            smoother=TrackSmoother() if args.smoothing else None
+        )
+        for _ in range(2)
+    ]
+    min_x, _, max_x, _ = args.floor_bounds
+    floor_shift = np.array([[1.0, 0.0, (max_x - min_x) / 2], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+    camera_trackers[1].floor_homography_matrix = floor_shift @ camera_trackers[0].floor_homography_matrix
+
+    crowd = SyntheticCrowd(
+        num_people,
+        camera_trackers[0].floor_homography_matrix,
+        tuple(args.floor_bounds),
+        fps=args.fps,
+        keypoint_noise_px=args.noise,
+        occlusion_probability=args.occlusion,
+        miss_probability=args.miss,
+        seed=args.seed
+    )
+    if setup_crowd:
+        setup_crowd(crowd)
+    fusion = MultiCameraFusion(merge_distance=args.fusion_distance)
+    middle_x = (min_x + max_x) / 2
+    camera_intervals = [1.0 / args.fps, 1.0 / args.second_camera_fps]
+    next_capture_times = [0.0, 0.0]
+    latest_observations: dict[int, Tuple[float, np.ndarray, Tuple]] = {}
+
+    tracking_ms, fusion_ms = [], []
+    assigned_ids: dict[int, int] = {}
+    id_switches = 0
+    duplicates = 0
+    handoffs = 0
+    last_view = np.full(num_people, -1)
+
+    for frame_index in range(args.warmup + args.frames):
+        crowd.step()
+        timestamp = frame_index * camera_intervals[0]
+        visible = [
+            crowd.positions[:, 0] < middle_x + args.camera_overlap / 2,
+            crowd.positions[:, 0] > middle_x - args.camera_overlap / 2
+        ]
+
+        start_time = time.perf_counter()
+        for camera_id, skeleton_tracker in enumerate(camera_trackers):
+            if timestamp + 1e-9 < next_capture_times[camera_id]:
+                continue
+            next_capture_times[camera_id] += camera_intervals[camera_id]
+            raw_detections, ground_truth_ids = crowd.render_detections(
+                skeleton_tracker.floor_homography_matrix, visible[camera_id]
+            )
+            frame_analysis = skeleton_tracker.analyze_detections(
+                raw_detections, args.kpt_conf, frame_size=tuple(args.frame_size)
+            )
+            fusion.add_camera_frame(camera_id, frame_analysis, timestamp)
+            latest_observations[camera_id] = (timestamp, ground_truth_ids, frame_analysis.detected_people)
+        tracking_time = time.perf_counter()
+        fusion.fuse(timestamp)
+        fusion_time = time.perf_counter()
+
+        frame_switches, frame_duplicates = count_global_id_errors(assigned_ids, [
+            (camera_id, ground_truth_ids, detected_people)
+            for camera_id, (observed_at, ground_truth_ids, detected_people) in latest_observations.items()
+            if timestamp - observed_at <= fusion.max_observation_age
+        ], fusion)
+
+        # Walking from one camera's exclusive area into the other's
+        view = np.where(visible[0] & ~visible[1], 0, np.where(visible[1] & ~visible[0], 1, -1))
+        crossed = (view >= 0) & (last_view >= 0) & (view != last_view)
+        last_view = np.where(view >= 0, view, last_view)
+        if frame_index < args.warmup:
+            continue
+
+        id_switches += frame_switches
+        duplicates += frame_duplicates
+        handoffs += int(crossed.sum())
+        tracking_ms.append((tracking_time - start_time) * 1000)
+        fusion_ms.append((fusion_time - tracking_time) * 1000)
+
+    return {
+        "people": num_people,
+        "tracking_ms": float(np.mean(tracking_ms)),
+        "fusion_ms": float(np.mean(fusion_ms)),
+        "fusion_p95_ms": float(np.percentile(fusion_ms, 95)),
+        "global_id_switches": id_switches,
+        "duplicate_person_frames": duplicates,
+        "handoffs": handoffs,
+    }
+
+
+def check_two_camera_fusion(args: argparse.Namespace) -> List[str]:
+    """
+    Walk three people in separate lanes from one end of the floor to the other,
+    through both cameras' views, without noise or missed detections.
+
+    Everyone in the overlap must be fused into one person, and every walk from
+    camera 0 into camera 1 must keep its global ID.
+
+    Returns:
+        Descriptions of the failed checks (empty if fusion behaved)
+    """
+    min_x, min_y, max_x, max_y = args.floor_bounds
+    lanes = np.linspace(min_y, max_y, 5)[1:-1]
+    start_x, end_x = min_x + 0.5, max_x - 0.5
+    speed = 1.3
+    walk_frames = int((end_x - start_x) / speed * args.fps) - 1
+
+    def walk_across(crowd: SyntheticCrowd) -> None:
+        crowd.positions = np.column_stack([np.full(len(lanes), start_x), lanes])
+        crowd.destinations = np.column_stack([np.full(len(lanes), end_x), lanes])
+        crowd.speeds = np.full(len(lanes), speed)
+
+    check_args = argparse.Namespace(**{
+        **vars(args), "warmup": 0, "frames": walk_frames, "noise": 0.0, "occlusion": 0.0, "miss": 0.0
+    })
+    result = benchmark_two_cameras(check_args, len(lanes), setup_crowd=walk_across)
+
+    failures = []
+    if result["duplicate_person_frames"]:
+        failures.append(f"{result['duplicate_person_frames']} person frame(s) with more than one global ID")
+    if result["global_id_switches"]:
+        failures.append(f"{result['global_id_switches']} global ID switch(es)")
+    if result["handoffs"] != len(lanes):
+        failures.append(f"{result['handoffs']} handoff(s) between the cameras, expected {len(lanes)}")
+    return failures
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    """
+    Create and configure command-line argument parser for the benchmark.
+
+    Returns:
+        Configured ArgumentParser instance
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark tracking and outputs on a synthetic crowd, without the pose model",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        "--homography",
+        default="motion-tracking/floor_homography.npy",
+        help="Path to homography matrix file for pixel-to-floor coordinate transformation"
+    )
+    parser.add_argument(
+        "--people",
+        type=int,
+        nargs="+",
+        default=[1, 10, 50, 100, 200, 400],
+        help="Crowd sizes to benchmark"
+    )
+    parser.add_argument(
+        "--floor_bounds",
+        type=float,
+        nargs=4,
+        default=[-4.0, 1.0, 8.0, 13.0],
+        metavar=("MIN_X", "MIN_Y", "MAX_X", "MAX_Y"),
+        help="Floor area (meters) people walk in"
+    )
+    parser.add_argument(
+        "--frame_size",
+        type=int,
+        nargs=2,
+        default=[1280, 720],
+        metavar=("WIDTH", "HEIGHT"),
+        help="Size of the frame the visualizer draws on"
+    )
+    parser.add_argument(
+        "--frames",
+        type=int,
+        default=300,
+        help="Measured frames per crowd size"
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=10,
+        help="Unmeasured frames before measuring"
+    )
+    parser.add_argument(
+        "--fps",
+        type=float,
+        default=30.0,
+        help="Simulated frame rate"
+    )
+    parser.add_argument(
+        "--noise",
+        type=float,
+        default=2.0,
+        help="Keypoint position noise (pixels, standard deviation)"
+    )
+    parser.add_argument(
+        "--occlusion",
+        type=float,
+        default=0.05,
+        help="Probability of each keypoint being occluded"
+    )
+    parser.add_argument(
+        "--miss",
+        type=float,
+        default=0.02,
+        help="Probability of a person not being detected in a frame"
+    )
+    parser.add_argument(
+        "--close_distance",
+        type=float,
+        default=0.5,
+        help="Distance (meters) at which two people count as passing each other"
+    )
+    parser.add_argument(
+        "--kpt_conf",
+        type=float,
+        default=0.5,
+        help="Minimum confidence for individual keypoints"
+    )
+    parser.add_argument(
+        "--tracking_distance",
+        type=float,
+        default=2.0,
+        help="Maximum distance (meters) for matching people between frames"
+    )
+    parser.add_argument(
+        "--tracking_timeout",
+        type=int,
+        default=30,
+        help="Frames before considering a person lost"
+    )
+    parser.add_argument(
+        "--kinematics",
+        action="store_true",
+        help="Include kinematics computation in the tracking time"
+    )
+    parser.add_argument(
+        "--smoothing",
+        action="store_true",
+        help="Include One-Euro smoothing of keypoints and floor positions"
+    )
+    parser.add_argument(
+        "--osc_deadband",
+        type=float,
+        default=0.0,
+        help="Only resend positions once someone moved more than this many meters"
+    )
+    parser.add_argument(
+        "--osc_skeletons",
+        action="store_true",
+        help="Include the quantized skeleton stream (/people/skeletons) in the OSC output"
+    )
+    parser.add_argument(
+        "--zones",
+        type=str,
+        default=None,
+        help="Include floor zone events (/zones/...) for this zone file in the OSC output"
+    )
+    parser.add_argument(
+        "--zone_cell",
+        type=float,
+        default=0.1,
+        help="Cell size (meters) of the zone grid index"
+    )
+    parser.add_argument(
+        "--two_cameras",
+        action="store_true",
+        help="Benchmark multi-camera fusion: two overlapping cameras at different frame rates"
+    )
+    parser.add_argument(
+        "--camera_overlap",
+        type=float,
+        default=2.0,
+        help="Width (meters) of the floor strip both cameras see"
+    )
+    parser.add_argument(
+        "--second_camera_fps",
+        type=float,
+        default=20.0,
+        help="Frame rate of the second camera (the first runs at --fps)"
+    )
+    parser.add_argument(
+        "--fusion_distance",
+        type=float,
+        default=0.75,
+        help="Maximum distance (meters) between two cameras' detections of the same person"
+    )
+    parser.add_argument(
+        "--check_fusion",
+        action="store_true",
+        help="Walk a few people through both cameras without noise and exit non-zero "
+             "if fusion duplicates anyone or loses a global ID at a handoff"
+    )
+    parser.add_argument(
+        "--no_visualizer",
+        action="store_true",
+        help="Skip benchmarking the visualizer"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed for the simulation"
+    )
+    return parser
+
+
+def main():
+    """Benchmark every requested crowd size and print a summary table"""
+    args = create_argument_parser().parse_args()
+
+    if args.check_fusion:
+        failures = check_two_camera_fusion(args)
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        if failures:
+            sys.exit(1)
+        print("Two-camera fusion check passed.")
+        return
+
+    if args.two_cameras:
+        print(f"{'people':>7} {'track ms':>9} {'fuse ms':>8} {'p95 ms':>8} "
+              f"{'ID sw':>6} {'dup':>6} {'handoffs':>9}")
+        for num_people in args.people:
+            result = benchmark_two_cameras(args, num_people)
+            print(f"{result['people']:7d} {result['tracking_ms']:9.2f} {result['fusion_ms']:8.2f} "
+                  f"{result['fusion_p95_ms']:8.2f} {result['global_id_switches']:6d} "
+                  f"{result['duplicate_person_frames']:6d} {result['handoffs']:9d}")
+        return
+
+    print(f"{'people':>7} {'track ms':>9} {'p95 ms':>8} {'osc ms':>8} {'osc B':>8} "
+          f"{'draw ms':>8} {'ID sw':>6} {'passes':>7}")
+    for num_people in args.people:
+        result = benchmark_crowd_size(args, num_people)
+        visualization = (f"{result['visualization_ms']:8.2f}"
+                         if result["visualization_ms"] is not None else f"{'-':>8}")
+        print(f"{result['people']:7d} {result['tracking_ms']:9.2f} {result['tracking_p95_ms']:8.2f} "
+              f"{result['osc_ms']:8.3f} {result['osc_bytes_per_frame']:8.0f} {visualization} "
+              f"{result['id_switches']:6d} {result['close_passes']:7d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -85,6 +85,7 @@ async function startServer() {
 
       if (address === "/people/positions") {
         // Parse positions: [personId1, x1, y1, personId2, x2, y2, ...]
+        // (a trailing capture timestamp from --osc_timestamp is ignored)
         const positions = [];
         for (let i = 0; i < args.length; i += 3) {
           if (i + 2 < args.length) {